@@ -0,0 +1,198 @@
+import json
+import uuid as uuid_lib
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core import signing
+from django.db import transaction
+from django.db.models import Case, When, Value, DateTimeField
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_POST, require_GET
+from main.models import Event, EventRegistration
+from main.ticket_utils import read_ticket_token
+from main.analytics import invalidate_event_attendance
+
+# Check-in Views (contrôle des tickets à l'entrée)
+
+MANIFEST_SALT = 'admin_dashboard.checkin.manifest'
+SYNC_BATCH_SIZE = 500
+
+
+def _parse_checkin_time(value, default):
+    """Heure de scan envoyée par l'appareil (ISO 8601), sinon maintenant"""
+    if not value:
+        return default
+    try:
+        # Date impossible (30 février) ou valeur non textuelle envoyée par l'appareil
+        parsed = parse_datetime(value)
+    except (ValueError, TypeError):
+        return default
+    if parsed is None:
+        return default
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return min(parsed, default)
+
+
+def _checkin(event_pk, **lookup):
+    """Enregistrer l'entrée d'une inscription identifiée par `lookup` (uuid ou id)"""
+    now = timezone.now()
+    # Mise à jour conditionnelle : une seule requête gagne, même avec plusieurs scanners
+    updated = EventRegistration.objects.filter(
+        event_id=event_pk,
+        is_confirmed=True,
+        checked_in_at__isnull=True,
+        **lookup,
+    ).update(checked_in_at=now)
+    if updated:
+        invalidate_event_attendance(event_pk)
+
+    registration = EventRegistration.objects.filter(**lookup).values(
+        'event_id', 'nom_prenom', 'promotion', 'is_confirmed', 'checked_in_at'
+    ).first()
+
+    if registration is None:
+        return JsonResponse({'ok': False, 'status': 'invalid'}, status=404)
+    if registration['event_id'] != event_pk:
+        return JsonResponse({'ok': False, 'status': 'wrong_event'}, status=409)
+    if not registration['is_confirmed']:
+        return JsonResponse({'ok': False, 'status': 'unconfirmed', 'name': registration['nom_prenom']}, status=409)
+
+    data = {
+        'name': registration['nom_prenom'],
+        'promotion': registration['promotion'],
+        'at': registration['checked_in_at'].isoformat(),
+    }
+    if updated:
+        return JsonResponse({'ok': True, 'status': 'checked_in', **data})
+    return JsonResponse({'ok': False, 'status': 'already_checked_in', **data}, status=409)
+
+
+@staff_member_required
+@require_POST
+def checkin_ticket(request, pk, uuid):
+    """Valider un ticket à l'entrée (JSON compact, refuse les doubles entrées)"""
+    return _checkin(pk, uuid=uuid)
+
+
+@staff_member_required
+@require_POST
+def checkin_token(request, pk, token):
+    """
+    Valider un ticket signé (QR Code) à l'entrée.
+    L'authenticité est vérifiée sans requête ; la base n'est sollicitée que pour enregistrer l'entrée.
+    """
+    try:
+        ticket = read_ticket_token(token)
+    except signing.SignatureExpired:
+        return JsonResponse({'ok': False, 'status': 'expired'}, status=410)
+    except signing.BadSignature:
+        return JsonResponse({'ok': False, 'status': 'invalid'}, status=403)
+
+    if ticket['event_id'] != pk:
+        return JsonResponse({'ok': False, 'status': 'wrong_event'}, status=409)
+
+    return _checkin(pk, id=ticket['registration_id'])
+
+
+@staff_member_required
+@require_GET
+def checkin_manifest(request, pk):
+    """Télécharger la liste signée des tickets valides (mode hors-ligne)"""
+    event = get_object_or_404(Event, pk=pk)
+    rows = EventRegistration.objects.filter(event=event, is_confirmed=True).values_list(
+        'uuid', 'nom_prenom', 'checked_in_at'
+    )
+
+    tickets = [
+        {'uuid': str(uuid), 'name': name, 'in': checked_in_at is not None}
+        for uuid, name, checked_in_at in rows
+    ]
+    uuids = sorted(ticket['uuid'] for ticket in tickets)
+
+    return JsonResponse({
+        'event': event.pk,
+        'generated_at': timezone.now().isoformat(),
+        'tickets': tickets,
+        # Signature de l'ensemble des UUID : l'appareil la renvoie lors de la synchronisation
+        'signature': signing.dumps({'event': event.pk, 'uuids': uuids}, salt=MANIFEST_SALT, compress=True),
+    })
+
+
+@staff_member_required
+@require_POST
+def checkin_sync(request, pk):
+    """
+    Synchroniser un lot de check-ins effectués hors-ligne.
+    Corps JSON : {"signature": "...", "checkins": [{"uuid": "...", "at": "ISO 8601"}, ...]}
+    """
+    event = get_object_or_404(Event, pk=pk)
+
+    try:
+        data = json.loads(request.body)
+        checkins = data.get('checkins', [])
+        if not isinstance(checkins, list):
+            raise ValueError
+    except (json.JSONDecodeError, ValueError, AttributeError):
+        return JsonResponse({'ok': False, 'error': 'Données invalides'}, status=400)
+
+    if len(checkins) > SYNC_BATCH_SIZE:
+        return JsonResponse({'ok': False, 'error': f'Maximum {SYNC_BATCH_SIZE} check-ins par lot'}, status=400)
+
+    # Le manifeste signé (obligatoire) limite le lot aux tickets connus lors du téléchargement
+    if not data.get('signature'):
+        return JsonResponse({'ok': False, 'error': 'Signature du manifeste requise'}, status=400)
+    try:
+        manifest = signing.loads(data['signature'], salt=MANIFEST_SALT)
+    except signing.BadSignature:
+        return JsonResponse({'ok': False, 'error': 'Signature invalide'}, status=400)
+    if manifest.get('event') != event.pk:
+        return JsonResponse({'ok': False, 'error': 'Manifeste d\'un autre événement'}, status=400)
+    allowed = set(manifest.get('uuids', []))
+
+    now = timezone.now()
+    scans = {}
+    # Éléments écartés, renvoyés à l'appareil : (position dans le lot, valeur reçue, motif)
+    rejected = []
+    for index, item in enumerate(checkins):
+        try:
+            uuid = str(uuid_lib.UUID(str(item['uuid'])))
+        except (TypeError, KeyError, ValueError):
+            rejected.append({'index': index, 'uuid': item.get('uuid') if isinstance(item, dict) else None,
+                             'reason': 'invalid_uuid'})
+            continue
+        if uuid not in allowed:
+            rejected.append({'index': index, 'uuid': uuid, 'reason': 'not_in_manifest'})
+            continue
+        at = _parse_checkin_time(item.get('at'), now)
+        # Garder le premier scan si le même ticket apparaît plusieurs fois
+        if uuid not in scans or at < scans[uuid]:
+            scans[uuid] = at
+
+    with transaction.atomic():
+        rows = (
+            EventRegistration.objects.select_for_update()
+            .filter(event=event, is_confirmed=True, uuid__in=list(scans))
+            .values_list('uuid', 'checked_in_at')
+        )
+        existing = {str(uuid): checked_in_at for uuid, checked_in_at in rows}
+        accepted = [uuid for uuid in scans if uuid in existing and existing[uuid] is None]
+
+        if accepted:
+            EventRegistration.objects.filter(
+                event=event, uuid__in=accepted, checked_in_at__isnull=True
+            ).update(checked_in_at=Case(
+                *[When(uuid=uuid, then=Value(scans[uuid])) for uuid in accepted],
+                output_field=DateTimeField(),
+            ))
+            invalidate_event_attendance(event.pk)
+
+    return JsonResponse({
+        'ok': True,
+        'accepted': accepted,
+        'duplicates': [uuid for uuid in scans if existing.get(uuid) is not None],
+        'unknown': [uuid for uuid in scans if uuid not in existing],
+        'rejected': rejected,
+    })
@@ -425,4 +425,29 @@ class ArchiveForm(forms.ModelForm):
         
         for field_name, field in self.fields.items():
             if field_name != 'file':
-                field.widget.attrs.update({'class': 'form-control'})
\ No newline at end of file
+                field.widget.attrs.update({'class': 'form-control'})
+class ImportForm(forms.Form):
+    """Formulaire d'import d'un fichier CSV ou XLSX"""
+    file = forms.FileField(
+        label=_('Fichier CSV ou XLSX'),
+        help_text=_('La première ligne doit contenir les en-têtes de colonnes.'),
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.xlsx'}),
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith(('.csv', '.xlsx')):
+            raise forms.ValidationError(_('Format non pris en charge : utilisez un fichier CSV ou XLSX.'))
+        return upload
+
+class RegistrationImportForm(ImportForm):
+    """Import des inscriptions à un événement"""
+    confirm = forms.BooleanField(
+        label=_('Confirmer les inscriptions (dans la limite des places)'),
+        required=False,
+        initial=True,
+    )
+    send_tickets = forms.BooleanField(
+        label=_('Envoyer les tickets par e-mail'),
+        required=False,
+    )
@@ -0,0 +1,57 @@
+from django.shortcuts import render, get_object_or_404
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib import messages
+from main.models import Event
+from main.importers import RegistrationImporter, MemberImporter
+from main.registrations import queue_tickets
+from .forms import ImportForm, RegistrationImportForm
+
+# Import Views (CSV / XLSX)
+
+@staff_member_required
+def import_registrations(request, pk):
+    """Importer des inscriptions collectées hors-ligne pour un événement"""
+    event = get_object_or_404(Event, pk=pk)
+    report = None
+
+    if request.method == 'POST':
+        form = RegistrationImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            importer = RegistrationImporter(event, confirm=form.cleaned_data['confirm'])
+            report = importer.run(form.cleaned_data['file'])
+            if form.cleaned_data['send_tickets']:
+                queue_tickets(importer.confirmed_ids)
+            messages.success(request, f'{report.created} inscription(s) importée(s).')
+    else:
+        form = RegistrationImportForm()
+
+    context = {
+        'event': event,
+        'form': form,
+        'report': report,
+        'title': f'Importer des inscriptions - {event.title_fr}',
+        'columns': 'nom_prenom, email, telephone, promotion, message',
+    }
+    return render(request, 'admin_dashboard/import.html', context)
+
+
+@staff_member_required
+def import_members(request):
+    """Importer des membres depuis un fichier CSV ou XLSX"""
+    report = None
+
+    if request.method == 'POST':
+        form = ImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            report = MemberImporter().run(form.cleaned_data['file'])
+            messages.success(request, f'{report.created} membre(s) importé(s).')
+    else:
+        form = ImportForm()
+
+    context = {
+        'form': form,
+        'report': report,
+        'title': 'Importer des membres',
+        'columns': 'nom_prenom, date_naissance, lieu_naissance, telephone, email, matricule, niveau, promotion, profession, member_type',
+    }
+    return render(request, 'admin_dashboard/import.html', context)
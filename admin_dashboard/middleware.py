@@ -18,6 +18,8 @@ class AdminAuthMiddleware:
             '/dashboard/auth/register/',
             '/dashboard/auth/password-reset/',
             '/dashboard/auth/logout/',
+            # Collecte Prometheus : protégée par jeton dans la vue
+            '/dashboard/performance/metrics/',
         ]
     
     def __call__(self, request):
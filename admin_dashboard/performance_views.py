@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
+from django.shortcuts import render, redirect
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_POST
+from main.metrics import registry, prometheus_text
+
+# Performance Views (mesures du middleware de profilage)
+
+
+@staff_member_required
+def performance(request):
+    """Percentiles par route, les plus lentes en premier"""
+    routes = []
+    for route, data in registry.snapshot().items():
+        routes.append({
+            'name': route,
+            'count': data['count'],
+            'errors': data['errors'],
+            'p50': data['duration'][0.5] * 1000,
+            'p95': data['duration'][0.95] * 1000,
+            'p99': data['duration'][0.99] * 1000,
+            'db_queries': data['db_queries'][0.95],
+            'db_time': data['db_time'][0.95] * 1000,
+            'template_time': data['template_time'][0.95] * 1000,
+            'size': data['response_size'][0.95] / 1024,
+        })
+    routes.sort(key=lambda row: row['p95'], reverse=True)
+
+    context = {
+        'routes': routes,
+        'profiling_enabled': getattr(settings, 'PROFILING_ENABLED', True),
+    }
+    return render(request, 'admin_dashboard/performance.html', context)
+
+
+def metrics_export(request):
+    """Export Prometheus : membre du staff ou jeton METRICS_TOKEN"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    authorized = request.user.is_authenticated and request.user.is_staff
+    if token and header.startswith('Bearer '):
+        authorized = authorized or constant_time_compare(header[len('Bearer '):], token)
+    if not authorized:
+        return HttpResponse('Non autorisé', status=401, content_type='text/plain; charset=utf-8')
+    return HttpResponse(prometheus_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@staff_member_required
+@require_POST
+def reset_metrics(request):
+    registry.reset()
+    messages.success(request, "Mesures réinitialisées.")
+    return redirect('admin_performance')
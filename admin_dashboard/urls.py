@@ -5,6 +5,9 @@ from . import auth_views
 from . import certificate_views
 from . import badge_views
 from . import archive_views
+from . import checkin_views
+from . import import_views
+from . import performance_views
 
 urlpatterns = [
 
@@ -22,6 +25,12 @@ urlpatterns = [
     path('events/<int:pk>/badges/download-zip/', badge_views.download_badges_zip, name='admin_download_badges_zip'),
     path('registrations/<int:registration_id>/regenerate-badge/', badge_views.regenerate_badge, name='admin_regenerate_badge'),
 
+    # Check-in (contrôle à l'entrée)
+    path('events/<int:pk>/checkin/<uuid:uuid>/', checkin_views.checkin_ticket, name='admin_checkin_ticket'),
+    path('events/<int:pk>/checkin/token/<str:token>/', checkin_views.checkin_token, name='admin_checkin_token'),
+    path('events/<int:pk>/checkin/manifest/', checkin_views.checkin_manifest, name='admin_checkin_manifest'),
+    path('events/<int:pk>/checkin/sync/', checkin_views.checkin_sync, name='admin_checkin_sync'),
+
     # ============= DASHBOARD =============
     # Dashboard home (nécessite une connexion)
     path('', views.dashboard_home, name='admin_dashboard_home'),
@@ -36,6 +45,7 @@ urlpatterns = [
     # ============= GESTION DES MEMBRES =============
     path('members/', views.members_list, name='admin_members_list'),
     path('members/create/', views.MemberCreateView.as_view(), name='admin_member_create'),
+    path('members/import/', import_views.import_members, name='admin_import_members'),
     path('members/<int:pk>/', views.member_detail, name='admin_member_detail'),
     path('members/<int:pk>/edit/', views.MemberUpdateView.as_view(), name='admin_member_edit'),
     path('members/<int:pk>/delete/', views.MemberDeleteView.as_view(), name='admin_member_delete'),
@@ -59,6 +69,8 @@ urlpatterns = [
     path('registrations/<int:pk>/delete/', views.delete_registration, name='admin_delete_registration'),
     path('events/<int:pk>/registrations/export/', views.event_registrations_export_excel, name='admin_export_registrations'),
     path('registrations/<int:pk>/confirm/', views.confirm_registration, name='admin_confirm_registration'),
+    path('events/<int:pk>/registrations/bulk/', views.bulk_registrations, name='admin_bulk_registrations'),
+    path('events/<int:pk>/registrations/import/', import_views.import_registrations, name='admin_import_registrations'),
     
     # ============= GESTION DES ACTUALITÉS =============
     path('news/', views.news_list, name='admin_news_list'),
@@ -92,6 +104,9 @@ urlpatterns = [
     
     # ============= PARAMÈTRES DU SITE =============
     path('settings/', views.site_settings, name='admin_site_settings'),
+    path('performance/', performance_views.performance, name='admin_performance'),
+    path('performance/metrics/', performance_views.metrics_export, name='admin_metrics_export'),
+    path('performance/reset/', performance_views.reset_metrics, name='admin_reset_metrics'),
 
     # ============= GESTION DES CONCOURS =============
     path('contests/', views.contests_home, name='admin_contests_home'),
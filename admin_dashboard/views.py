@@ -2,14 +2,16 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Count, Q, Sum
+from django.db.models import Count, F, Q, Sum
 from django.db.models.functions import TruncMonth
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, UpdateView, DeleteView
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from django.views.decorators.http import require_POST
 from django.http import JsonResponse, HttpResponse
 import csv
+import json
 from main.models import (
     Member, Project, Event, EventRegistration, 
     News, Gallery, Contact, SiteSettings,
@@ -23,6 +25,12 @@ from .forms import (
     RequestDocumentForm, ProfessorForm, ClassroomForm, DelegateForm, BlogArticleForm
 )
 from main.utils import send_member_card_email
+from main.analytics import event_attendance
+from main.search import search as site_search
+from main.registrations import (
+    cancel_registration, confirm_participant, send_ticket, filter_registrations,
+    bulk_confirm, bulk_reject, bulk_delete, queue_tickets,
+)
 
 @staff_member_required
 def dashboard_home(request):
@@ -59,11 +67,10 @@ def dashboard_home(request):
     )
     
     # 3. Top Événements (par inscriptions)
-    top_events = Event.objects.annotate(num_registrations=Count('eventregistration')) \
-        .order_by('-num_registrations')[:5]
+    top_events = Event.objects.order_by((F('confirmed_count') + F('pending_count')).desc())[:5]
     
     event_labels = [event.title_fr[:20] + '...' for event in top_events]
-    event_values = [event.num_registrations for event in top_events]
+    event_values = [event.registration_count for event in top_events]
 
     # Messages récents non lus
     recent_messages = Contact.objects.filter(is_read=False).order_by('-created_at')[:5]
@@ -116,17 +123,21 @@ def members_list(request):
     if member_type:
         members = members.filter(member_type=member_type)
     
-    if search:
-        members = members.filter(
-            Q(nom_prenom__icontains=search) | 
-            Q(email__icontains=search) |
-            Q(promotion__icontains=search)
-        )
+    if search and '@' in search:
+        # Adresse e-mail partielle : sous-chaîne, hors de portée de l'index (préfixes de mots)
+        members = members.filter(email__icontains=search)
+    elif search:
+        # Index plein texte (voir main/search.py), classé par pertinence, dans les filtres de la page
+        members = site_search(search, kinds=['member'], public_only=False, within=members)
     
     # Pagination
     paginator = Paginator(members, 20)
     page_number = request.GET.get('page')
     members_page = paginator.get_page(page_number)
+    if search and '@' not in search:
+        # Entrées de l'index de la page -> membres, dans l'ordre de pertinence
+        found = Member.objects.in_bulk([entry.object_id for entry in members_page.object_list])
+        members_page.object_list = [found[entry.object_id] for entry in members_page.object_list if entry.object_id in found]
     
     context = {
         'members_page': members_page,
@@ -285,11 +296,9 @@ class ProjectDeleteView(DeleteView):
 @staff_member_required
 def events_list(request):
     """Liste des événements"""
+    # Le nombre d'inscriptions est lu depuis les compteurs de l'événement
     events = Event.objects.all().order_by('-date_event')
     
-    # Ajouter le nombre d'inscriptions pour chaque événement
-    events = events.annotate(registration_count=Count('eventregistration'))
-    
     paginator = Paginator(events, 10)
     page_number = request.GET.get('page')
     events_page = paginator.get_page(page_number)
@@ -336,16 +345,27 @@ def event_registrations(request, pk):
     event = get_object_or_404(Event, pk=pk)
     registrations = event.eventregistration_set.all().order_by('-registration_date')
     
+    # Filtrage par statut
+    status = request.GET.get('status', '')
+    registrations = filter_registrations(registrations, status)
+    
     paginator = Paginator(registrations, 20)
     page_number = request.GET.get('page')
     registrations_page = paginator.get_page(page_number)
     
+    # Statistiques de présence (requêtes groupées, en cache)
+    attendance = event_attendance(event)
+    
     context = {
         'event': event,
         'registrations_page': registrations_page,
         'registrations': registrations,
-        'confirmed_count': registrations.filter(is_confirmed=True).count(),
-        'pending_count': registrations.filter(is_confirmed=False).count(),
+        'confirmed_count': event.confirmed_count,
+        'pending_count': event.pending_count,
+        'current_status': status,
+        'attendance': attendance,
+        'arrival_labels': json.dumps([timezone.localtime(point['slot']).strftime('%H:%M') for point in attendance['arrival_curve']]),
+        'arrival_values': json.dumps([point['cumulative'] for point in attendance['arrival_curve']]),
     }
     
     return render(request, 'admin_dashboard/events/registrations.html', context)
@@ -353,22 +373,69 @@ def event_registrations(request, pk):
 @staff_member_required
 def delete_registration(request, pk):
     """Supprimer une inscription"""
-    registration = get_object_or_404(EventRegistration, pk=pk)
+    registration = get_object_or_404(EventRegistration.objects.select_related('event'), pk=pk)
     event_pk = registration.event.pk
-    registration.delete()
+    promoted = cancel_registration(registration)
     messages.success(request, "Inscription supprimée avec succès.")
+    if promoted:
+        send_ticket(promoted)
+        messages.info(request, f'{promoted.nom_prenom} a obtenu la place libérée (liste d\'attente).')
     return redirect('admin_event_registrations', pk=event_pk)
 
 @staff_member_required
 def confirm_registration(request, pk):
     """Confirmer une inscription"""
-    registration = get_object_or_404(EventRegistration, pk=pk)
-    registration.is_confirmed = True
-    registration.save()
+    registration = get_object_or_404(EventRegistration.objects.select_related('event'), pk=pk)
+    if registration.is_rejected:
+        messages.error(request, "Cette inscription a été refusée : elle ne peut plus être confirmée.")
+        return redirect('admin_event_registrations', pk=registration.event.pk)
+    if not confirm_participant(registration):
+        messages.error(request, "L'événement est complet : impossible de confirmer cette inscription.")
+        return redirect('admin_event_registrations', pk=registration.event.pk)
     
     messages.success(request, f'Inscription de {registration.nom_prenom} confirmée.')
     return redirect('admin_event_registrations', pk=registration.event.pk)
 
+@staff_member_required
+@require_POST
+def bulk_registrations(request, pk):
+    """Actions groupées sur les inscriptions : confirmer, refuser ou supprimer"""
+    event = get_object_or_404(Event, pk=pk)
+    action = request.POST.get('action')
+    status = request.POST.get('status', '')
+    
+    # Sélection par cases à cocher, ou toutes les inscriptions du filtre courant
+    registrations = filter_registrations(event.eventregistration_set.all(), status)
+    if request.POST.get('scope') != 'filter':
+        ids = [value for value in request.POST.getlist('registration_ids') if value.isdigit()]
+        registrations = registrations.filter(pk__in=ids)
+    
+    redirect_url = reverse('admin_event_registrations', kwargs={'pk': event.pk})
+    if status:
+        redirect_url += f'?status={status}'
+    
+    if action == 'confirm':
+        confirmed, overflow = bulk_confirm(event, registrations)
+        queue_tickets(confirmed)
+        messages.success(request, f'{len(confirmed)} inscription(s) confirmée(s). Les tickets sont en cours d\'envoi.')
+        if overflow:
+            messages.warning(request, f'{overflow} inscription(s) non confirmée(s) : l\'événement est complet.')
+    elif action == 'reject':
+        rejected, promoted = bulk_reject(event, registrations)
+        queue_tickets(promoted)
+        messages.success(request, f'{rejected} inscription(s) refusée(s).')
+    elif action == 'delete':
+        deleted, promoted = bulk_delete(event, registrations)
+        queue_tickets(promoted)
+        messages.success(request, f'{deleted} inscription(s) supprimée(s).')
+    else:
+        messages.error(request, 'Action inconnue.')
+        return redirect(redirect_url)
+    
+    if action != 'confirm' and promoted:
+        messages.info(request, f'{len(promoted)} inscription(s) de la liste d\'attente confirmée(s).')
+    return redirect(redirect_url)
+
 @staff_member_required
 def event_registrations_export_excel(request, pk):
     """Exporter les inscriptions à un événement en CSV"""
@@ -386,7 +453,7 @@ def event_registrations_export_excel(request, pk):
             reg.email,
             reg.telephone,
             reg.registration_date.strftime("%d/%m/%Y %H:%M"),
-            "Confirmé" if reg.is_confirmed else "En attente"
+            "Confirmé" if reg.is_confirmed else "Refusé" if reg.is_rejected else "En attente"
         ])
     return response
 
@@ -395,7 +462,7 @@ def event_registrations_export_excel(request, pk):
 @staff_member_required
 def news_list(request):
     """Liste des actualités"""
-    news = News.objects.all().order_by('-created_at')
+    news = News.objects.select_related('author').order_by('-created_at')
     
     paginator = Paginator(news, 10)
     page_number = request.GET.get('page')
@@ -599,7 +666,9 @@ def sponsorship_home(request):
 @staff_member_required
 def sponsorship_mentors(request):
     """Liste des parrains"""
-    mentors = Mentor.objects.all().order_by('last_name')
+    mentors = Mentor.objects.select_related('session').annotate(
+        active_mentees=Count('match', filter=Q(match__is_active=True))
+    ).order_by('last_name')
     
     # Filtrage
     specialty = request.GET.get('specialty')
@@ -620,7 +689,7 @@ def sponsorship_mentors(request):
 @staff_member_required
 def sponsorship_mentees(request):
     """Liste des filleuls"""
-    mentees = Mentee.objects.all().order_by('last_name')
+    mentees = Mentee.objects.select_related('session', 'match__mentor').order_by('last_name')
     
     # Filtrage
     specialty = request.GET.get('specialty')
@@ -647,13 +716,12 @@ def sponsorship_mentees(request):
 @staff_member_required
 def sponsorship_matches(request):
     """Liste des paires (Matches)"""
-    matches = Match.objects.all().order_by('-created_at')
+    matches = Match.objects.select_related('mentor', 'mentee', 'session').order_by('-created_at')
     
     paginator = Paginator(matches, 20)
     page_number = request.GET.get('page')
     matches_page = paginator.get_page(page_number)
     
-    context = {'matches_page': matches_page}
     context = {'matches_page': matches_page}
     return render(request, 'admin_dashboard/sponsorship/matches.html', context)
 
@@ -807,7 +875,7 @@ class SponsorshipSessionDeleteView(DeleteView):
 @staff_member_required
 def contests_home(request):
     """Page d'accueil de la gestion des concours"""
-    contests = Contest.objects.all().order_by('-start_date')
+    contests = Contest.objects.annotate(candidates_total=Count('candidates')).order_by('-start_date')
     active_contests = Contest.objects.filter(is_active=True).count()
     
     context = {
@@ -1116,7 +1184,7 @@ class DelegateDeleteView(DeleteView):
 @staff_member_required
 def blog_list(request):
     """Liste des articles de blog"""
-    articles = BlogArticle.objects.all().order_by('-published_at')
+    articles = BlogArticle.objects.select_related('author').order_by('-published_at')
     
     # Filtrage
     category = request.GET.get('category')
@@ -5,6 +5,13 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+
+Service dédié aux réponses longues en flux (téléchargements des médias) :
+    uvicorn comsas_website.asgi:application --workers 2
+ou  gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker comsas_website.asgi:application
+Un flux n'y occupe qu'une tâche de la boucle d'événements au lieu d'un thread WSGI.
+Les vues synchrones y sont exécutées une à la fois par processus : le reste du site
+reste servi par le point d'entrée WSGI (gthread).
 """
 
 import os
@@ -38,7 +38,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # En premier : les sondes ne passent ni par la redirection HTTPS ni par les mesures
+    'main.middleware.HealthCheckMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Fichiers statiques servis avant les sessions et les mesures
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'main.middleware.ProfilingMiddleware',
+    'main.middleware.ReplicaRoutingMiddleware',
+    'main.middleware.ItemFlagsMiddleware',
+    'main.middleware.QueryRepeatMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware', 
     'django.middleware.common.CommonMiddleware',
@@ -73,7 +81,6 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'comsas_website.wsgi.application'
 
-# Database
 # Database
 DATABASES = {
     'default': {
@@ -91,8 +98,30 @@ if os.environ.get('DB_NAME') and os.environ.get('DB_USER'):
         'PASSWORD': os.environ.get('DB_PASSWORD'),
         'HOST': os.environ.get('DB_HOST', 'db'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        # Connexions conservées entre les requêtes, vérifiées avant réutilisation
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
     }
 
+# Réplique en lecture seule (optionnelle) : serveur DB_REPLICA_HOST (PostgreSQL)
+# ou fichier DB_REPLICA_NAME (SQLite, copie de la base principale pour les essais locaux)
+if os.environ.get('DB_REPLICA_HOST') or os.environ.get('DB_REPLICA_NAME'):
+    DATABASES['replica'] = dict(
+        DATABASES['default'],
+        NAME=os.environ.get('DB_REPLICA_NAME') or DATABASES['default']['NAME'],
+        HOST=os.environ.get('DB_REPLICA_HOST') or DATABASES['default'].get('HOST', ''),
+        # Les tests lisent la base de test principale
+        TEST={'MIRROR': 'default'},
+    )
+DATABASE_ROUTERS = ['main.routers.ReplicaRouter']
+# Durée (s) pendant laquelle un navigateur lit la base principale après un POST
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', '15'))
+# Chemins toujours servis par la base principale
+REPLICA_EXCLUDED_PATHS = ['/dashboard/', '/admin/', '/ckeditor/', '/i18n/']
+
+# SQLite : WAL, busy_timeout, synchronous=NORMAL et mmap à chaque connexion (main/db_tuning.py)
+SQLITE_TUNING_ENABLED = os.environ.get('SQLITE_TUNING_ENABLED', '1') == '1'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -148,6 +177,24 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Stockage par défaut (images, CKEditor...) ; archives, documents administratifs, galerie et
+# aperçus utilisent le stockage dédoublonné main.storage.dedup_storage (fichiers libérés à la suppression)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    # collectstatic : CSS minifiés, noms hachés et variantes .gz/.br (main/staticfiles.py)
+    'staticfiles': {
+        'BACKEND': 'main.staticfiles.MinifiedStaticFilesStorage',
+    },
+}
+
+# Envoi des archives et documents téléchargés : None (Django, avec Range et 304),
+# 'x-accel-redirect' (Nginx) ou 'x-sendfile' (Apache, mod_xsendfile)
+MEDIA_SENDFILE_BACKEND = os.environ.get('MEDIA_SENDFILE_BACKEND') or None
+# Nginx : location /protected-media/ { internal; alias /app/media/; }
+MEDIA_ACCEL_PREFIX = os.environ.get('MEDIA_ACCEL_PREFIX', '/protected-media/')
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -182,6 +229,8 @@ MESSAGE_TAGS = {
 
 # Sécurité pour les sessions admin
 SESSION_COOKIE_AGE = 3600  # 1 heure
+# Drapeaux « déjà vu / aimé / voté » des visiteurs : cookie bitset (main/flags.py), pas de session
+ITEM_FLAGS_COOKIE_AGE = SESSION_COOKIE_AGE
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 SESSION_COOKIE_SECURE = False  # True en production avec HTTPS
 SESSION_COOKIE_HTTPONLY = True
@@ -195,6 +244,17 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp']
 ALLOWED_VIDEO_EXTENSIONS = ['mp4', 'avi', 'mov', 'wmv', 'webm']
 
+# Mesure des performances par route (tableau de bord > Performances)
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '1') == '1'
+# Jeton pour la collecte Prometheus (en-tête Authorization: Bearer <jeton>)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+# Détection des requêtes SQL répétées (N+1), journalisées dans le logger main.queries.
+# Désactivée par défaut : DEBUG ne suffit pas à l'activer en production
+QUERY_DETECTOR_ENABLED = os.environ.get('QUERY_DETECTOR_ENABLED', '0') == '1'
+QUERY_DETECTOR_THRESHOLD = int(os.environ.get('QUERY_DETECTOR_THRESHOLD', '5'))
+# /readyz répond 503 au-delà de ce nombre d'archives en attente d'extraction
+HEALTH_MAX_BACKLOG = int(os.environ.get('HEALTH_MAX_BACKLOG', '1000'))
+
 # Cache pour améliorer les performances
 CACHES = {
     'default': {
@@ -240,6 +300,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': True,
         },
+        'main.queries': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
         'django': {
             'handlers': ['file'],
             'level': 'INFO',
@@ -0,0 +1,50 @@
+"""
+Configuration de Gunicorn (chargée automatiquement depuis le répertoire courant,
+ou avec `gunicorn -c gunicorn.conf.py`). Chaque valeur peut être surchargée par l'environnement.
+"""
+import os
+
+
+def _cpu_count():
+    # Processeurs réellement attribués au conteneur (cpuset), pas ceux de l'hôte
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+
+# Processus : 2 × CPU + 1, plafonné (chaque worker charge ReportLab et PIL)
+workers = int(os.environ.get('WEB_CONCURRENCY', min(2 * _cpu_count() + 1, int(os.environ.get('GUNICORN_MAX_WORKERS', '8')))))
+
+# Threads par worker : les vues attendent surtout la base, le disque et le SMTP ;
+# une génération PDF longue n'immobilise plus qu'un thread au lieu d'un worker entier
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+
+# Recyclage des workers pour contenir les fuites mémoire (ReportLab, PIL) ; la gigue évite
+# que tous les workers redémarrent en même temps
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+# Application chargée une fois dans le maître puis partagée (copie à l'écriture) par les workers
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+# Génération des PDF et exports : jusqu'à 2 minutes
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+# Fichier de battement de cœur en mémoire : /tmp sur disque peut bloquer les workers (Docker)
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def pre_fork(server, worker):
+    # Avec preload_app, une connexion ouverte dans le maître serait partagée par les workers
+    from django.db import connections
+    connections.close_all()
@@ -200,8 +200,25 @@ class EventAdmin(admin.ModelAdmin):
 
 @admin.register(EventRegistration)
 class EventRegistrationAdmin(admin.ModelAdmin):
-    list_display = ('nom_prenom', 'event', 'email', 'is_confirmed', 'registration_date')
-    list_filter = ('is_confirmed', 'event')
+    list_display = ('nom_prenom', 'event', 'email', 'is_confirmed', 'is_waitlisted', 'is_rejected', 'registration_date')
+    list_filter = ('is_confirmed', 'is_waitlisted', 'is_rejected', 'event')
+
+    # Les modifications faites ici contournent les compteurs : on les recalcule
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and 'event' in form.changed_data and form.initial.get('event'):
+            Event.objects.get(pk=form.initial['event']).refresh_counters()
+        obj.event.refresh_counters()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        obj.event.refresh_counters()
+
+    def delete_queryset(self, request, queryset):
+        event_ids = set(queryset.values_list('event_id', flat=True))
+        super().delete_queryset(request, queryset)
+        for event in Event.objects.filter(pk__in=event_ids):
+            event.refresh_counters()
 
 @admin.register(News)
 class NewsAdmin(admin.ModelAdmin):
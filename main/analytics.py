@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMinute, TruncHour
+
+from .models import EventRegistration
+
+# Les statistiques de présence changent à chaque scan : cache court
+ATTENDANCE_CACHE_TIMEOUT = 60
+
+
+def attendance_cache_key(event_pk):
+    return f'event_attendance_{event_pk}'
+
+
+def arrival_curve(event, bucket='minute'):
+    """
+    Nombre d'entrées par minute (ou par heure) pour un événement.
+    Une seule requête groupée sur EventRegistration.checked_in_at.
+    """
+    trunc = TruncHour if bucket == 'hour' else TruncMinute
+    rows = EventRegistration.objects.filter(
+        event=event,
+        checked_in_at__isnull=False,
+    ).annotate(
+        slot=trunc('checked_in_at')
+    ).values('slot').annotate(
+        count=Count('id')
+    ).order_by('slot')
+
+    curve = []
+    total = 0
+    for row in rows:
+        total += row['count']
+        curve.append({'slot': row['slot'], 'count': row['count'], 'cumulative': total})
+    return curve
+
+
+def no_show_by_promotion(event):
+    """Taux d'absence des inscrits confirmés, par promotion (une requête groupée)"""
+    rows = EventRegistration.objects.filter(
+        event=event,
+        is_confirmed=True,
+    ).values('promotion').annotate(
+        registered=Count('id'),
+        present=Count('id', filter=Q(checked_in_at__isnull=False)),
+    ).order_by('promotion')
+
+    stats = []
+    for row in rows:
+        absent = row['registered'] - row['present']
+        stats.append({
+            'promotion': row['promotion'] or '-',
+            'registered': row['registered'],
+            'present': row['present'],
+            'absent': absent,
+            'no_show_rate': round(absent * 100 / row['registered'], 1) if row['registered'] else 0,
+        })
+    return stats
+
+
+def event_attendance(event):
+    """Statistiques de présence d'un événement, mises en cache par événement"""
+    key = attendance_cache_key(event.pk)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    curve = arrival_curve(event)
+    promotions = no_show_by_promotion(event)
+    peak = max(curve, key=lambda point: point['count']) if curve else None
+
+    registered = sum(row['registered'] for row in promotions)
+    present = sum(row['present'] for row in promotions)
+    data = {
+        'arrival_curve': curve,
+        'hourly': arrival_curve(event, bucket='hour'),
+        'by_promotion': promotions,
+        'peak_minute': peak['slot'] if peak else None,
+        'peak_count': peak['count'] if peak else 0,
+        'registered': registered,
+        'present': present,
+        'no_show_rate': round((registered - present) * 100 / registered, 1) if registered else 0,
+    }
+    cache.set(key, data, ATTENDANCE_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_event_attendance(event_pk):
+    cache.delete(attendance_cache_key(event_pk))
@@ -9,9 +9,11 @@ from reportlab.lib.utils import ImageReader
 from reportlab.lib import colors
 from reportlab.pdfbase.pdfmetrics import stringWidth
 from django.conf import settings
-from django.urls import reverse
 from PIL import Image, ImageOps, ImageDraw
 
+from .utils import draw_qr_code
+from .ticket_utils import ticket_verification_url
+
 def create_circular_mask(image_path, size=(400, 400)):
     """Creates a circular mask for an image"""
     try:
@@ -254,16 +256,8 @@ def generate_badge(registration):
     qr_x = 10*mm
     
     # QR Code
-    qr_url = settings.SITE_URL + reverse('ticket_verify', kwargs={'uuid': registration.uuid})
-    qr = qrcode.QRCode(box_size=10, border=1)
-    qr.add_data(qr_url)
-    qr.make(fit=True)
-    qr_img = qr.make_image(fill_color="black", back_color="white")
-    
-    qr_blob = BytesIO()
-    qr_img.save(qr_blob, 'PNG')
-    qr_blob.seek(0)
-    p.drawImage(ImageReader(qr_blob), qr_x, qr_y, width=qr_size, height=qr_size)
+    qr_url = ticket_verification_url(registration)
+    draw_qr_code(p, qr_url, qr_x, qr_y, qr_size, error_correction=qrcode.constants.ERROR_CORRECT_M, border=1)
     
     # Tech Barcode
     bar_x = width - 15*mm - 35*mm
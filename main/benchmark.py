@@ -0,0 +1,250 @@
+import json
+import platform
+import subprocess
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from .badge_utils import generate_badge
+from .certificate_utils import generate_certificate
+from .db_tuning import current_pragmas
+from .metrics import percentile
+from .models import Archive, Candidate, Contest, Event, EventRegistration, Member
+from .utils import generate_member_card, generate_ticket
+
+# Volumes réalistes d'une année d'activité (voir main/seeding.py pour les autres modèles)
+BENCHMARK_VOLUMES = {
+    'members': 20_000,
+    'events': 100,
+    'registrations_per_event': 500,
+    'contests': 2,
+    'votes_per_contest': 25_000,
+    'archives': 5_000,
+}
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Scenario:
+    """Un chemin mesuré : `run(client, i)` exécute la i-ème itération et retourne un code HTTP"""
+
+    def __init__(self, name, run):
+        self.name = name
+        self.run = run
+
+
+def _open_event():
+    """Événement aux inscriptions ouvertes et sans limite de places"""
+    event = Event.objects.order_by('pk').first()
+    Event.objects.filter(pk=event.pk).update(
+        is_active=True, max_participants=None,
+        date_event=timezone.now() + timedelta(days=30), registration_deadline=timezone.now() + timedelta(days=20),
+    )
+    return event
+
+
+def _open_contest():
+    contest = Contest.objects.filter(is_active=True).order_by('pk').first()
+    Contest.objects.filter(pk=contest.pk).update(
+        start_date=timezone.now() - timedelta(days=1), end_date=timezone.now() + timedelta(days=1),
+    )
+    return contest
+
+
+def build_scenarios(run_id):
+    """Scénarios des chemins publics les plus sollicités et des générateurs PDF"""
+    event = _open_event()
+    contest = _open_contest()
+    candidates = list(Candidate.objects.filter(contest=contest).values_list('pk', flat=True))
+    levels = list(Archive.objects.values_list('level', flat=True).distinct())
+    registrations = list(EventRegistration.objects.select_related('event').order_by('pk')[:50])
+    members = list(Member.objects.order_by('pk')[:50])
+
+    def home(client, i):
+        return client.get(reverse('home')).status_code
+
+    def event_register(client, i):
+        return client.post(reverse('event_detail', args=[event.pk]), {
+            'nom_prenom': f'Participant {i}', 'email': f'bench-{run_id}-{i}@example.com',
+            'telephone': '690000000', 'promotion': 'L3',
+        }).status_code
+
+    def vote(client, i):
+        url = reverse('vote_candidate', args=[contest.slug, candidates[i % len(candidates)]])
+        body = json.dumps({'email': f'bench-{run_id}-{i}@example.com', 'matricule': f'B{run_id}{i:07d}'[:20]})
+        return client.post(url, body, content_type='application/json').status_code
+
+    def archives(client, i):
+        # Alternance entre liste complète et filtres
+        params = {} if i % 2 == 0 else {'level': levels[i % len(levels)]}
+        return client.get(reverse('archives'), params).status_code
+
+    def contest_detail(client, i):
+        return client.get(reverse('contest_detail', args=[contest.slug])).status_code
+
+    def pdf(generator, objects):
+        def run(client, i):
+            generator(objects[i % len(objects)])
+            return 200
+        return run
+
+    return [
+        Scenario('home', home),
+        Scenario('event_detail_post', event_register),
+        Scenario('vote_candidate', vote),
+        Scenario('archives_list', archives),
+        Scenario('contest_detail', contest_detail),
+        Scenario('pdf_ticket', pdf(generate_ticket, registrations)),
+        Scenario('pdf_certificate', pdf(generate_certificate, registrations)),
+        Scenario('pdf_badge', pdf(generate_badge, registrations)),
+        Scenario('pdf_member_card', pdf(generate_member_card, members)),
+    ]
+
+
+def _worker(scenario, iterations, offset, step, durations, errors):
+    client = Client()
+    try:
+        for i in range(offset, iterations, step):
+            start = time.perf_counter()
+            try:
+                status = scenario.run(client, i)
+            except Exception:
+                status = 500
+            durations.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        # Chaque thread ouvre sa propre connexion à la base
+        if threading.current_thread() is not threading.main_thread():
+            connection.close()
+
+
+def _summary(durations, errors, elapsed):
+    ordered = sorted(durations)
+    result = {
+        'iterations': len(ordered),
+        'errors': len(errors),
+        'throughput': round(len(ordered) / elapsed, 2) if elapsed else 0,
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0,
+    }
+    for q in QUANTILES:
+        result[f'p{int(q * 100)}_ms'] = round(percentile(ordered, q) * 1000, 2)
+    return result
+
+
+def measure(scenario, iterations, concurrency=1, warmup=5):
+    """Débit (itérations/s) et latences d'un scénario, sur `concurrency` threads"""
+    for i in range(warmup):
+        scenario.run(Client(), iterations + i)
+
+    durations, errors = [], []
+    start = time.perf_counter()
+    if concurrency == 1:
+        _worker(scenario, iterations, 0, 1, durations, errors)
+    else:
+        threads = [
+            threading.Thread(target=_worker, args=(scenario, iterations, n, concurrency, durations, errors))
+            for n in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return _summary(durations, errors, time.perf_counter() - start)
+
+
+# Scénarios exécutés simultanément par le banc d'écritures concurrentes : votes et inscriptions
+# se disputent le verrou d'écriture pendant que la page du concours est lue
+CONTENTION_SCENARIOS = ('vote_candidate', 'event_detail_post', 'contest_detail')
+
+
+def measure_together(scenarios, iterations, concurrency):
+    """Comme measure(), mais tous les scénarios tournent en même temps, `concurrency` threads chacun"""
+    durations = {scenario.name: [] for scenario in scenarios}
+    errors = {scenario.name: [] for scenario in scenarios}
+    threads = [
+        threading.Thread(target=_worker, args=(
+            scenario, iterations, n, concurrency, durations[scenario.name], errors[scenario.name],
+        ))
+        for scenario in scenarios for n in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {name: _summary(values, errors[name], elapsed) for name, values in durations.items()}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run_benchmarks(iterations=200, concurrency=1, only=None, volumes=None, log=None):
+    """Exécute les scénarios sur la base courante (déjà peuplée) et retourne le rapport"""
+    run_id = int(time.time()) % 100000
+    report = {
+        'commit': _git_commit(),
+        'date': timezone.now().isoformat(),
+        'database': connections['default'].vendor,
+        'python': platform.python_version(),
+        'iterations': iterations,
+        'concurrency': concurrency,
+        'volumes': volumes or {},
+        'scenarios': {},
+    }
+    for scenario in build_scenarios(run_id):
+        if only and scenario.name not in only:
+            continue
+        result = measure(scenario, iterations, concurrency)
+        report['scenarios'][scenario.name] = result
+        if log:
+            log(scenario.name, result)
+    return report
+
+
+def run_contention(iterations=200, concurrency=4, volumes=None, log=None):
+    """Banc d'écritures concurrentes : rapport au même format que run_benchmarks()"""
+    run_id = int(time.time()) % 100000
+    scenarios = [scenario for scenario in build_scenarios(run_id) if scenario.name in CONTENTION_SCENARIOS]
+    report = {
+        'commit': _git_commit(),
+        'date': timezone.now().isoformat(),
+        'database': connections['default'].vendor,
+        'python': platform.python_version(),
+        'mode': 'contention',
+        'iterations': iterations,
+        'concurrency': concurrency,
+        'volumes': volumes or {},
+        'scenarios': measure_together(scenarios, iterations, concurrency),
+    }
+    if connection.vendor == 'sqlite':
+        report['pragmas'] = current_pragmas(connection)
+    if log:
+        for name, result in report['scenarios'].items():
+            log(name, result)
+    return report
+
+
+def compare(previous, current, metric='p95_ms'):
+    """Écart relatif par scénario entre deux rapports : [(nom, avant, après, écart en %)]"""
+    rows = []
+    for name, result in current['scenarios'].items():
+        before = previous.get('scenarios', {}).get(name, {}).get(metric)
+        after = result[metric]
+        change = round((after - before) / before * 100, 1) if before else None
+        rows.append((name, before, after, change))
+    return rows
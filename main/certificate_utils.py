@@ -1,4 +1,3 @@
-import qrcode
 import os
 from io import BytesIO
 from django.core.files import File
@@ -11,6 +10,8 @@ from reportlab.pdfbase.pdfmetrics import stringWidth
 from django.conf import settings
 from django.urls import reverse
 
+from .utils import draw_qr_code
+
 
 def generate_certificate(registration):
     """
@@ -23,23 +24,9 @@ def generate_certificate(registration):
     if not event.certificate_enabled:
         return None
     
-    # 1. Generate QR Code linking to event detail page
+    # 1. QR Code linking to event detail page (drawn as vector below)
     event_url = settings.SITE_URL + reverse('event_detail', kwargs={'pk': event.pk})
     
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_H,
-        box_size=6,
-        border=2,
-    )
-    qr.add_data(event_url)
-    qr.make(fit=True)
-    
-    qr_img = qr.make_image(fill_color="black", back_color="white")
-    qr_blob = BytesIO()
-    qr_img.save(qr_blob, 'PNG')
-    qr_blob.seek(0)
-    
     # 2. Generate PDF Certificate (A4 Landscape for elegance)
     buffer = BytesIO()
     page_width, page_height = A4
@@ -215,8 +202,7 @@ des connaissances abordées. En foi de quoi la présente attestation est établi
     qr_x = page_width - border_margin - qr_size - 0.4*inch
     qr_y = border_margin + 0.6*inch  # Moved up from 0.3
     
-    qr_reader = ImageReader(qr_blob)
-    p.drawImage(qr_reader, qr_x, qr_y, width=qr_size, height=qr_size)
+    draw_qr_code(p, event_url, qr_x, qr_y, qr_size)
     
     # QR label
     p.setFont("Helvetica", 6)
@@ -0,0 +1,32 @@
+from django.conf import settings
+
+# PRAGMA appliqués à chaque nouvelle connexion SQLite
+SQLITE_PRAGMAS = {
+    # Les lectures ne bloquent plus l'écriture en cours (et inversement) ; persistant dans le fichier
+    'journal_mode': 'WAL',
+    # Attente du verrou d'écriture (ms) au lieu d'échouer avec « database is locked »
+    'busy_timeout': 5000,
+    # Sûr en WAL : plus de synchronisation disque à chaque validation, seulement aux points de contrôle
+    'synchronous': 'NORMAL',
+    # Lectures par projection mémoire du fichier (256 Mo)
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+
+def tune_connection(sender, connection, **kwargs):
+    """Récepteur de connection_created : configure les connexions SQLite (sans effet sur PostgreSQL)"""
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_TUNING_ENABLED', True):
+        return
+    for name, value in SQLITE_PRAGMAS.items():
+        # Connexion DB-API directe : ni journal des requêtes ni middleware de mesure
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+def current_pragmas(connection):
+    """Valeurs effectives des PRAGMA sur une connexion SQLite ouverte"""
+    with connection.cursor() as cursor:
+        values = {}
+        for name in SQLITE_PRAGMAS:
+            cursor.execute(f'PRAGMA {name}')
+            values[name] = cursor.fetchone()[0]
+    return values
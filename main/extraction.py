@@ -0,0 +1,143 @@
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import connection as db_connection, transaction
+from django.db.models import F
+from PIL import Image
+from pypdf import PdfReader
+from pypdf.errors import PyPdfError
+
+from .models import Archive
+
+logger = logging.getLogger(__name__)
+
+# Texte conservé par document : suffisant pour la recherche, borne la mémoire et l'index
+MAX_TEXT_CHARS = 200_000
+
+# Largeur de l'aperçu de la première page, en pixels
+PREVIEW_WIDTH = 600
+
+
+def extract_text(path, max_chars=MAX_TEXT_CHARS):
+    """Texte d'un PDF, page par page : une seule page en mémoire à la fois"""
+    reader = PdfReader(path)
+    parts, size = [], 0
+    for page in reader.pages:
+        text = ' '.join((page.extract_text() or '').split())
+        if text:
+            parts.append(text[:max_chars - size])
+            size += len(parts[-1]) + 1
+        if size >= max_chars:
+            break
+    return '\n'.join(parts)
+
+
+def _thumbnail(image):
+    image = image.convert('RGB')
+    image.thumbnail((PREVIEW_WIDTH, PREVIEW_WIDTH * 2))
+    output = BytesIO()
+    image.save(output, format='JPEG', quality=80, optimize=True)
+    return output.getvalue()
+
+
+def render_preview(path):
+    """
+    Aperçu JPEG de la première page : rendu par pdftoppm (poppler) s'il est installé,
+    sinon première image de la page (PV scannés). Retourne None si aucun aperçu possible.
+    """
+    if shutil.which('pdftoppm'):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'preview')
+            subprocess.run(
+                ['pdftoppm', '-png', '-f', '1', '-l', '1', '-singlefile', '-scale-to', str(PREVIEW_WIDTH), path, output],
+                check=True, capture_output=True, timeout=60,
+            )
+            with Image.open(output + '.png') as image:
+                return _thumbnail(image)
+
+    reader = PdfReader(path)
+    if not reader.pages:
+        return None
+    for embedded in reader.pages[0].images:
+        with Image.open(BytesIO(embedded.data)) as image:
+            return _thumbnail(image)
+    return None
+
+
+def process_archive(archive):
+    """Extrait le texte et l'aperçu d'une archive ; sans effet si déjà à jour"""
+    name = archive.file.name
+    if not name or archive.extracted_file == name:
+        return False
+
+    text, preview, failed = '', None, False
+    if archive.is_pdf:
+        try:
+            text = extract_text(archive.file.path)
+            preview = render_preview(archive.file.path)
+        except (PyPdfError, OSError, ValueError, subprocess.SubprocessError) as e:
+            logger.warning("Extraction impossible pour l'archive %s : %s", archive.pk, e)
+            failed = True
+
+    archive.text_content = text
+    archive.extracted_file = name
+    archive.extraction_failed = failed
+    update_fields = ['text_content', 'extracted_file', 'extraction_failed']
+    if preview:
+        archive.preview.save(f'{archive.slug or archive.pk}.jpg', ContentFile(preview), save=False)
+        update_fields.append('preview')
+    # Le signal de sauvegarde réindexe l'archive avec son texte
+    archive.save(update_fields=update_fields)
+    return True
+
+
+def pending_archives():
+    return Archive.objects.exclude(file='').exclude(extracted_file=F('file'))
+
+
+def process_pending(archive_ids=None):
+    """Traite les archives dont le fichier n'a pas encore été extrait ; retourne leur nombre"""
+    queryset = pending_archives().defer('text_content')
+    if archive_ids is not None:
+        queryset = queryset.filter(pk__in=archive_ids)
+    processed = 0
+    for archive in queryset.iterator(chunk_size=50):
+        try:
+            processed += process_archive(archive)
+        except Exception:
+            # Erreur inattendue (PDF piégé, bogue de l'extracteur) : l'archive est marquée
+            # en échec pour ne pas être retentée à chaque passage, les suivantes sont traitées
+            logger.exception("Échec de l'extraction de l'archive %s", archive.pk)
+            mark_failed(archive)
+    return processed
+
+
+def mark_failed(archive):
+    Archive.objects.filter(pk=archive.pk).update(
+        text_content='', extracted_file=archive.file.name, extraction_failed=True
+    )
+
+
+def _process_in_background(archive_ids):
+    try:
+        process_pending(archive_ids)
+    except Exception:
+        logger.exception("Échec de l'extraction des archives %s", archive_ids)
+    finally:
+        # Le thread ouvre sa propre connexion à la base
+        db_connection.close()
+
+
+def queue_extraction(archive_ids):
+    """Programme l'extraction après validation de la transaction, dans un thread séparé"""
+    archive_ids = list(archive_ids)
+    if archive_ids:
+        transaction.on_commit(
+            lambda: threading.Thread(target=_process_in_background, args=(archive_ids,), daemon=True).start()
+        )
@@ -0,0 +1,64 @@
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, F
+from django.utils.http import urlencode
+
+from .models import Archive, BlogArticle, CacheVersion
+
+# Les compteurs changent rarement : invalidés par signal via la version partagée (CacheVersion)
+FACETS_TIMEOUT = 60 * 60
+
+# Paramètre GET -> champ du modèle
+ARCHIVE_DIMENSIONS = {'level': 'level', 'year': 'academic_year', 'category': 'category'}
+BLOG_DIMENSIONS = {'category': 'category'}
+
+
+def _version(name):
+    # Version en base, lue à chaque appel : une modification traitée par un worker
+    # invalide aussi les comptes mis en cache par les autres
+    version = CacheVersion.objects.filter(name=f'facets:{name}').values_list('version', flat=True).first()
+    return version or 0
+
+
+def invalidate_facets(name):
+    """Incrémente la version : toutes les combinaisons de filtres en cache sont périmées d'un coup"""
+    key = f'facets:{name}'
+    if CacheVersion.objects.filter(name=key).update(version=F('version') + 1):
+        return
+    _, created = CacheVersion.objects.get_or_create(name=key, defaults={'version': 1})
+    if not created:
+        CacheVersion.objects.filter(name=key).update(version=F('version') + 1)
+
+
+def facet_counts(name, queryset, dimensions, filters):
+    """
+    Nombre de résultats pour chaque valeur de chaque dimension, {dimension: {valeur: nombre}}.
+    Une requête GROUP BY par dimension, sous les filtres actifs des autres dimensions,
+    mise en cache par combinaison de filtres.
+    """
+    active = {dimension: value for dimension, value in filters.items() if dimension in dimensions and value}
+    signature = hashlib.md5(urlencode(sorted(active.items())).encode()).hexdigest()
+    key = f'facets:{name}:{_version(name)}:{signature}'
+    counts = cache.get(key)
+    if counts is None:
+        counts = {}
+        for dimension, field in dimensions.items():
+            others = {dimensions[other]: value for other, value in active.items() if other != dimension}
+            rows = queryset.filter(**others).order_by().values(field).annotate(count=Count('pk'))
+            counts[dimension] = {row[field]: row['count'] for row in rows}
+        cache.set(key, counts, FACETS_TIMEOUT)
+    return counts
+
+
+def archive_facets(filters):
+    return facet_counts('archive', Archive.objects.all(), ARCHIVE_DIMENSIONS, filters)
+
+
+def blog_facets(filters):
+    return facet_counts('blog', BlogArticle.objects.filter(is_published=True), BLOG_DIMENSIONS, filters)
+
+
+def with_counts(choices, counts):
+    """[(code, libellé)] -> [(code, libellé, nombre)]"""
+    return [(code, label, counts.get(code, 0)) for code, label in choices]
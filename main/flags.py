@@ -0,0 +1,75 @@
+import base64
+import re
+
+# Type de drapeau -> code court dans le cookie
+FLAG_KINDS = {
+    'viewed_article': 'va',
+    'liked_article': 'la',
+    'viewed_archive': 'vr',
+    'liked_archive': 'lr',
+    'voted_contest': 'vc',
+}
+
+# Taille maximale d'un bitset (1 Ko, soit 8192 identifiants consécutifs) : le cookie reste sous 4 Ko
+MAX_BYTES = 1024
+
+_ENTRY = re.compile(r'([a-z]+)(\d+)\.([A-Za-z0-9_-]*)')
+
+
+def _b64decode(data):
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+class ItemFlags:
+    """
+    Drapeaux par objet (« déjà vu », « déjà aimé ») d'un navigateur, stockés dans un cookie :
+    un bitset par type, à partir de l'octet `offset` (identifiant // 8).
+    Format : <code><offset>.<bits en base64url>, entrées séparées par « | ».
+    """
+
+    def __init__(self, value=''):
+        self.bitsets = {}
+        self.modified = False
+        codes = {code: kind for kind, code in FLAG_KINDS.items()}
+        for code, offset, data in _ENTRY.findall(value or ''):
+            if code in codes:
+                try:
+                    self.bitsets[codes[code]] = (int(offset), bytearray(_b64decode(data)[:MAX_BYTES]))
+                except ValueError:
+                    continue
+
+    def has(self, kind, pk):
+        offset, bits = self.bitsets.get(kind, (0, b''))
+        index = pk // 8 - offset
+        return 0 <= index < len(bits) and bool(bits[index] >> (pk % 8) & 1)
+
+    def add(self, kind, pk):
+        """Lève le drapeau ; au-delà de MAX_BYTES, les plus petits identifiants sont oubliés"""
+        if kind not in FLAG_KINDS:
+            raise KeyError(kind)
+        if self.has(kind, pk):
+            return
+        offset, bits = self.bitsets.get(kind, (pk // 8, bytearray()))
+        index = pk // 8 - offset
+        if index < 0:
+            if len(bits) - index > MAX_BYTES:
+                return
+            bits[:0] = bytes(-index)
+            offset, index = pk // 8, 0
+        if index >= len(bits):
+            bits.extend(bytes(index - len(bits) + 1))
+        bits[index] |= 1 << (pk % 8)
+        if len(bits) > MAX_BYTES:
+            drop = len(bits) - MAX_BYTES
+            del bits[:drop]
+            offset += drop
+        self.bitsets[kind] = (offset, bits)
+        self.modified = True
+
+    def encode(self):
+        entries = []
+        for kind, (offset, bits) in self.bitsets.items():
+            data = base64.urlsafe_b64encode(bytes(bits).rstrip(b'\0')).decode().rstrip('=')
+            if data:
+                entries.append(f'{FLAG_KINDS[kind]}{offset}.{data}')
+        return '|'.join(entries)
@@ -0,0 +1,66 @@
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils.crypto import get_random_string
+
+from .extraction import pending_archives
+
+# Archives en attente d'extraction au-delà desquelles l'instance n'est plus considérée prête
+MAX_BACKLOG = 1000
+
+
+def check_databases():
+    """SELECT 1 sur chaque alias configuré"""
+    for alias in connections:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+    return {'aliases': list(connections)}
+
+
+def check_cache():
+    key, value = 'health:ping', get_random_string(8)
+    cache.set(key, value, 10)
+    if cache.get(key) != value:
+        raise RuntimeError("valeur relue différente")
+    return {}
+
+
+def check_media():
+    # Fichier temporaire supprimé à la fermeture : détecte aussi un volume monté en lecture seule
+    with tempfile.TemporaryFile(dir=settings.MEDIA_ROOT):
+        pass
+    return {}
+
+
+def check_backlog():
+    pending = pending_archives().count()
+    limit = getattr(settings, 'HEALTH_MAX_BACKLOG', MAX_BACKLOG)
+    if pending > limit:
+        raise RuntimeError(f"{pending} archives en attente d'extraction (limite {limit})")
+    return {'pending_archives': pending}
+
+
+READINESS_CHECKS = {
+    'database': check_databases,
+    'cache': check_cache,
+    'media': check_media,
+    'backlog': check_backlog,
+}
+
+
+def readiness():
+    """(prête, détail par vérification) ; chaque vérification est chronométrée"""
+    results, ready = {}, True
+    for name, check in READINESS_CHECKS.items():
+        start = time.perf_counter()
+        try:
+            result = {'ok': True, **check()}
+        except Exception as e:
+            result = {'ok': False, 'error': str(e)}
+            ready = False
+        result['ms'] = round((time.perf_counter() - start) * 1000, 2)
+        results[name] = result
+    return ready, results
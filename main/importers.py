@@ -0,0 +1,358 @@
+import csv
+import itertools
+import unicodedata
+import zipfile
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta
+from xml.etree import ElementTree
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from .models import Event, EventRegistration, Member
+from .search import index_objects
+
+# Nombre de lignes validées et écrites par lot (une requête de dédoublonnage + un bulk_create)
+IMPORT_CHUNK_SIZE = 500
+
+# Nombre maximum d'erreurs détaillées conservées dans le rapport
+MAX_REPORTED_ERRORS = 500
+
+XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+# Numéros de série Excel acceptés comme dates : 01/01/1900 à 08/01/2119
+MAX_EXCEL_SERIAL = 80000
+
+
+# ============= LECTURE DES FICHIERS =============
+
+class XlsxNumber(str):
+    """Valeur d'une cellule numérique XLSX (les dates y sont des numéros de série)"""
+
+
+def normalize_header(value):
+    """'Nom Prénom' -> 'nom_prenom' (sans accents, minuscules)"""
+    value = unicodedata.normalize('NFKD', str(value or '')).encode('ascii', 'ignore').decode()
+    return '_'.join(value.lower().replace('-', ' ').replace('/', ' ').split())
+
+
+def _csv_rows(upload):
+    """Lit un CSV ligne par ligne sans le charger en mémoire (séparateur ',' ou ';')"""
+    lines = (line.decode('utf-8-sig', errors='replace') for line in upload)
+    first = next(lines, '')
+    delimiter = ';' if first.count(';') > first.count(',') else ','
+    yield from csv.reader(itertools.chain([first], lines), delimiter=delimiter)
+
+
+def _xlsx_column(reference):
+    """'C12' -> 2"""
+    index = 0
+    for char in reference:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - ord('A') + 1
+    return index - 1
+
+
+def _xlsx_rows(upload):
+    """
+    Lit la première feuille d'un classeur XLSX en flux (iterparse),
+    sans dépendance externe : seules les chaînes partagées sont gardées en mémoire.
+    """
+    with zipfile.ZipFile(upload) as archive:
+        names = archive.namelist()
+
+        shared = []
+        if 'xl/sharedStrings.xml' in names:
+            with archive.open('xl/sharedStrings.xml') as f:
+                for _, element in ElementTree.iterparse(f):
+                    if element.tag == XLSX_NS + 'si':
+                        shared.append(''.join(t.text or '' for t in element.iter(XLSX_NS + 't')))
+                        element.clear()
+
+        sheets = sorted(name for name in names if name.startswith('xl/worksheets/sheet'))
+        if not sheets:
+            raise ValueError("Aucune feuille trouvée dans le classeur")
+
+        with archive.open(sheets[0]) as f:
+            for _, element in ElementTree.iterparse(f):
+                if element.tag != XLSX_NS + 'row':
+                    continue
+                values = {}
+                for cell in element.iter(XLSX_NS + 'c'):
+                    kind = cell.get('t')
+                    value = cell.find(XLSX_NS + 'v')
+                    if kind == 's' and value is not None:
+                        text = shared[int(value.text)]
+                    elif kind == 'inlineStr':
+                        text = ''.join(t.text or '' for t in cell.iter(XLSX_NS + 't'))
+                    elif kind in (None, 'n') and value is not None and value.text:
+                        text = XlsxNumber(value.text)
+                    else:
+                        text = value.text if value is not None else ''
+                    values[_xlsx_column(cell.get('r', 'A'))] = text or ''
+                element.clear()
+                if values:
+                    yield [values.get(i, '') for i in range(max(values) + 1)]
+
+
+def read_rows(upload):
+    """
+    Itère sur les lignes d'un fichier CSV ou XLSX sous forme de dictionnaires.
+    Retourne des couples (numéro de ligne, données) ; les en-têtes sont normalisés.
+    """
+    name = (upload.name or '').lower()
+    if name.endswith('.xlsx'):
+        rows = _xlsx_rows(upload)
+    elif name.endswith('.csv') or name.endswith('.txt'):
+        rows = _csv_rows(upload)
+    else:
+        raise ValueError("Format non pris en charge : utilisez un fichier CSV ou XLSX")
+
+    header = [normalize_header(value) for value in next(rows, [])]
+    for line, values in enumerate(rows, start=2):
+        if not any(str(value).strip() for value in values):
+            continue
+        yield line, {
+            key: value if isinstance(value, XlsxNumber) else str(value).strip()
+            for key, value in zip(header, values) if key
+        }
+
+
+def parse_date(value):
+    """
+    Date au format JJ/MM/AAAA, AAAA-MM-JJ, ou numéro de série Excel pour une cellule
+    numérique XLSX (un nombre dans un CSV, « 1998 » par exemple, n'est pas une date)
+    """
+    if isinstance(value, XlsxNumber):
+        try:
+            serial = float(value)
+        except ValueError:
+            serial = 0
+        if not 1 <= serial <= MAX_EXCEL_SERIAL:
+            raise ValidationError(f"Date invalide : {value}")
+        # Les dates XLSX sont stockées en nombre de jours depuis le 30/12/1899
+        return date(1899, 12, 30) + timedelta(days=int(serial))
+    value = (value or '').strip()
+    if not value:
+        return None
+    for fmt in ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValidationError(f"Date invalide : {value}")
+
+
+# ============= IMPORTEURS =============
+
+class ImportReport:
+    """Résultat d'un import : lignes créées, doublons ignorés et erreurs par ligne"""
+
+    def __init__(self):
+        self.created = 0
+        self.duplicates = 0
+        self.error_count = 0
+        self.errors = []
+        self.created_ids = []
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'message': message})
+
+    @property
+    def total(self):
+        return self.created + self.duplicates + self.error_count
+
+
+class BaseImporter(ABC):
+    """
+    Import en flux : les lignes sont validées par lots de IMPORT_CHUNK_SIZE,
+    dédoublonnées en une requête par lot puis écrites avec bulk_create.
+    """
+    model = None
+    # Champ du modèle -> en-têtes acceptés (normalisés)
+    columns = {}
+    required = ()
+    # Champs non validés par full_clean (renseignés après coup ou facultatifs à l'import)
+    clean_exclude = ()
+
+    def __init__(self):
+        self.report = ImportReport()
+        self.seen = set()
+
+    def run(self, upload):
+        try:
+            rows = read_rows(upload)
+            while True:
+                chunk = list(itertools.islice(rows, IMPORT_CHUNK_SIZE))
+                if not chunk:
+                    break
+                self.import_chunk(chunk)
+        except (ValueError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+            self.report.add_error(0, f"Fichier illisible : {e}")
+        return self.report
+
+    def map_row(self, row):
+        data = {}
+        for field, aliases in self.columns.items():
+            for alias in (field,) + aliases:
+                if row.get(alias):
+                    data[field] = row[alias]
+                    break
+        missing = [field for field in self.required if not data.get(field)]
+        if missing:
+            raise ValidationError(f"Colonnes obligatoires manquantes : {', '.join(missing)}")
+        return data
+
+    def build(self, data):
+        return self.model(**data)
+
+    @abstractmethod
+    def dedupe_key(self, obj):
+        """Clé d'unicité d'un objet (None : pas de dédoublonnage)"""
+
+    @abstractmethod
+    def existing_keys(self, keys):
+        """Clés déjà présentes en base parmi `keys` (une requête)"""
+
+    def import_chunk(self, chunk):
+        candidates = []
+        for line, row in chunk:
+            try:
+                obj = self.build(self.map_row(row))
+                # Validation des champs sans requête : l'unicité est vérifiée par lot
+                obj.full_clean(exclude=self.clean_exclude, validate_unique=False, validate_constraints=False)
+            except ValidationError as e:
+                messages = e.message_dict.items() if hasattr(e, 'error_dict') else [('', e.messages)]
+                self.report.add_error(line, ' ; '.join(
+                    f"{field}: {', '.join(errors)}" if field else ', '.join(errors) for field, errors in messages
+                ))
+                continue
+            candidates.append((line, obj))
+
+        keys = {self.dedupe_key(obj) for _, obj in candidates} - {None}
+        existing = self.existing_keys(keys) if keys else set()
+
+        objects = []
+        for line, obj in candidates:
+            key = self.dedupe_key(obj)
+            if key is not None and (key in existing or key in self.seen):
+                self.report.duplicates += 1
+                continue
+            if key is not None:
+                self.seen.add(key)
+            objects.append(obj)
+
+        if objects:
+            self.save(objects)
+
+    def save(self, objects):
+        """Écrit les objets ; retourne ceux réellement créés"""
+        try:
+            with transaction.atomic():
+                created = self.model.objects.bulk_create(objects, batch_size=IMPORT_CHUNK_SIZE)
+        except IntegrityError:
+            # Écriture concurrente depuis le dédoublonnage : insertion ligne à ligne,
+            # les lignes en conflit sont comptées comme doublons
+            created = []
+            for obj in objects:
+                try:
+                    with transaction.atomic():
+                        created.extend(self.model.objects.bulk_create([obj]))
+                except IntegrityError:
+                    self.report.duplicates += 1
+        self.report.created += len(created)
+        self.report.created_ids.extend(obj.pk for obj in created if obj.pk)
+        return created
+
+
+class RegistrationImporter(BaseImporter):
+    """Import des inscriptions à un événement (formulaires papier, Google Forms...)"""
+    model = EventRegistration
+    columns = {
+        'nom_prenom': ('nom', 'nom_et_prenom', 'nom_complet', 'name', 'participant'),
+        'email': ('e_mail', 'adresse_e_mail', 'adresse_email', 'courriel'),
+        'telephone': ('tel', 'numero_de_telephone', 'phone'),
+        'promotion': ('niveau', 'classe'),
+        'message': ('commentaire', 'message_commentaire'),
+    }
+    required = ('nom_prenom', 'email')
+    clean_exclude = ('event', 'photo', 'telephone', 'promotion')
+
+    def __init__(self, event, confirm=True):
+        super().__init__()
+        self.event = event
+        self.confirm = confirm
+        self.confirmed_ids = []
+
+    def build(self, data):
+        data['email'] = data['email'].lower()
+        return EventRegistration(event=self.event, **data)
+
+    def dedupe_key(self, obj):
+        return obj.email
+
+    def existing_keys(self, keys):
+        # Les inscriptions du formulaire public conservent la casse saisie
+        return set(
+            EventRegistration.objects.filter(event=self.event)
+            .annotate(email_lower=Lower('email'))
+            .filter(email_lower__in=keys)
+            .order_by().values_list('email_lower', flat=True)
+        )
+
+    def save(self, objects):
+        with transaction.atomic():
+            # Attribution des places en une fois, ligne de l'événement verrouillée
+            event = Event.objects.select_for_update().get(pk=self.event.pk)
+            seats = 0
+            if self.confirm:
+                seats = len(objects) if event.max_participants is None else \
+                    max(min(event.max_participants - event.confirmed_count, len(objects)), 0)
+            for index, obj in enumerate(objects):
+                obj.is_confirmed = index < seats
+                obj.is_waitlisted = self.confirm and index >= seats
+            created = super().save(objects)
+            confirmed = [obj.pk for obj in created if obj.is_confirmed]
+            event.adjust_counters(confirmed=len(confirmed), pending=len(created) - len(confirmed))
+        self.confirmed_ids.extend(confirmed)
+        return created
+
+
+class MemberImporter(BaseImporter):
+    """Import des membres, dédoublonnés par matricule"""
+    model = Member
+    columns = {
+        'nom_prenom': ('nom', 'nom_et_prenom', 'nom_complet', 'name'),
+        'date_naissance': ('date_de_naissance', 'ne_le'),
+        'lieu_naissance': ('lieu_de_naissance', 'ne_a'),
+        'niveau': ('level', 'classe'),
+        'promotion': ('annee_de_sortie',),
+        'telephone': ('tel', 'numero_de_telephone', 'phone'),
+        'email': ('e_mail', 'adresse_e_mail', 'adresse_email', 'courriel'),
+        'matricule': ('matricule_etudiant', 'mat'),
+        'profession': (),
+        'member_type': ('type', 'type_de_membre'),
+    }
+    required = ('nom_prenom', 'date_naissance', 'lieu_naissance', 'telephone', 'email')
+    clean_exclude = ('user', 'photo', 'bio')
+
+    def build(self, data):
+        data['date_naissance'] = parse_date(data['date_naissance'])
+        data['email'] = data['email'].lower()
+        return Member(**data)
+
+    def save(self, objects):
+        created = super().save(objects)
+        # bulk_create n'émet pas post_save : indexation groupée pour la recherche
+        index_objects(created)
+        return created
+
+    def dedupe_key(self, obj):
+        return obj.matricule or None
+
+    def existing_keys(self, keys):
+        return set(Member.objects.filter(matricule__in=keys).order_by().values_list('matricule', flat=True))
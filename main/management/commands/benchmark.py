@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from main.benchmark import BENCHMARK_VOLUMES, compare, run_benchmarks, run_contention
+from main.models import Member
+from main.seeding import seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le débit et la latence (p50/p95/p99) des chemins publics les plus sollicités et des "
+        "générateurs PDF, sur une base de test peuplée (SQLite, ou PostgreSQL si DB_NAME est défini)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help="Multiplicateur des volumes totaux (1 = 20k membres, 100 événements, 5k archives)")
+        parser.add_argument('--iterations', type=int, default=200, help="Itérations par scénario")
+        parser.add_argument('--concurrency', type=int, help="Threads simultanés par scénario (par défaut : 1, ou 4 avec --contention)")
+        parser.add_argument('--contention', action='store_true', help="Votes, inscriptions et lectures du concours exécutés simultanément")
+        parser.add_argument('--no-tuning', action='store_true', help="SQLite : sans les réglages de main/db_tuning.py (journal classique), pour comparaison")
+        parser.add_argument('--only', nargs='*', help="Scénarios à exécuter (par défaut : tous)")
+        parser.add_argument('--keepdb', action='store_true', help="Conserver la base de test peuplée entre deux exécutions")
+        parser.add_argument('--output', help="Fichier JSON du rapport (par défaut : benchmarks/<commit>-<base>.json)")
+        parser.add_argument('--compare', help="Rapport JSON précédent à comparer (p95)")
+
+    def handle(self, *args, **options):
+        # Les volumes « par objet » (inscriptions par événement, votes par concours) ne sont pas multipliés
+        volumes = dict(BENCHMARK_VOLUMES, scale=options['scale'])
+        media_root = tempfile.mkdtemp(prefix='comsas-bench-')
+
+        concurrency = options['concurrency'] or (4 if options['contention'] else 1)
+
+        # Base de test dédiée : la base de développement n'est jamais modifiée.
+        # SQLite : fichier plutôt que mémoire partagée, pour mesurer le verrouillage réel
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST']['NAME'] = os.path.join(settings.BASE_DIR, 'benchmarks', 'benchmark.sqlite3')
+            os.makedirs(os.path.join(settings.BASE_DIR, 'benchmarks'), exist_ok=True)
+        with override_settings(
+            MEDIA_ROOT=media_root, DEBUG=False, PROFILING_ENABLED=False, QUERY_DETECTOR_ENABLED=False,
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', ALLOWED_HOSTS=['*'],
+            SQLITE_TUNING_ENABLED=not options['no_tuning'],
+        ):
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+            try:
+                if options['no_tuning'] and connection.vendor == 'sqlite':
+                    # Le mode WAL est enregistré dans le fichier : retour au journal classique
+                    connection.cursor().execute('PRAGMA journal_mode = DELETE')
+                if not Member.objects.exists():
+                    self.stdout.write(f"Peuplement de la base ({connection.vendor}) : {volumes}...")
+                    seed(scale=options['scale'], volumes=BENCHMARK_VOLUMES)
+                if options['contention']:
+                    report = run_contention(
+                        iterations=options['iterations'], concurrency=concurrency, volumes=volumes, log=self.log,
+                    )
+                else:
+                    report = run_benchmarks(
+                        iterations=options['iterations'], concurrency=concurrency,
+                        only=options['only'], volumes=volumes, log=self.log,
+                    )
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+                shutil.rmtree(media_root, ignore_errors=True)
+
+        output = options['output'] or os.path.join(
+            settings.BASE_DIR, 'benchmarks',
+            f"{report['commit'] or 'local'}-{report['database']}{'-contention' if options['contention'] else ''}.json"
+        )
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Rapport écrit dans {output}"))
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                previous = json.load(f)
+            self.stdout.write(f"\nComparaison avec {previous.get('commit') or options['compare']} (p95, ms) :")
+            for name, before, after, change in compare(previous, report):
+                delta = f'{change:+.1f} %' if change is not None else 'nouveau'
+                style = self.style.ERROR if change is not None and change > 10 else self.style.SUCCESS
+                self.stdout.write(style(f"  {name:<20} {before or '-':>10} -> {after:>10}  {delta}"))
+
+    def log(self, name, result):
+        self.stdout.write(
+            f"  {name:<20} {result['throughput']:>8.1f} it/s   p50 {result['p50_ms']:>8.1f} ms   "
+            f"p95 {result['p95_ms']:>8.1f} ms   erreurs {result['errors']}"
+        )
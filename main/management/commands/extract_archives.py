@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from main.extraction import pending_archives, process_pending
+from main.models import Archive
+
+
+class Command(BaseCommand):
+    help = "Extrait le texte et l'aperçu des archives PDF pas encore traitées"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Tout réextraire (nouvelle version de l'extracteur)")
+
+    def handle(self, *args, **options):
+        if options['all']:
+            Archive.objects.update(extracted_file='')
+        self.stdout.write(f'{pending_archives().count()} archive(s) à traiter...')
+        processed = process_pending()
+        self.stdout.write(self.style.SUCCESS(f'{processed} archive(s) traitée(s)'))
+        failed = Archive.objects.filter(extraction_failed=True).count()
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} archive(s) en échec (voir les journaux)'))
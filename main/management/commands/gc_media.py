@@ -0,0 +1,63 @@
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from main.models import StoredFile
+from main.storage import BLOB_DIR, dedup_storage, file_fields
+
+
+class Command(BaseCommand):
+    help = "Recalcule les références du stockage dédoublonné et supprime les fichiers orphelins"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Afficher les écarts sans corriger")
+        parser.add_argument('--grace', type=int, default=60,
+                            help="Ignorer les fichiers écrits ou réutilisés depuis moins de N minutes (envois en cours)")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['grace'])
+
+        # Références réelles : une requête par champ fichier. Tous les champs sont comptés,
+        # y compris ceux d'un autre stockage qui pointeraient vers un blob
+        refs = Counter()
+        for model, field in file_fields(dedup_only=False):
+            names = model._default_manager.exclude(**{field.attname: ''}).exclude(**{f'{field.attname}__isnull': True})
+            for name in names.order_by().values_list(field.attname, flat=True).iterator(chunk_size=2000):
+                if name.startswith(f'{BLOB_DIR}/'):
+                    refs[name] += 1
+
+        stored = dict(StoredFile.objects.values_list('name', 'refs'))
+        drifted = [(name, stored.get(name, 0), count) for name, count in refs.items() if stored.get(name) != count]
+        orphans = [name for name in stored if name not in refs]
+
+        # Fichiers présents sur le disque sans aucune référence
+        root = dedup_storage.path(BLOB_DIR)
+        for directory, _, files in os.walk(root):
+            for filename in files:
+                name = os.path.relpath(os.path.join(directory, filename), dedup_storage.location).replace(os.sep, '/')
+                if name not in refs and name not in stored:
+                    orphans.append(name)
+
+        # Un envoi en cours a déjà compté sa référence mais pas encore enregistré son objet
+        drifted = [item for item in drifted if not dedup_storage.modified_after(item[0], cutoff)]
+        orphans = [name for name in orphans if not dedup_storage.modified_after(name, cutoff)]
+
+        for name, before, after in drifted:
+            self.stdout.write(f"{name}: {before} -> {after}")
+        for name in orphans:
+            self.stdout.write(f"{name}: orphelin")
+
+        if not options['dry_run']:
+            for name, _, count in drifted:
+                with transaction.atomic():
+                    stored, _ = StoredFile.objects.select_for_update().get_or_create(name=name)
+                    if not dedup_storage.modified_after(name, cutoff):
+                        StoredFile.objects.filter(pk=stored.pk).update(refs=count)
+            # Suppression sous verrou : un envoi du même contenu entre-temps conserve le fichier
+            orphans = [name for name in orphans if dedup_storage.collect(name, cutoff)]
+
+        verb = 'à corriger' if options['dry_run'] else 'corrigé(s)'
+        self.stdout.write(self.style.SUCCESS(f'{len(drifted)} compteur(s) {verb}, {len(orphans)} orphelin(s)'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from main.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruit l'index de recherche (archives, blog, actualités, événements, projets, membres)"
+
+    def handle(self, *args, **options):
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'{count} entrée(s) indexée(s)'))
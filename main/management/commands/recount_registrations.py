@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from main.models import Event, EventRegistration
+
+
+class Command(BaseCommand):
+    help = "Recalcule les compteurs d'inscriptions (confirmées / en attente, hors refusées) des événements"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Afficher les écarts sans corriger")
+
+    def handle(self, *args, **options):
+        # Une seule requête groupée sur la table des inscriptions
+        rows = EventRegistration.objects.values('event_id').annotate(
+            confirmed=Count('id', filter=Q(is_confirmed=True)),
+            pending=Count('id', filter=Q(is_confirmed=False, is_rejected=False)),
+        ).order_by()
+        counts = {row['event_id']: (row['confirmed'], row['pending']) for row in rows}
+
+        drifted = []
+        for event in Event.objects.only('id', 'title_fr', 'confirmed_count', 'pending_count'):
+            confirmed, pending = counts.get(event.pk, (0, 0))
+            if (event.confirmed_count, event.pending_count) != (confirmed, pending):
+                self.stdout.write(
+                    f"{event.title_fr}: {event.confirmed_count}/{event.pending_count} -> {confirmed}/{pending}"
+                )
+                event.confirmed_count = confirmed
+                event.pending_count = pending
+                drifted.append(event)
+
+        if drifted and not options['dry_run']:
+            with transaction.atomic():
+                Event.objects.bulk_update(drifted, ['confirmed_count', 'pending_count'], batch_size=500)
+
+        self.stdout.write(self.style.SUCCESS(f'{len(drifted)} événement(s) à corriger' if options['dry_run']
+                                             else f'{len(drifted)} événement(s) corrigé(s)'))
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from main.models import (
+    Member, Project, Event, News, GalleryAlbum, Gallery, Contact, SponsorshipSession, Contest,
+    RequestDocument, Professor, Classroom, Delegate, BlogArticle, Archive,
+)
+from main.seeding import MATRICULE_PREFIX, VOLUMES, seed
+
+# Modèles vidés par --flush (les inscriptions, votes, binômes... suivent par cascade)
+FLUSHED_MODELS = [
+    Archive, BlogArticle, RequestDocument, Professor, Classroom, Delegate, Contest, SponsorshipSession,
+    Contact, Gallery, GalleryAlbum, News, Event, Project, Member,
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Peuple la base avec un jeu de données cohérent (membres, événements, inscriptions, votes, "
+        "binômes, archives...), déterministe pour une graine donnée. --scale 1 crée quelques centaines "
+        "d'objets, --scale 2000 environ un million de lignes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1, help="Multiplicateur des volumes")
+        parser.add_argument('--seed', type=int, default=42, help="Graine du générateur aléatoire")
+        parser.add_argument('--no-files', action='store_true', help="Ne pas créer de fichiers médias (chemins fictifs)")
+        parser.add_argument('--flush', action='store_true', help="Supprimer d'abord tout le contenu existant du site")
+
+    def handle(self, *args, **options):
+        if options['flush']:
+            with transaction.atomic():
+                for model in FLUSHED_MODELS:
+                    model.objects.all().delete()
+            self.stdout.write('Contenu existant supprimé.')
+        elif Member.objects.filter(matricule__startswith=MATRICULE_PREFIX).exists():
+            raise CommandError("La base contient déjà des données générées : relancez avec --flush.")
+
+        volumes = {name: count if '_per_' in name else int(count * options['scale']) for name, count in VOLUMES.items()}
+        self.stdout.write(f"Génération (scale={options['scale']}, graine={options['seed']}) : {volumes['members']} membres, "
+                          f"{volumes['events']} événements, {volumes['archives']} archives...")
+
+        start = time.perf_counter()
+        counts = seed(
+            scale=options['scale'], seed=options['seed'], with_files=not options['no_files'],
+            log=lambda step: self.stdout.write(f"  {step} ({time.perf_counter() - start:.1f} s)"),
+        )
+        for label, count in counts.items():
+            self.stdout.write(f"  {label} : {count}")
+        total = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(f"{total} objet(s) créé(s) en {time.perf_counter() - start:.1f} s"))
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from main.models import EventRegistration
+from main.registrations import send_tickets
+
+
+class Command(BaseCommand):
+    help = "Renvoie les tickets jamais envoyés (envoi en arrière-plan interrompu) des événements à venir"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=int, help="Limiter à un événement (id)")
+        parser.add_argument('--min-age', type=int, default=15,
+                            help="Ignorer les inscriptions plus récentes (minutes) : envoi peut-être encore en cours")
+        parser.add_argument('--dry-run', action='store_true', help="Afficher le nombre de tickets sans les envoyer")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        pending = EventRegistration.objects.filter(
+            is_confirmed=True,
+            is_rejected=False,
+            ticket_sent_at__isnull=True,
+            event__date_event__gte=now,
+            registration_date__lte=now - timedelta(minutes=options['min_age']),
+        )
+        if options['event']:
+            pending = pending.filter(event_id=options['event'])
+        ids = list(pending.order_by('pk').values_list('pk', flat=True))
+
+        if ids and not options['dry_run']:
+            send_tickets(ids)
+            sent = EventRegistration.objects.filter(pk__in=ids, ticket_sent_at__isnull=False).count()
+            self.stdout.write(self.style.SUCCESS(f'{sent}/{len(ids)} ticket(s) envoyé(s)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{len(ids)} ticket(s) à envoyer'))
@@ -0,0 +1,160 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+# Taille des blocs lus pour les réponses partielles
+CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _file_etag(stat):
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def _content_disposition(filename, as_attachment):
+    disposition = 'attachment' if as_attachment else 'inline'
+    try:
+        filename.encode('ascii')
+        return f'{disposition}; filename="{filename}"'
+    except UnicodeEncodeError:
+        return f"{disposition}; filename*=utf-8''{quote(filename)}"
+
+
+def _parse_range(header, size):
+    """
+    Retourne (début, fin incluse) pour un en-tête Range d'un seul intervalle,
+    None s'il est absent ou non pris en charge, ou False s'il est hors du fichier.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match or not any(match.groups()):
+        return None
+    start, end = match.groups()
+    if start:
+        start = int(start)
+        if end and int(end) < start:
+            # Intervalle invalide (bytes=5-2) : l'en-tête est ignoré
+            return None
+        end = min(int(end), size - 1) if end else size - 1
+    else:
+        # bytes=-N : les N derniers octets
+        start, end = max(size - int(end), 0), size - 1
+    if start >= size:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag, mtime):
+    """If-Range : la reprise n'est valable que si le fichier n'a pas changé"""
+    value = request.META.get('HTTP_IF_RANGE')
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith('W/'):
+        return value == etag
+    return parse_http_date_safe(value) == int(mtime)
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            data = f.read(min(CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+async def _aread_range(path, start, length):
+    """
+    Variante asynchrone pour le point d'entrée ASGI : Django 4.2 lirait entièrement un itérateur
+    synchrone avant l'envoi. Chaque bloc est lu dans un thread, la boucle d'événements reste libre.
+    """
+    reader = _read_range(path, start, length)
+    while True:
+        data = await sync_to_async(next, thread_sensitive=False)(reader, None)
+        if data is None:
+            break
+        yield data
+
+
+def serve_file(request, field_file, filename=None, as_attachment=False):
+    """
+    Envoie un fichier média en contrôlant l'accès depuis la vue appelante.
+    - MEDIA_SENDFILE_BACKEND = 'x-accel-redirect' (Nginx) ou 'x-sendfile' (Apache) :
+      le serveur web envoie le fichier, Django ne fait que l'autoriser.
+    - Sinon : FileResponse avec ETag / Last-Modified, requêtes conditionnelles (304)
+      et requêtes partielles (Range) pour la reprise des téléchargements.
+    `filename` : nom proposé au navigateur (les fichiers sont stockés sous leur empreinte).
+    """
+    try:
+        path = field_file.path
+    except NotImplementedError:
+        # Stockage distant (S3...) : pas de chemin local
+        return redirect(field_file.url)
+    except ValueError:
+        # Champ fichier vide
+        raise Http404("Fichier introuvable")
+
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        # Référence en base vers un fichier absent du disque
+        raise Http404("Fichier introuvable")
+    etag = _file_etag(stat)
+    last_modified = int(stat.st_mtime)
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    filename = filename or os.path.basename(field_file.name)
+    content_type = mimetypes.guess_type(field_file.name)[0] or 'application/octet-stream'
+    backend = getattr(settings, 'MEDIA_SENDFILE_BACKEND', None)
+
+    if backend == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote(settings.MEDIA_ACCEL_PREFIX + field_file.name)
+    elif backend == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+    else:
+        byte_range = _parse_range(request.META.get('HTTP_RANGE', ''), stat.st_size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        read = _aread_range if isinstance(request, ASGIRequest) else _read_range
+        if byte_range and _if_range_matches(request, etag, stat.st_mtime):
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read(path, start, end - start + 1), status=206, content_type=content_type
+            )
+            response['Content-Length'] = str(end - start + 1)
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        elif read is _aread_range:
+            response = StreamingHttpResponse(read(path, 0, stat.st_size), content_type=content_type)
+            response['Content-Length'] = str(stat.st_size)
+        else:
+            try:
+                response = FileResponse(open(path, 'rb'), content_type=content_type)
+            except FileNotFoundError:
+                # Supprimé entre stat() et l'ouverture
+                raise Http404("Fichier introuvable")
+
+    response['Content-Disposition'] = _content_disposition(filename, as_attachment)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    # Revalidation à chaque téléchargement : 304 tant que le fichier n'a pas changé
+    response['Cache-Control'] = 'private, no-cache'
+    return response
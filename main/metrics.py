@@ -0,0 +1,100 @@
+import math
+import threading
+from collections import deque
+
+# Nombre de mesures conservées par route pour le calcul des percentiles
+WINDOW_SIZE = 500
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Nom de la mesure -> (nom Prometheus, description)
+MEASURES = {
+    'duration': ('comsas_request_duration_seconds', "Durée totale de la requête"),
+    'db_queries': ('comsas_request_db_queries', "Nombre de requêtes SQL par requête HTTP"),
+    'db_time': ('comsas_request_db_seconds', "Temps passé en base de données"),
+    'template_time': ('comsas_request_template_seconds', "Temps de rendu des gabarits"),
+    'response_size': ('comsas_response_size_bytes', "Taille de la réponse"),
+}
+
+
+def percentile(sorted_values, q):
+    """Percentile par la méthode du rang le plus proche"""
+    if not sorted_values:
+        return 0
+    index = max(math.ceil(q * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+class RouteStats:
+    """Fenêtre glissante des dernières mesures d'une route, plus les totaux depuis le démarrage"""
+
+    def __init__(self):
+        self.samples = {name: deque(maxlen=WINDOW_SIZE) for name in MEASURES}
+        self.totals = {name: 0 for name in MEASURES}
+        self.count = 0
+        self.errors = 0
+
+    def add(self, sample, status_code):
+        self.count += 1
+        if status_code >= 500:
+            self.errors += 1
+        for name, value in sample.items():
+            self.samples[name].append(value)
+            self.totals[name] += value
+
+    def summary(self):
+        data = {'count': self.count, 'errors': self.errors, 'totals': dict(self.totals)}
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            data[name] = {q: percentile(ordered, q) for q in QUANTILES}
+        return data
+
+
+class MetricsRegistry:
+    """
+    Mesures agrégées par nom de route, propres au processus :
+    avec plusieurs workers, chaque worker expose ses propres chiffres.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, sample, status_code):
+        with self._lock:
+            self._routes.setdefault(route, RouteStats()).add(sample, status_code)
+
+    def snapshot(self):
+        with self._lock:
+            return {route: stats.summary() for route, stats in self._routes.items()}
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+registry = MetricsRegistry()
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def prometheus_text(snapshot=None):
+    """Export au format texte de Prometheus (une métrique summary par mesure)"""
+    snapshot = registry.snapshot() if snapshot is None else snapshot
+    lines = []
+    for name, (metric, help_text) in MEASURES.items():
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} summary')
+        for route, data in sorted(snapshot.items()):
+            label = f'view="{_escape(route)}"'
+            for q, value in data[name].items():
+                lines.append(f'{metric}{{{label},quantile="{q}"}} {value:.6g}')
+            lines.append(f'{metric}_sum{{{label}}} {data["totals"][name]:.6g}')
+            lines.append(f'{metric}_count{{{label}}} {data["count"]}')
+    lines.append('# HELP comsas_request_errors_total Réponses en erreur (5xx)')
+    lines.append('# TYPE comsas_request_errors_total counter')
+    for route, data in sorted(snapshot.items()):
+        lines.append(f'comsas_request_errors_total{{view="{_escape(route)}"}} {data["errors"]}')
+    return '\n'.join(lines) + '\n'
@@ -1,7 +1,27 @@
 # ============= main/middleware.py =============
 
+import contextvars
+import functools
+import logging
+import os
+import re
+import sys
+import time
+from contextlib import ExitStack
+
 from django.shortcuts import render
 from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+from django.template.backends.django import Template as DjangoTemplate
+
+from . import health
+from .flags import ItemFlags
+from .routers import REPLICA, reset_reads, route_reads
+from .metrics import registry
+
+query_logger = logging.getLogger('main.queries')
 
 class CustomErrorMiddleware:
     """
@@ -24,3 +44,256 @@ class CustomErrorMiddleware:
         if False and settings.DEBUG:
             return render(request, '500.html', status=500)
         return None
+
+
+# ============= SONDES DE SANTÉ =============
+
+
+class HealthCheckMiddleware:
+    """
+    Répond à /healthz (processus vivant, sans base) et /readyz (base, cache, médias, file d'attente)
+    avant tout autre middleware : ni session, ni langue, ni authentification, ni mesure.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path == '/healthz':
+            response = HttpResponse('ok', content_type='text/plain')
+        elif request.path == '/readyz':
+            ready, checks = health.readiness()
+            response = JsonResponse({'status': 'ok' if ready else 'unavailable', 'checks': checks},
+                                    status=200 if ready else 503)
+        else:
+            return self.get_response(request)
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+# ============= RÉPLIQUE EN LECTURE =============
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Pages publiques en GET/HEAD : lectures sur la réplique (DATABASES['replica']).
+    Après un POST, le navigateur lit la base principale pendant REPLICA_STICKY_SECONDS
+    (cookie), pour voir immédiatement son vote ou son inscription.
+    """
+
+    COOKIE_NAME = 'comsas_primary'
+
+    def __init__(self, get_response):
+        if REPLICA not in settings.DATABASES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+        self.excluded = tuple(getattr(settings, 'REPLICA_EXCLUDED_PATHS', ()))
+
+    def read_alias(self, request):
+        if request.method not in ('GET', 'HEAD') or request.path.startswith(self.excluded):
+            return 'default'
+        if self.COOKIE_NAME in request.COOKIES:
+            return 'default'
+        return REPLICA
+
+    def __call__(self, request):
+        token = route_reads(self.read_alias(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_reads(token)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            response.set_cookie(self.COOKIE_NAME, '1', max_age=self.sticky_seconds, httponly=True, samesite='Lax')
+        return response
+
+
+# ============= DRAPEAUX PAR OBJET (COOKIE) =============
+
+
+class ItemFlagsMiddleware:
+    """
+    request.item_flags : drapeaux « déjà vu / déjà aimé / déjà voté » lus depuis un cookie
+    compact ; réécrit seulement s'il a changé. La navigation anonyme n'écrit pas de session.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cookie_name = getattr(settings, 'ITEM_FLAGS_COOKIE_NAME', 'comsas_flags')
+        self.max_age = getattr(settings, 'ITEM_FLAGS_COOKIE_AGE', settings.SESSION_COOKIE_AGE)
+
+    def __call__(self, request):
+        request.item_flags = flags = ItemFlags(request.COOKIES.get(self.cookie_name))
+        response = self.get_response(request)
+        if flags.modified:
+            response.set_cookie(
+                self.cookie_name, flags.encode(), max_age=self.max_age,
+                secure=settings.SESSION_COOKIE_SECURE, httponly=True, samesite='Lax',
+            )
+        return response
+
+
+# ============= MESURE DES PERFORMANCES =============
+
+_current_profile = contextvars.ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """Mesures d'une requête : requêtes SQL (execute_wrapper) et rendu des gabarits"""
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+def _timed_render(render):
+    @functools.wraps(render)
+    def wrapper(self, context=None, request=None):
+        profile = _current_profile.get()
+        if profile is None:
+            return render(self, context, request)
+        # Un rendu imbriqué (render_to_string dans un gabarit) n'est compté qu'une fois
+        profile.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            profile.template_depth -= 1
+            if not profile.template_depth:
+                profile.template_time += time.perf_counter() - start
+    wrapper.timed = True
+    return wrapper
+
+
+class ProfilingMiddleware:
+    """
+    Mesure chaque requête (durée, requêtes SQL, rendu des gabarits, taille de la réponse)
+    et l'agrège par nom de route dans main.metrics. Désactivable avec PROFILING_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if not getattr(DjangoTemplate.render, 'timed', False):
+            DjangoTemplate.render = _timed_render(DjangoTemplate.render)
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        duration = time.perf_counter() - start
+
+        if response.streaming:
+            size = int(response.get('Content-Length') or 0)
+        else:
+            size = len(response.content)
+        match = request.resolver_match
+        route = match.view_name if match else 'unresolved'
+        registry.record(route, {
+            'duration': duration,
+            'db_queries': profile.db_queries,
+            'db_time': profile.db_time,
+            'template_time': profile.template_time,
+            'response_size': size,
+        }, response.status_code)
+
+        # Visible dans l'onglet réseau des outils de développement du navigateur
+        response['Server-Timing'] = (
+            f'app;dur={duration * 1000:.1f}, db;dur={profile.db_time * 1000:.1f};desc="{profile.db_queries} req", '
+            f'tpl;dur={profile.template_time * 1000:.1f}'
+        )
+        return response
+
+
+# ============= DÉTECTION DES REQUÊTES RÉPÉTÉES (N+1) =============
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def query_shape(sql):
+    """Forme d'une requête : littéraux et listes IN (...) réduits, pour regrouper les requêtes identiques"""
+    return _LITERAL.sub('?', _IN_LIST.sub('IN (...)', sql))
+
+
+def _query_origin():
+    """(ligne de gabarit, ligne de code du projet) ayant déclenché la requête courante"""
+    template_line = code_line = None
+    frame = sys._getframe(2)
+    while frame is not None and not (template_line and code_line):
+        if template_line is None and frame.f_code.co_name == 'render_annotated':
+            # Nœud de gabarit le plus profond en cours de rendu
+            node = frame.f_locals.get('self')
+            origin, token = getattr(node, 'origin', None), getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                template_line = f'{origin.template_name or origin.name}:{token.lineno}'
+        filename = frame.f_code.co_filename
+        if (code_line is None and filename.startswith(str(settings.BASE_DIR)) and filename != __file__
+                and 'site-packages' not in filename):
+            code_line = f'{os.path.relpath(filename, settings.BASE_DIR)}:{frame.f_lineno} ({frame.f_code.co_name})'
+        frame = frame.f_back
+    return template_line, code_line
+
+
+class QueryRepeatDetector:
+    """execute_wrapper comptant les requêtes par forme ; retient l'origine de la première répétition"""
+
+    def __init__(self):
+        self.counts = {}
+        self.origins = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        shape = query_shape(sql)
+        count = self.counts[shape] = self.counts.get(shape, 0) + 1
+        if count == 2:
+            self.origins[shape] = _query_origin()
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold):
+        return [(shape, count) for shape, count in self.counts.items() if count >= threshold]
+
+
+class QueryRepeatMiddleware:
+    """
+    Développement : journalise (logger main.queries) les requêtes de même forme répétées
+    au moins QUERY_DETECTOR_THRESHOLD fois dans une requête HTTP, avec le gabarit en cause.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_DETECTOR_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'QUERY_DETECTOR_THRESHOLD', 5)
+
+    def __call__(self, request):
+        detector = QueryRepeatDetector()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(detector))
+            response = self.get_response(request)
+
+        for shape, count in detector.repeated(self.threshold):
+            template_line, code_line = detector.origins.get(shape, (None, None))
+            query_logger.warning(
+                "%s %s : requête répétée %d fois (gabarit %s, code %s) : %s",
+                request.method, request.path, count, template_line or '-', code_line or '-', shape[:300],
+            )
+        return response
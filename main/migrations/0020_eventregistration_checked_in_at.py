@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0019_archive_downloads_count_archive_likes_count_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventregistration',
+            name='checked_in_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name="Heure d'entrée"),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:15
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def init_confirmed_count(apps, schema_editor):
+    Event = apps.get_model('main', 'Event')
+    events = Event.objects.annotate(confirmed=Count('eventregistration', filter=Q(eventregistration__is_confirmed=True)))
+    for event in events:
+        Event.objects.filter(pk=event.pk).update(confirmed_count=event.confirmed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0020_eventregistration_checked_in_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='confirmed_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Places réservées'),
+        ),
+        migrations.AddField(
+            model_name='eventregistration',
+            name='is_waitlisted',
+            field=models.BooleanField(default=False, verbose_name="Liste d'attente"),
+        ),
+        migrations.RunPython(init_confirmed_count, migrations.RunPython.noop),
+    ]
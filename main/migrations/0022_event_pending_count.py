@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:17
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def init_pending_count(apps, schema_editor):
+    Event = apps.get_model('main', 'Event')
+    events = Event.objects.annotate(pending=Count('eventregistration', filter=Q(eventregistration__is_confirmed=False)))
+    for event in events:
+        Event.objects.filter(pk=event.pk).update(pending_count=event.pending)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0021_event_capacity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Inscriptions en attente'),
+        ),
+        migrations.RunPython(init_pending_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:23
+
+from django.db import migrations, models
+
+
+def create_search_backend(apps, schema_editor):
+    """Table FTS5 sous SQLite, index GIN plein texte sous PostgreSQL"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE main_searchentry_fts USING fts5("
+            "title, document, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX main_searchentry_document_gin ON main_searchentry "
+            "USING gin (to_tsvector('french'::regconfig, COALESCE(document, '')))"
+        )
+
+
+def drop_search_backend(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS main_searchentry_fts")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS main_searchentry_document_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0022_event_pending_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('archive', 'Archive'), ('blog', 'Article de blog'), ('news', 'Actualité'), ('event', 'Événement'), ('project', 'Projet'), ('member', 'Membre')], max_length=20, verbose_name='Type')),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255, verbose_name='Titre')),
+                ('summary', models.TextField(blank=True, verbose_name='Résumé')),
+                ('document', models.TextField(blank=True)),
+                ('url', models.CharField(blank=True, max_length=255)),
+                ('date', models.DateTimeField(blank=True, null=True)),
+                ('is_public', models.BooleanField(default=True, verbose_name='Visible publiquement')),
+            ],
+            options={
+                'verbose_name': 'Entrée de recherche',
+                'verbose_name_plural': 'Index de recherche',
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_search_backend, drop_search_backend),
+    ]
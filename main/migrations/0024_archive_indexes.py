@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0023_searchentry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archive',
+            index=models.Index(fields=['academic_year', 'created_at'], name='archive_year_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archive',
+            index=models.Index(fields=['level', 'academic_year', 'created_at'], name='archive_level_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archive',
+            index=models.Index(fields=['category', 'academic_year', 'created_at'], name='archive_category_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archive',
+            index=models.Index(fields=['level', 'academic_year', 'category'], name='archive_level_year_cat_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0024_archive_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Chemin')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='Taille (octets)')),
+                ('refs', models.PositiveIntegerField(default=0, verbose_name='Références')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Fichier stocké',
+                'verbose_name_plural': 'Fichiers stockés',
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0025_storedfile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archive',
+            name='extracted_file',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='archive',
+            name='preview',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='archives/previews/', verbose_name='Aperçu'),
+        ),
+        migrations.AddField(
+            model_name='archive',
+            name='text_content',
+            field=models.TextField(blank=True, editable=False, verbose_name='Texte extrait'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0026_archive_text_content'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blogarticle',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='URL conviviale, générée depuis le titre si vide', unique=True),
+        ),
+        migrations.AlterField(
+            model_name='contest',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='URL conviviale (ex: miss-master-2026), générée depuis le titre si vide', unique=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:24
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_existing_tickets_sent(apps, schema_editor):
+    # Tickets déjà générés avant le suivi des envois : considérés comme envoyés
+    EventRegistration = apps.get_model('main', 'EventRegistration')
+    EventRegistration.objects.filter(is_confirmed=True).exclude(ticket_pdf='').exclude(ticket_pdf__isnull=True).update(
+        ticket_sent_at=F('registration_date')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0027_optional_slugs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventregistration',
+            name='is_rejected',
+            field=models.BooleanField(default=False, verbose_name='Refusée'),
+        ),
+        migrations.AddField(
+            model_name='eventregistration',
+            name='ticket_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Ticket envoyé le'),
+        ),
+        migrations.RunPython(mark_existing_tickets_sent, migrations.RunPython.noop),
+    ]
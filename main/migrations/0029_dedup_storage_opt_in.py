@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:29
+
+from django.db import migrations, models
+import main.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0028_registration_rejected_ticket_sent'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archive',
+            name='file',
+            field=models.FileField(storage=main.storage.DedupStorage(), upload_to='archives/%Y/%m/', verbose_name='Fichier (PDF, Image...)'),
+        ),
+        migrations.AlterField(
+            model_name='requestdocument',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=main.storage.DedupStorage(), upload_to='requests/documents/', verbose_name='Fichier (PDF, Docx...)'),
+        ),
+    ]
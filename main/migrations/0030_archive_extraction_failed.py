@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0029_dedup_storage_opt_in'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archive',
+            name='extraction_failed',
+            field=models.BooleanField(default=False, editable=False, verbose_name="Échec de l'extraction"),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:37
+
+from django.db import migrations, models
+import main.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0031_cacheversion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archive',
+            name='preview',
+            field=models.ImageField(blank=True, editable=False, null=True, storage=main.storage.DedupStorage(), upload_to='archives/previews/', verbose_name='Aperçu'),
+        ),
+        migrations.AlterField(
+            model_name='gallery',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=main.storage.DedupStorage(), upload_to='gallery/images/'),
+        ),
+        migrations.AlterField(
+            model_name='gallery',
+            name='video_file',
+            field=models.FileField(blank=True, null=True, storage=main.storage.DedupStorage(), upload_to='gallery/videos/'),
+        ),
+        migrations.AlterField(
+            model_name='requestdocument',
+            name='image_preview',
+            field=models.ImageField(blank=True, null=True, storage=main.storage.DedupStorage(), upload_to='requests/previews/', verbose_name='Aperçu (Image)'),
+        ),
+    ]
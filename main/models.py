@@ -1,10 +1,15 @@
 from django.db import models
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
 from django.contrib.auth.models import User
 from ckeditor.fields import RichTextField
 from django.urls import reverse
 from django.utils import timezone
 import uuid
 
+from .slugs import save_with_slug
+from .storage import dedup_storage
+
 class Member(models.Model):
     """Modèle pour les membres de l'association"""
     MEMBER_TYPES = [
@@ -99,6 +104,8 @@ class Event(models.Model):
     date_event = models.DateTimeField(verbose_name="Date et heure de l'événement")
     location = models.CharField(max_length=200, verbose_name="Lieu")
     max_participants = models.IntegerField(blank=True, null=True, verbose_name="Nombre maximum de participants")
+    confirmed_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Places réservées")
+    pending_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Inscriptions en attente")
     registration_deadline = models.DateTimeField(verbose_name="Date limite d'inscription")
     is_featured = models.BooleanField(default=False, verbose_name="Événement en vedette")
     is_active = models.BooleanField(default=True, verbose_name="Actif")
@@ -131,7 +138,74 @@ class Event(models.Model):
     
     @property
     def registered_count(self):
-        return self.eventregistration_set.filter(is_confirmed=True).count()
+        return self.confirmed_count
+    
+    @property
+    def registration_count(self):
+        return self.confirmed_count + self.pending_count
+    
+    @property
+    def is_full(self):
+        return self.max_participants is not None and self.confirmed_count >= self.max_participants
+    
+    @property
+    def remaining_seats(self):
+        if self.max_participants is None:
+            return None
+        return max(self.max_participants - self.confirmed_count, 0)
+    
+    def reserve_seat(self):
+        """
+        Réserve une place par une mise à jour conditionnelle du compteur.
+        Retourne False si l'événement est complet (aucune surréservation possible).
+        """
+        reserved = Event.objects.filter(pk=self.pk).filter(
+            Q(max_participants__isnull=True) | Q(confirmed_count__lt=F('max_participants'))
+        ).update(confirmed_count=F('confirmed_count') + 1)
+        if reserved:
+            self.confirmed_count += 1
+            self.invalidate_attendance()
+        return bool(reserved)
+    
+    def release_seat(self):
+        """Libère une place réservée"""
+        released = Event.objects.filter(pk=self.pk, confirmed_count__gt=0).update(
+            confirmed_count=F('confirmed_count') - 1
+        )
+        if released:
+            self.confirmed_count = max(self.confirmed_count - 1, 0)
+            self.invalidate_attendance()
+    
+    def adjust_counters(self, confirmed=0, pending=0):
+        """Met à jour les compteurs d'inscriptions (deltas positifs ou négatifs) en une requête"""
+        changes = {}
+        if confirmed:
+            changes['confirmed_count'] = Greatest(F('confirmed_count') + confirmed, 0)
+            self.confirmed_count = max(self.confirmed_count + confirmed, 0)
+        if pending:
+            changes['pending_count'] = Greatest(F('pending_count') + pending, 0)
+            self.pending_count = max(self.pending_count + pending, 0)
+        if changes:
+            Event.objects.filter(pk=self.pk).update(**changes)
+        if confirmed:
+            self.invalidate_attendance()
+    
+    def invalidate_attendance(self):
+        """Vide le cache des statistiques de présence (inscrits confirmés ou entrées modifiés)"""
+        from .analytics import invalidate_event_attendance
+        invalidate_event_attendance(self.pk)
+    
+    def refresh_counters(self):
+        """Recalcule les compteurs d'inscriptions depuis la table des inscriptions"""
+        counts = self.eventregistration_set.aggregate(
+            confirmed=Count('id', filter=Q(is_confirmed=True)),
+            pending=Count('id', filter=Q(is_confirmed=False, is_rejected=False)),
+        )
+        self.confirmed_count = counts['confirmed']
+        self.pending_count = counts['pending']
+        Event.objects.filter(pk=self.pk).update(
+            confirmed_count=self.confirmed_count, pending_count=self.pending_count
+        )
 
 class EventRegistration(models.Model):
     """Modèle pour les inscriptions aux événements"""
@@ -143,12 +217,15 @@ class EventRegistration(models.Model):
     message = models.TextField(blank=True, verbose_name="Message/Commentaire")
     photo = models.ImageField(upload_to='participants/photos/', blank=True, null=True, verbose_name="Photo du participant", help_text="Photo pour le badge (optionnel)")
     is_confirmed = models.BooleanField(default=False, verbose_name="Confirmé")
+    is_waitlisted = models.BooleanField(default=False, verbose_name="Liste d'attente")
+    is_rejected = models.BooleanField(default=False, verbose_name="Refusée")
     registration_date = models.DateTimeField(auto_now_add=True)
     
     # Ticketing System
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     ticket_pdf = models.FileField(upload_to='tickets/pdfs/', blank=True, null=True, verbose_name="Ticket PDF")
     qr_code = models.ImageField(upload_to='tickets/qrcodes/', blank=True, null=True, verbose_name="Code QR")
+    ticket_sent_at = models.DateTimeField(blank=True, null=True, editable=False, verbose_name="Ticket envoyé le")
     
     # Certificate
     certificate_pdf = models.FileField(upload_to='certificates/', blank=True, null=True, verbose_name="Attestation PDF")
@@ -156,6 +233,9 @@ class EventRegistration(models.Model):
     # Badge
     badge_pdf = models.FileField(upload_to='badges/', blank=True, null=True, verbose_name="Badge PDF")
     
+    # Check-in (contrôle à l'entrée)
+    checked_in_at = models.DateTimeField(blank=True, null=True, verbose_name="Heure d'entrée")
+    
     class Meta:
         verbose_name = "Inscription à l'événement"
         verbose_name_plural = "Inscriptions aux événements"
@@ -218,9 +298,9 @@ class Gallery(models.Model):
     description_en = models.TextField(blank=True, verbose_name="Description (Anglais)")
     media_type = models.CharField(max_length=10, choices=MEDIA_TYPES, default='image')
     album = models.ForeignKey(GalleryAlbum, on_delete=models.CASCADE, related_name='images', verbose_name="Album", null=True, blank=True)
-    image = models.ImageField(upload_to='gallery/images/', blank=True, null=True)
+    image = models.ImageField(upload_to='gallery/images/', storage=dedup_storage, blank=True, null=True)
     video_url = models.URLField(blank=True, null=True, verbose_name="URL de la vidéo")
-    video_file = models.FileField(upload_to='gallery/videos/', blank=True, null=True)
+    video_file = models.FileField(upload_to='gallery/videos/', storage=dedup_storage, blank=True, null=True)
     is_featured = models.BooleanField(default=False, verbose_name="En vedette")
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -329,7 +409,10 @@ class Mentor(models.Model):
     
     @property
     def current_mentees_count(self):
-        return self.mentee_set.count()
+        # Valeur annotée par les listes (active_mentees), sinon une requête
+        if hasattr(self, 'active_mentees'):
+            return self.active_mentees
+        return self.match_set.filter(is_active=True).count()
 
 # Constants for Sponsorship
 COMPETENCIES_LIST = [
@@ -414,7 +497,7 @@ class Match(models.Model):
 class Contest(models.Model):
     """Concours / Élection"""
     title = models.CharField(max_length=200, verbose_name="Titre du concours")
-    slug = models.SlugField(unique=True, help_text="URL conviviale (ex: miss-master-2026)")
+    slug = models.SlugField(unique=True, blank=True, help_text="URL conviviale (ex: miss-master-2026), générée depuis le titre si vide")
     description = models.TextField(verbose_name="Description")
     image = models.ImageField(upload_to='contests/', blank=True, null=True, verbose_name="Image de couverture")
     
@@ -430,6 +513,11 @@ class Contest(models.Model):
         verbose_name_plural = "Concours"
         ordering = ['-start_date']
 
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            return save_with_slug(self, lambda: super(Contest, self).save(*args, **kwargs), self.title)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.title
         
@@ -510,8 +598,8 @@ class RequestDocument(models.Model):
     
     title = models.CharField(max_length=200, verbose_name="Titre du modèle")
     description = models.TextField(verbose_name="Description / Instructions", blank=True)
-    file = models.FileField(upload_to='requests/documents/', blank=True, null=True, verbose_name="Fichier (PDF, Docx...)")
-    image_preview = models.ImageField(upload_to='requests/previews/', blank=True, null=True, verbose_name="Aperçu (Image)")
+    file = models.FileField(upload_to='requests/documents/', storage=dedup_storage, blank=True, null=True, verbose_name="Fichier (PDF, Docx...)")
+    image_preview = models.ImageField(upload_to='requests/previews/', storage=dedup_storage, blank=True, null=True, verbose_name="Aperçu (Image)")
     doc_type = models.CharField(max_length=10, choices=DOC_TYPES, default='pdf', verbose_name="Type de fichier")
     
     downloads_count = models.IntegerField(default=0, verbose_name="Nombre de téléchargements")
@@ -610,7 +698,7 @@ class BlogArticle(models.Model):
     ]
     
     title = models.CharField(max_length=200, verbose_name="Titre")
-    slug = models.SlugField(unique=True, help_text="URL conviviale")
+    slug = models.SlugField(unique=True, blank=True, help_text="URL conviviale, générée depuis le titre si vide")
     image = models.ImageField(upload_to='blog/', blank=True, null=True, verbose_name="Image de couverture")
     content = RichTextField(verbose_name="Contenu de l'article")
     category = models.CharField(max_length=20, choices=CATEGORIES, default='conseil', verbose_name="Catégorie")
@@ -627,6 +715,11 @@ class BlogArticle(models.Model):
         verbose_name_plural = "Articles de Blog"
         ordering = ['-published_at']
 
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            return save_with_slug(self, lambda: super(BlogArticle, self).save(*args, **kwargs), self.title)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.title
 
@@ -653,7 +746,7 @@ class Archive(models.Model):
     title = models.CharField(max_length=200, verbose_name="Titre du document")
     slug = models.SlugField(unique=True, blank=True, null=True, verbose_name="Slug URL")
     description = models.TextField(blank=True, verbose_name="Description optionnelle")
-    file = models.FileField(upload_to='archives/%Y/%m/', verbose_name="Fichier (PDF, Image...)")
+    file = models.FileField(upload_to='archives/%Y/%m/', storage=dedup_storage, verbose_name="Fichier (PDF, Image...)")
     academic_year = models.CharField(max_length=9, default="2023-2024", verbose_name="Année Académique", help_text="Ex: 2023-2024")
     level = models.CharField(max_length=10, choices=LEVEL_CHOICES, verbose_name="Niveau d'étude")
     category = models.CharField(max_length=10, choices=CATEGORY_CHOICES, default='PV', verbose_name="Catégorie")
@@ -665,22 +758,29 @@ class Archive(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date d'ajout")
     
+    # Texte des PDF (recherche) et aperçu de la première page, produits en tâche de fond
+    text_content = models.TextField(blank=True, editable=False, verbose_name="Texte extrait")
+    preview = models.ImageField(upload_to='archives/previews/', storage=dedup_storage, blank=True, null=True, editable=False, verbose_name="Aperçu")
+    # Fichier dont le texte a été extrait : s'il diffère de `file`, l'extraction est à refaire
+    extracted_file = models.CharField(max_length=255, blank=True, editable=False)
+    extraction_failed = models.BooleanField(default=False, editable=False, verbose_name="Échec de l'extraction")
+    
     class Meta:
         verbose_name = "Archive"
         verbose_name_plural = "Archives"
         ordering = ['-academic_year', '-created_at']
+        # Un index par combinaison de filtres de la page des archives, suivi de l'ordre de tri
+        indexes = [
+            models.Index(fields=['academic_year', 'created_at'], name='archive_year_created_idx'),
+            models.Index(fields=['level', 'academic_year', 'created_at'], name='archive_level_year_idx'),
+            models.Index(fields=['category', 'academic_year', 'created_at'], name='archive_category_year_idx'),
+            models.Index(fields=['level', 'academic_year', 'category'], name='archive_level_year_cat_idx'),
+        ]
         
     def save(self, *args, **kwargs):
         if not self.slug:
-            from django.utils.text import slugify
-            base_slug = slugify(self.title)
-            # Ensure unique slug
-            unique_slug = base_slug
-            counter = 1
-            while Archive.objects.filter(slug=unique_slug).exists(): # Note: this check works on create, but might need exclusion for update if not careful. slug usually set once.
-                unique_slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = unique_slug
+            # Slug unique alloué en une requête, nouvelle tentative en cas de collision
+            return save_with_slug(self, lambda: super(Archive, self).save(*args, **kwargs), self.title)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -714,4 +814,62 @@ class ArchiveComment(models.Model):
         ordering = ['-created_at']
         
     def __str__(self):
-        return f"Com de {self.author_name} sur {self.archive.title}"
\ No newline at end of file
+        return f"Com de {self.author_name} sur {self.archive.title}"
+
+
+class SearchEntry(models.Model):
+    """Entrée de l'index de recherche du site (une par objet indexé, voir main/search.py)"""
+    KINDS = [
+        ('archive', 'Archive'),
+        ('blog', 'Article de blog'),
+        ('news', 'Actualité'),
+        ('event', 'Événement'),
+        ('project', 'Projet'),
+        ('member', 'Membre'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KINDS, verbose_name="Type")
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255, verbose_name="Titre")
+    summary = models.TextField(blank=True, verbose_name="Résumé")
+    # Texte normalisé (minuscules, sans accents) : titre + contenu
+    document = models.TextField(blank=True)
+    url = models.CharField(max_length=255, blank=True)
+    date = models.DateTimeField(blank=True, null=True)
+    is_public = models.BooleanField(default=True, verbose_name="Visible publiquement")
+    
+    class Meta:
+        verbose_name = "Entrée de recherche"
+        verbose_name_plural = "Index de recherche"
+        unique_together = ['kind', 'object_id']
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} : {self.title}"
+
+
+class StoredFile(models.Model):
+    """Fichier du stockage dédoublonné : un seul exemplaire par contenu, compté par référence"""
+    name = models.CharField(max_length=255, unique=True, verbose_name="Chemin")
+    size = models.PositiveBigIntegerField(default=0, verbose_name="Taille (octets)")
+    refs = models.PositiveIntegerField(default=0, verbose_name="Références")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Fichier stocké"
+        verbose_name_plural = "Fichiers stockés"
+    
+    def __str__(self):
+        return f"{self.name} ({self.refs})"
+
+
+class CacheVersion(models.Model):
+    """Version d'un groupe d'entrées du cache, partagée par tous les workers (le cache est propre à chacun)"""
+    name = models.CharField(max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = "Version du cache"
+        verbose_name_plural = "Versions du cache"
+    
+    def __str__(self):
+        return f"{self.name} v{self.version}"
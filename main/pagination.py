@@ -0,0 +1,104 @@
+import base64
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class KeysetPage:
+    """Page obtenue par pagination par clé (curseurs `after` / `before`)"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def encode_cursor(values):
+    data = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, fields):
+    """
+    Retourne les valeurs du curseur converties par les champs de tri,
+    ou None s'il est invalide (curseur modifié à la main, valeur du mauvais type)
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(data, list) or len(data) != len(fields):
+            return None
+        values = [field.to_python(value) for field, value in zip(fields, data)]
+    except (ValueError, TypeError, ValidationError):
+        return None
+    # Les clés de tri ne sont jamais nulles (None n'est pas comparable en SQL)
+    return None if None in values else values
+
+
+def _key_fields(model, keys):
+    return [model._meta.pk if key == 'pk' else model._meta.get_field(key) for key in keys]
+
+
+def _beyond(keys, values, lookup):
+    """Condition « strictement après » dans l'ordre lexicographique des clés"""
+    condition = Q()
+    for index, key in enumerate(keys):
+        step = Q(**{f'{key}__{lookup}': values[index]})
+        for previous_key, previous_value in zip(keys[:index], values[:index]):
+            step &= Q(**{previous_key: previous_value})
+        condition |= step
+    return condition
+
+
+def keyset_page(queryset, keys, size, after=None, before=None):
+    """
+    Pagination par clé sur des champs triés par ordre décroissant.
+    Le coût d'une page ne dépend pas de sa position, contrairement à OFFSET.
+    `keys` doit identifier chaque ligne de façon unique (terminer par 'pk').
+    """
+    descending = [f'-{key}' for key in keys]
+    ascending = list(keys)
+    fields = _key_fields(queryset.model, keys)
+
+    if before and (values := decode_cursor(before, fields)) is not None:
+        # Page précédente : on remonte dans l'ordre croissant puis on inverse
+        rows = list(queryset.filter(_beyond(keys, values, 'gt')).order_by(*ascending)[:size + 1])
+        has_more = len(rows) > size
+        rows = list(reversed(rows[:size]))
+        has_previous, has_next = has_more, True
+    else:
+        values = decode_cursor(after, fields) if after else None
+        if values is not None:
+            queryset = queryset.filter(_beyond(keys, values, 'lt'))
+        rows = list(queryset.order_by(*descending)[:size + 1])
+        has_next = len(rows) > size
+        rows = rows[:size]
+        has_previous = values is not None
+
+    def cursor(obj):
+        return encode_cursor([getattr(obj, key) for key in keys])
+
+    return KeysetPage(
+        rows,
+        next_cursor=cursor(rows[-1]) if rows and has_next else None,
+        previous_cursor=cursor(rows[0]) if rows and has_previous else None,
+    )
@@ -0,0 +1,293 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import IntegrityError, connection as db_connection, transaction
+from django.db.models import Count, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Event, EventRegistration
+from .utils import generate_ticket
+
+logger = logging.getLogger(__name__)
+
+# Résultats possibles d'une inscription
+CONFIRMED = 'confirmed'
+WAITLISTED = 'waitlisted'
+DUPLICATE = 'duplicate'
+
+REGISTRATION_STATUSES = {
+    'confirmed': Q(is_confirmed=True),
+    'pending': Q(is_confirmed=False, is_waitlisted=False, is_rejected=False),
+    'waitlisted': Q(is_waitlisted=True),
+    'rejected': Q(is_rejected=True),
+}
+
+# Nombre de tickets générés et envoyés par connexion SMTP
+TICKET_BATCH_SIZE = 50
+
+
+def register_participant(registration):
+    """
+    Enregistre une inscription en réservant une place de manière atomique.
+    Si l'événement est complet, l'inscription est placée sur liste d'attente.
+    Retourne CONFIRMED, WAITLISTED ou DUPLICATE.
+    """
+    event = registration.event
+
+    if EventRegistration.objects.filter(event=event, email=registration.email).exists():
+        return DUPLICATE
+
+    try:
+        # La réservation et l'insertion sont annulées ensemble en cas de doublon concurrent
+        with transaction.atomic():
+            reserved = event.reserve_seat()
+            if not reserved:
+                event.adjust_counters(pending=1)
+            registration.is_confirmed = reserved
+            registration.is_waitlisted = not reserved
+            registration.save()
+    except IntegrityError:
+        # Contrainte unique (event, email) : une requête concurrente a gagné
+        event.refresh_from_db(fields=['confirmed_count', 'pending_count'])
+        return DUPLICATE
+
+    return CONFIRMED if reserved else WAITLISTED
+
+
+def confirm_participant(registration):
+    """Confirme une inscription en attente ; retourne False si l'événement est complet ou l'inscription refusée"""
+    event = registration.event
+    with transaction.atomic():
+        updated = EventRegistration.objects.filter(pk=registration.pk, is_confirmed=False, is_rejected=False).update(
+            is_confirmed=True, is_waitlisted=False
+        )
+        if not updated and EventRegistration.objects.filter(pk=registration.pk, is_rejected=True).exists():
+            return False
+        if updated:
+            if not event.reserve_seat():
+                transaction.set_rollback(True)
+                return False
+            event.adjust_counters(pending=-1)
+
+    registration.is_confirmed = True
+    registration.is_waitlisted = False
+    return True
+
+
+def promote_waitlist(event):
+    """Attribue une place libre à la plus ancienne inscription en liste d'attente"""
+    with transaction.atomic():
+        candidate = (
+            EventRegistration.objects.select_for_update()
+            .filter(event=event, is_waitlisted=True, is_rejected=False)
+            .order_by('registration_date')
+            .first()
+        )
+        if candidate is None or not event.reserve_seat():
+            return None
+        EventRegistration.objects.filter(pk=candidate.pk).update(is_confirmed=True, is_waitlisted=False)
+        event.adjust_counters(pending=-1)
+
+    candidate.is_confirmed = True
+    candidate.is_waitlisted = False
+    return candidate
+
+
+def cancel_registration(registration):
+    """
+    Supprime une inscription et met à jour les compteurs de l'événement.
+    Retourne l'inscription promue depuis la liste d'attente, le cas échéant.
+    """
+    event = registration.event
+    with transaction.atomic():
+        # Suppression conditionnelle : la place n'est libérée qu'une seule fois
+        if not EventRegistration.objects.filter(pk=registration.pk, is_confirmed=True).delete()[0]:
+            # Une inscription refusée n'est plus comptée parmi les inscriptions en attente
+            if EventRegistration.objects.filter(pk=registration.pk, is_rejected=False).delete()[0]:
+                event.adjust_counters(pending=-1)
+            else:
+                EventRegistration.objects.filter(pk=registration.pk).delete()
+            return None
+        event.release_seat()
+        return promote_waitlist(event)
+
+
+def filter_registrations(queryset, status):
+    """Filtre les inscriptions par statut ('confirmed', 'pending', 'waitlisted', 'rejected')"""
+    lookup = REGISTRATION_STATUSES.get(status)
+    return queryset.filter(lookup) if lookup is not None else queryset
+
+
+def fill_from_waitlist(event):
+    """
+    Attribue toutes les places libres à la liste d'attente, par ordre d'inscription.
+    Doit être appelée avec la ligne de l'événement verrouillée. Retourne les id promus.
+    """
+    waitlist = EventRegistration.objects.filter(
+        event=event, is_waitlisted=True, is_rejected=False
+    ).order_by('registration_date')
+    if event.max_participants is not None:
+        waitlist = waitlist[:max(event.max_participants - event.confirmed_count, 0)]
+    ids = list(waitlist.values_list('pk', flat=True))
+    if ids:
+        EventRegistration.objects.filter(pk__in=ids).update(is_confirmed=True, is_waitlisted=False)
+        event.adjust_counters(confirmed=len(ids), pending=-len(ids))
+    return ids
+
+
+def bulk_confirm(event, queryset):
+    """
+    Confirme en une requête les inscriptions sélectionnées, dans la limite des places.
+    Retourne (id confirmés, nombre d'inscriptions non confirmées faute de place).
+    """
+    with transaction.atomic():
+        event = Event.objects.select_for_update().get(pk=event.pk)
+        pending = queryset.filter(event=event, is_confirmed=False, is_rejected=False).order_by('registration_date')
+        ids = list(pending.values_list('pk', flat=True))
+        if event.max_participants is not None:
+            free = max(event.max_participants - event.confirmed_count, 0)
+            ids, overflow = ids[:free], len(ids) - free
+        else:
+            overflow = 0
+        if ids:
+            EventRegistration.objects.filter(pk__in=ids).update(is_confirmed=True, is_waitlisted=False)
+            event.adjust_counters(confirmed=len(ids), pending=-len(ids))
+    return ids, max(overflow, 0)
+
+
+def bulk_reject(event, queryset):
+    """
+    Refuse les inscriptions sélectionnées : elles sont marquées refusées, ne comptent plus
+    parmi les inscriptions en attente et ne peuvent plus être confirmées ni promues.
+    Retourne (nombre refusé, id promus depuis la liste d'attente).
+    """
+    with transaction.atomic():
+        event = Event.objects.select_for_update().get(pk=event.pk)
+        selected = queryset.filter(event=event, is_rejected=False)
+        confirmed = selected.filter(is_confirmed=True).count()
+        rejected = selected.update(is_confirmed=False, is_waitlisted=False, is_rejected=True)
+        event.adjust_counters(confirmed=-confirmed, pending=-(rejected - confirmed))
+        promoted = fill_from_waitlist(event) if confirmed else []
+    return rejected, promoted
+
+
+def bulk_delete(event, queryset):
+    """
+    Supprime les inscriptions sélectionnées en une requête.
+    Retourne (nombre supprimé, id promus depuis la liste d'attente).
+    """
+    with transaction.atomic():
+        event = Event.objects.select_for_update().get(pk=event.pk)
+        selected = queryset.filter(event=event)
+        counts = selected.aggregate(
+            confirmed=Count('id', filter=Q(is_confirmed=True)),
+            pending=Count('id', filter=Q(is_confirmed=False, is_rejected=False)),
+        )
+        deleted = selected.delete()[0]
+        event.adjust_counters(confirmed=-counts['confirmed'], pending=-counts['pending'])
+        promoted = fill_from_waitlist(event) if counts['confirmed'] else []
+    return deleted, promoted
+
+
+def build_ticket_email(registration, connection=None):
+    """Prépare l'e-mail de confirmation avec le ticket en pièce jointe"""
+    event = registration.event
+    html_content = render_to_string('emails/event_registration_confirmation.html', {
+        'participant_name': registration.nom_prenom,
+        'event_title': event.title_fr,
+        'event_date': event.date_event,
+        'event_location': event.location,
+    })
+
+    subject = f'Confirmation inscription - {event.title_fr}'
+    text_content = f'Bonjour {registration.nom_prenom},\n\nVotre inscription à l\'événement "{event.title_fr}" a bien été enregistrée.\n\nVous trouverez votre ticket en pièce jointe.\n\nCordialement,\nL\'équipe COMS.A.S'
+
+    email = EmailMultiAlternatives(
+        subject,
+        text_content,
+        settings.EMAIL_HOST_USER,
+        [registration.email],
+        connection=connection,
+    )
+    email.attach_alternative(html_content, "text/html")
+
+    if registration.ticket_pdf:
+        email.attach_file(registration.ticket_pdf.path)
+    return email
+
+
+def send_ticket(registration):
+    """Génère le ticket et l'envoie par e-mail au participant"""
+    try:
+        generate_ticket(registration)
+    except Exception:
+        logger.exception("Génération du ticket impossible pour l'inscription %s", registration.pk)
+
+    # Envoyer notification HTML avec pièces jointes
+    try:
+        sent = build_ticket_email(registration).send(fail_silently=True)
+    except Exception:
+        logger.exception("Envoi du ticket impossible pour l'inscription %s", registration.pk)
+        return
+    if sent:
+        mark_tickets_sent([registration.pk])
+
+
+def mark_tickets_sent(registration_ids):
+    """Enregistre l'envoi des tickets : send_pending_tickets ne les renverra pas"""
+    EventRegistration.objects.filter(pk__in=registration_ids).update(ticket_sent_at=timezone.now())
+
+
+def send_tickets(registration_ids):
+    """
+    Génère et envoie les tickets par lots de TICKET_BATCH_SIZE.
+    Une seule connexion SMTP et une seule requête par lot ; seuls les e-mails
+    acceptés par le serveur sont marqués envoyés.
+    """
+    registration_ids = list(registration_ids)
+    for start in range(0, len(registration_ids), TICKET_BATCH_SIZE):
+        batch = EventRegistration.objects.select_related('event').filter(
+            pk__in=registration_ids[start:start + TICKET_BATCH_SIZE]
+        )
+        emails = []
+        connection = get_connection(fail_silently=True)
+        for registration in batch:
+            try:
+                generate_ticket(registration)
+                emails.append((registration.pk, build_ticket_email(registration, connection=connection)))
+            except Exception:
+                logger.exception("Génération du ticket impossible pour l'inscription %s", registration.pk)
+        sent = []
+        try:
+            with connection:
+                for pk, email in emails:
+                    if connection.send_messages([email]):
+                        sent.append(pk)
+        except Exception:
+            logger.exception("Envoi du lot de tickets interrompu (%d/%d e-mails envoyés)", len(sent), len(emails))
+        mark_tickets_sent(sent)
+
+
+def _send_tickets_in_background(registration_ids):
+    try:
+        send_tickets(registration_ids)
+    finally:
+        # Le thread ouvre sa propre connexion à la base
+        db_connection.close()
+
+
+def queue_tickets(registration_ids):
+    """
+    Programme l'envoi des tickets après validation de la transaction,
+    dans un thread séparé pour ne pas bloquer la requête. Les tickets perdus
+    (redémarrage du worker) sont renvoyés par la commande send_pending_tickets.
+    """
+    registration_ids = list(registration_ids)
+    if not registration_ids:
+        return
+    transaction.on_commit(
+        lambda: threading.Thread(target=_send_tickets_in_background, args=(registration_ids,), daemon=True).start()
+    )
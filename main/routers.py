@@ -0,0 +1,44 @@
+import contextvars
+
+from django.db import connections
+
+# Alias de la réplique en lecture seule (DATABASES['replica'], optionnelle)
+REPLICA = 'replica'
+
+# Alias de lecture de la requête HTTP en cours ; None hors requête (commandes, tâches de fond)
+_read_alias = contextvars.ContextVar('read_alias', default=None)
+
+
+def route_reads(alias):
+    """Oriente les lectures du contexte courant ; retourne le jeton pour reset_reads()"""
+    return _read_alias.set(alias)
+
+
+def reset_reads(token):
+    _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Lectures vers la réplique quand ReplicaRoutingMiddleware l'a choisie pour la requête,
+    écritures toujours vers la base principale. Après une écriture, le reste de la requête
+    lit la base principale.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or alias == 'default':
+            return None
+        # Dans une transaction, la réplique ne verrait pas les écritures en cours
+        if connections['default'].in_atomic_block:
+            return 'default'
+        return alias
+
+    def db_for_write(self, model, **hints):
+        if _read_alias.get() not in (None, 'default'):
+            _read_alias.set('default')
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Mêmes données des deux côtés : les objets lus sur la réplique sont liables à ceux de la principale
+        return True
@@ -0,0 +1,298 @@
+import re
+import unicodedata
+
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+from .models import Archive, BlogArticle, News, Event, Project, Member, SearchEntry
+
+# Table FTS5 (SQLite) créée par la migration 0023
+FTS_TABLE = 'main_searchentry_fts'
+
+# Poids du titre par rapport au contenu dans le classement bm25 (SQLite)
+TITLE_WEIGHT = 5.0
+
+MAX_QUERY_TERMS = 10
+
+
+def normalize(text):
+    """Texte en minuscules, sans balises HTML ni accents"""
+    text = unicodedata.normalize('NFKD', strip_tags(text or ''))
+    return ''.join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def query_terms(query):
+    """Mots de la requête, normalisés et sans caractères spéciaux"""
+    return re.findall(r'\w+', normalize(query))[:MAX_QUERY_TERMS]
+
+
+# ============= DOCUMENTS INDEXÉS =============
+
+def _archive_document(archive):
+    return {
+        'title': archive.title,
+        'body': ' '.join([
+            archive.description, archive.get_level_display(), archive.academic_year, archive.get_category_display(),
+            archive.text_content,
+        ]),
+        'url': reverse('archive_detail', kwargs={'slug': archive.slug}) if archive.slug else '',
+        'date': archive.created_at,
+        'is_public': True,
+    }
+
+
+def _blog_document(article):
+    return {
+        'title': article.title,
+        'body': ' '.join([article.get_category_display(), article.content]),
+        'url': reverse('blog_detail', kwargs={'slug': article.slug}),
+        'date': article.published_at,
+        'is_public': article.is_published,
+    }
+
+
+def _news_document(news):
+    return {
+        'title': news.title_fr,
+        'body': ' '.join([news.title_en, news.content_fr]),
+        'url': reverse('news_detail', kwargs={'pk': news.pk}),
+        'date': news.publication_date,
+        'is_public': news.is_published,
+    }
+
+
+def _event_document(event):
+    return {
+        'title': event.title_fr,
+        'body': ' '.join([event.title_en, event.location, event.description_fr]),
+        'url': reverse('event_detail', kwargs={'pk': event.pk}),
+        'date': event.date_event,
+        'is_public': event.is_active,
+    }
+
+
+def _project_document(project):
+    return {
+        'title': project.title_fr,
+        'body': ' '.join([project.title_en, project.description_fr]),
+        'url': reverse('project_detail', kwargs={'pk': project.pk}),
+        'date': project.created_at,
+        'is_public': True,
+    }
+
+
+def _member_document(member):
+    # Les membres ne sont recherchables que depuis le tableau de bord
+    return {
+        'title': member.nom_prenom,
+        'body': ' '.join(filter(None, [
+            member.email, member.matricule, member.promotion, member.niveau, member.profession,
+        ])),
+        'url': reverse('admin_member_detail', kwargs={'pk': member.pk}),
+        'date': member.date_adhesion,
+        'is_public': False,
+    }
+
+
+# Modèle -> (type d'entrée, fonction produisant le document)
+SEARCH_INDEX = {
+    Archive: ('archive', _archive_document),
+    BlogArticle: ('blog', _blog_document),
+    News: ('news', _news_document),
+    Event: ('event', _event_document),
+    Project: ('project', _project_document),
+    Member: ('member', _member_document),
+}
+
+
+def _build_entry(obj):
+    kind, build = SEARCH_INDEX[type(obj)]
+    data = build(obj)
+    return SearchEntry(
+        kind=kind,
+        object_id=obj.pk,
+        title=data['title'][:255],
+        summary=Truncator(strip_tags(data['body'])).chars(200),
+        document=normalize(f"{data['title']} {data['body']}"),
+        url=data['url'],
+        date=data['date'],
+        is_public=data['is_public'],
+    )
+
+
+# ============= MISE À JOUR DE L'INDEX =============
+
+def _sync_fts(entries, removed_ids=()):
+    """Réplique les entrées dans la table FTS5 (SQLite uniquement)"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        if removed_ids:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(pk,) for pk in removed_ids])
+        if entries:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, document) VALUES (%s, %s, %s)",
+                [(entry.pk, normalize(entry.title), entry.document) for entry in entries],
+            )
+
+
+def index_object(obj):
+    """Ajoute ou met à jour un objet dans l'index de recherche"""
+    entry = _build_entry(obj)
+    with transaction.atomic():
+        entry.pk = SearchEntry.objects.filter(kind=entry.kind, object_id=entry.object_id).values_list('pk', flat=True).first()
+        removed = [entry.pk] if entry.pk else []
+        entry.save(force_insert=entry.pk is None)
+        _sync_fts([entry], removed_ids=removed)
+
+
+def index_objects(objects):
+    """Indexe un lot d'objets d'un même modèle (imports, reconstruction de l'index)"""
+    entries = [_build_entry(obj) for obj in objects]
+    if not entries:
+        return
+    kind = entries[0].kind
+    object_ids = [entry.object_id for entry in entries]
+    with transaction.atomic():
+        existing = SearchEntry.objects.filter(kind=kind, object_id__in=object_ids)
+        removed = list(existing.values_list('pk', flat=True))
+        if removed:
+            SearchEntry.objects.filter(pk__in=removed).delete()
+        created = SearchEntry.objects.bulk_create(entries, batch_size=500)
+        if any(entry.pk is None for entry in created):
+            # Anciennes versions de SQLite : bulk_create ne renvoie pas les clés
+            created = list(SearchEntry.objects.filter(kind=kind, object_id__in=object_ids))
+        _sync_fts(created, removed_ids=removed)
+
+
+def remove_object(obj):
+    """Retire un objet de l'index de recherche"""
+    kind = SEARCH_INDEX[type(obj)][0]
+    with transaction.atomic():
+        ids = list(SearchEntry.objects.filter(kind=kind, object_id=obj.pk).values_list('pk', flat=True))
+        if ids:
+            SearchEntry.objects.filter(pk__in=ids).delete()
+            _sync_fts([], removed_ids=ids)
+
+
+def rebuild_index():
+    """Reconstruit tout l'index ; retourne le nombre d'entrées"""
+    with transaction.atomic():
+        SearchEntry.objects.all().delete()
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        for model in SEARCH_INDEX:
+            queryset = model.objects.all().order_by('pk')
+            batch = []
+            for obj in queryset.iterator(chunk_size=500):
+                batch.append(obj)
+                if len(batch) == 500:
+                    index_objects(batch)
+                    batch = []
+            index_objects(batch)
+    return SearchEntry.objects.count()
+
+
+# ============= RECHERCHE =============
+
+class SearchResults:
+    """
+    Résultats classés par pertinence, compatibles avec Paginator :
+    seule la page demandée est chargée.
+    """
+
+    def __init__(self, query, kinds=None, public_only=True, within=None):
+        self.terms = query_terms(query)
+        self.kinds = list(kinds) if kinds else None
+        self.public_only = public_only
+        # Queryset du modèle recherché : restreint les résultats à ses objets (filtres de la page)
+        self.within = within
+        self._count = None
+
+    # --- SQLite : table FTS5 ---
+
+    def _fts_where(self):
+        match = ' '.join(f'"{term}"*' for term in self.terms)
+        where = [f"{FTS_TABLE} MATCH %s"]
+        params = [match]
+        if self.public_only:
+            where.append("e.is_public = %s")
+            params.append(True)
+        if self.kinds:
+            where.append(f"e.kind IN ({', '.join(['%s'] * len(self.kinds))})")
+            params.extend(self.kinds)
+        if self.within is not None:
+            subquery, subquery_params = self.within.order_by().values('pk').query.sql_with_params()
+            where.append(f"e.object_id IN ({subquery})")
+            params.extend(subquery_params)
+        return ' AND '.join(where), params
+
+    def _fts_sql(self, select):
+        where, params = self._fts_where()
+        sql = f"SELECT {select} FROM {FTS_TABLE} JOIN main_searchentry e ON e.id = {FTS_TABLE}.rowid WHERE {where}"
+        return sql, params
+
+    # --- PostgreSQL / autres bases ---
+
+    def _queryset(self):
+        queryset = SearchEntry.objects.all()
+        if self.public_only:
+            queryset = queryset.filter(is_public=True)
+        if self.kinds:
+            queryset = queryset.filter(kind__in=self.kinds)
+        if self.within is not None:
+            queryset = queryset.filter(object_id__in=self.within.order_by().values('pk'))
+
+        if connection.vendor == 'postgresql':
+            from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+            # Même expression que l'index GIN de la migration 0023
+            vector = SearchVector('document', config='french')
+            search_query = SearchQuery(' & '.join(f'{term}:*' for term in self.terms), config='french', search_type='raw')
+            return queryset.annotate(search=vector, rank=SearchRank(vector, search_query)) \
+                .filter(search=search_query).order_by('-rank', '-date')
+
+        for term in self.terms:
+            queryset = queryset.filter(document__icontains=term)
+        return queryset.order_by('-date')
+
+    def count(self):
+        if self._count is None:
+            if not self.terms:
+                self._count = 0
+            elif connection.vendor == 'sqlite':
+                sql, params = self._fts_sql('COUNT(*)')
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    self._count = cursor.fetchone()[0]
+            else:
+                self._count = self._queryset().count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        if not self.terms:
+            return []
+        start = key.start or 0
+        stop = key.stop if key.stop is not None else self.count()
+
+        if connection.vendor != 'sqlite':
+            return list(self._queryset()[start:stop])
+
+        sql, params = self._fts_sql('e.id')
+        sql += f" ORDER BY bm25({FTS_TABLE}, {TITLE_WEIGHT}, 1.0), e.date DESC LIMIT %s OFFSET %s"
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + [stop - start, start])
+            ids = [row[0] for row in cursor.fetchall()]
+        entries = SearchEntry.objects.in_bulk(ids)
+        return [entries[pk] for pk in ids if pk in entries]
+
+
+def search(query, kinds=None, public_only=True, within=None):
+    return SearchResults(query, kinds=kinds, public_only=public_only, within=within)
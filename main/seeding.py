@@ -0,0 +1,417 @@
+import random
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO
+from itertools import islice
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from reportlab.pdfgen import canvas
+
+from .models import (
+    Member, Project, Event, EventRegistration, News, GalleryAlbum, Gallery, Contact, SiteSettings,
+    SponsorshipSession, Mentor, Mentee, Match, Contest, Candidate, Vote,
+    RequestDocument, Professor, Classroom, Delegate, BlogArticle, Archive, ArchiveComment, StoredFile,
+)
+from .search import rebuild_index
+from .slugs import assign_slugs
+from .storage import dedup_storage, file_fields
+
+# Volumes créés pour scale=1 ; les volumes « par objet » (_per_) ne sont pas multipliés
+VOLUMES = {
+    'members': 40,
+    'projects': 6,
+    'events': 8,
+    'registrations_per_event': 25,
+    'news': 12,
+    'albums': 4,
+    'images_per_album': 8,
+    'contacts': 10,
+    'mentors': 10,
+    'mentees': 20,
+    'contests': 2,
+    'candidates_per_contest': 6,
+    'votes_per_contest': 60,
+    'documents': 6,
+    'professors': 10,
+    'classrooms': 6,
+    'delegates': 8,
+    'articles': 12,
+    'archives': 30,
+    'comments_per_archive': 2,
+}
+
+BATCH_SIZE = 1000
+
+# Préfixe des matricules générés : permet de détecter une base déjà peuplée
+MATRICULE_PREFIX = 'SEED'
+
+FIRST_NAMES = ['Patrice', 'Hélène', 'Junior', 'Aïcha', 'Boris', 'Carine', 'Franck', 'Linda', 'Serge', 'Yvonne']
+LAST_NAMES = ['Ngono', 'Tchakounte', 'Mbia', 'Fotsing', 'Kamgang', 'Nguegang', 'Wafo', 'Djoukeng', 'Noumsi', 'Fopa']
+ACADEMIC_YEARS = ['2021-2022', '2022-2023', '2023-2024', '2024-2025']
+BUREAU_ROLES = [
+    "Président", "Secrétaire Général", "Trésorier", "Responsable Comm", "Commissaire aux Comptes",
+    "Responsable Académique", "Responsable Relations Ext.", "Responsable Projets",
+]
+PROJECTS = [
+    ("Plateforme E-Learning", "Une plateforme centralisée pour le partage de cours, TD et anciens sujets d'examens."),
+    ("Application Mobile Campus", "Application Android/iOS pour la navigation sur le campus et l'emploi du temps."),
+    ("Site Web COM.S.AS", "Refonte complète du site web de l'association avec gestion des membres et événements."),
+    ("Hackathon IA", "Organisation du plus grand hackathon universitaire sur l'Intelligence Artificielle."),
+    ("Ateliers de Formation Python", "Série d'ateliers pratiques pour initier les étudiants à Python et à la Data Science."),
+    ("Bibliothèque Numérique", "Numérisation des mémoires de fin d'études des anciens étudiants."),
+]
+EVENTS = [
+    ("Séminaire React JS", "Formation intensive sur React JS : création d'une application de A à Z."),
+    ("Gala de fin d'année", "Grande soirée de gala pour célébrer la fin de l'année académique."),
+    ("Concours de Code", "Compétition de programmation (algorithmique et structures de données)."),
+    ("Conférence IA & Éthique", "Table ronde avec des experts sur les enjeux éthiques de l'IA."),
+    ("Journée d'Intégration", "Activités ludiques et sportives pour accueillir les étudiants de Licence 1."),
+    ("Workshop Cyber-Sécurité", "Atelier pratique sur les bases de la sécurité informatique et le pentesting."),
+]
+NEWS = [
+    ("Lancement des activités", "Le club lance officiellement ses activités pour la nouvelle année académique."),
+    ("Partenariat avec Google", "Nouveau partenariat stratégique avec Google Developer Groups."),
+    ("Retour sur le Hackathon", "Les gagnants du Hackathon ont été primés. Félicitations à l'équipe 'CodeNinjas' !"),
+    ("Appel à candidatures Bureau", "Les élections pour le nouveau bureau exécutif sont ouvertes."),
+    ("Nouveaux T-Shirts Disponibles", "Les t-shirts officiels du COM.S.AS sont arrivés."),
+    ("Interview du Président", "L'interview exclusive de notre président sur la vision de ce mandat."),
+]
+ALBUMS = [
+    ("Rentrée Solennelle", "Cérémonie d'accueil des nouveaux étudiants."),
+    ("Hackathon COMS.A.S", "Un marathon de programmation de 48h."),
+    ("Soirée de Gala", "Soirée de clôture de l'année académique."),
+    ("Journée Sportive", "Le tournoi inter-filières du département."),
+]
+ARCHIVES = [
+    ("Procès Verbal de délibération", 'PV'), ("Procès Verbal AG Rentrée", 'PV'),
+    ("Planning des examens", 'OTHER'), ("Liste des groupes TP", 'OTHER'), ("Sujet corrigé", 'OTHER'),
+]
+COMMENTS = ["Merci pour ce partage !", "Est-ce que c'est bien la version finale ?", "Très utile, merci.", "Super doc !"]
+DOCUMENTS = [
+    ("Demande de Stage Académique", 'word'), ("Demande de Relevé de Notes", 'pdf'),
+    ("Demande de Rectification de Note", 'word'), ("Autorisation d'absence", 'pdf'), ("Charte de l'étudiant", 'pdf'),
+]
+ARTICLES = [
+    ("Comment réussir sa soutenance ?", 'conseil'), ("Les meilleures entreprises pour un stage", 'stage'),
+    ("Tuto : Déployer Django sur VPS", 'tuto'), ("Retour sur la semaine de l'informatique", 'vie'),
+    ("Bourse d'excellence : comment postuler ?", 'master'),
+]
+PROFESSORS = ['Atsa Etoundi', 'Mvogo Ngono', 'Nlong II', 'Tapamo', 'Tindo', 'Fotsin', 'Melather', 'Kolyang', 'Moungo', 'Zoueu']
+SPECIALTIES = ['Génie Logiciel', 'Intelligence Artificielle', 'Réseaux', 'Cryptographie', 'Systèmes Distribués']
+CLASSROOMS = ['S001', 'S002', 'Amphi 350', 'Amphi 1001', 'Labo Info 1', 'Labo Réseaux']
+LOREM = (
+    "<p>Le Club des étudiants en informatique organise des activités académiques, "
+    "des formations et des rencontres professionnelles tout au long de l'année.</p>"
+)
+
+
+def batched(iterable, size=BATCH_SIZE):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def pick(pool, i):
+    """i-ème élément d'une liste de modèles, numéroté au-delà du premier tour"""
+    item = pool[i % len(pool)]
+    round_ = i // len(pool)
+    if not round_:
+        return item
+    if isinstance(item, tuple):
+        return (f"{item[0]} ({round_ + 1})",) + item[1:]
+    return f"{item} ({round_ + 1})"
+
+
+def _placeholder_pdf():
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer)
+    p.drawString(72, 770, "COMS.A.S - Document de démonstration")
+    p.save()
+    return buffer.getvalue()
+
+
+class Seeder:
+    """
+    Jeu de données de démonstration ou de test, déterministe pour une graine donnée.
+    Les objets sont générés et insérés par lots (bulk_create) : la mémoire reste bornée
+    quel que soit le volume, les compteurs dénormalisés sont remplis directement.
+    """
+
+    def __init__(self, scale=1, seed=42, volumes=None, with_files=False, log=None):
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.volumes = {**VOLUMES, **(volumes or {})}
+        self.with_files = with_files
+        self.log = log
+        self.now = timezone.now().replace(microsecond=0)
+        self.counts = {}
+        self.files = {'image': 'seed/placeholder.png', 'pdf': 'seed/placeholder.pdf'}
+
+    def volume(self, name):
+        if '_per_' in name:
+            return self.volumes[name]
+        return max(int(self.volumes[name] * self.scale), 1)
+
+    def name(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def phone(self):
+        return f"6{self.rng.randint(10000000, 99999999)}"
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def create(self, model, objects, keep=False, slugs=None):
+        """Insère `objects` (itérable) par lots ; retourne les objets créés si `keep`"""
+        kept = []
+        for batch in batched(objects):
+            if slugs is not None:
+                assign_slugs(batch, state=slugs)
+            created = model.objects.bulk_create(batch)
+            self.count(model, len(created))
+            if keep:
+                kept.extend(created)
+        return kept
+
+    def count(self, model, n):
+        label = model._meta.verbose_name_plural
+        self.counts[label] = self.counts.get(label, 0) + n
+
+    def step(self, method):
+        result = method()
+        if self.log:
+            self.log(method.__name__.replace('seed_', ''))
+        return result
+
+    def run(self):
+        with transaction.atomic():
+            if self.with_files:
+                self.seed_files()
+            for method in (self.seed_site, self.seed_members, self.seed_projects, self.seed_events, self.seed_news,
+                           self.seed_gallery, self.seed_sponsorship, self.seed_contests, self.seed_department,
+                           self.seed_resources):
+                self.step(method)
+            if self.with_files:
+                self.count_file_refs()
+            # bulk_create n'envoie pas les signaux : l'index de recherche est reconstruit en une fois
+            self.step(rebuild_index)
+        return self.counts
+
+    # ------------- Fichiers -------------
+
+    def seed_files(self):
+        """Un seul fichier réel par type, partagé par tous les objets (le PDF dans le stockage dédoublonné)"""
+        with open(settings.BASE_DIR / 'static' / 'images' / 'comsas.png', 'rb') as f:
+            self.files['image'] = default_storage.save('seed/comsas.png', ContentFile(f.read()))
+        self.files['pdf'] = dedup_storage.save('seed/document.pdf', ContentFile(_placeholder_pdf()))
+
+    def count_file_refs(self):
+        # Chaque save() ci-dessus a pris une référence ; on la remplace par les références réelles
+        for name in set(self.files.values()):
+            refs = sum(model._default_manager.filter(**{field.attname: name}).count() for model, field in file_fields())
+            StoredFile.objects.filter(name=name).update(refs=F('refs') + refs - 1)
+
+    # ------------- Modèles -------------
+
+    def seed_site(self):
+        if not SiteSettings.objects.exists():
+            self.create(SiteSettings, [SiteSettings(
+                site_name="COM.S.AS", slogan_fr="Excellence - Innovation - Partage",
+                slogan_en="Excellence - Innovation - Sharing",
+                description_fr="La communauté des étudiants en informatique.",
+                description_en="The computer science students community.",
+                president_message_fr="Bienvenue sur notre nouveau site !", president_message_en="Welcome to our new website!",
+            )])
+
+    def seed_members(self):
+        levels = [code for code, _ in Member.LEVEL_CHOICES]
+
+        def members():
+            for i in range(self.volume('members')):
+                if i < len(BUREAU_ROLES):
+                    member_type, role = 'bureau', BUREAU_ROLES[i]
+                else:
+                    member_type, role = ('founder' if i % 50 == 0 else 'conseil' if i % 25 == 0 else 'simple'), None
+                yield Member(
+                    nom_prenom=self.name(),
+                    date_naissance=date(1998, 1, 1) + timedelta(days=self.rng.randint(0, 3000)),
+                    lieu_naissance=self.rng.choice(['Yaoundé', 'Douala', 'Bafoussam', 'Garoua']),
+                    niveau=self.rng.choice(levels), promotion=str(self.rng.randint(2020, 2028)),
+                    telephone=self.phone(), email=f"membre{i}@seed.comsas.local",
+                    matricule=f"{MATRICULE_PREFIX}{i:07d}", member_type=member_type, poste_bureau=role,
+                    bio=LOREM if member_type != 'simple' else None, is_active=i % 5 != 4,
+                )
+        self.create(Member, members())
+        # Auteurs des actualités et articles : un échantillon borné
+        self.authors = list(Member.objects.filter(matricule__startswith=MATRICULE_PREFIX).order_by('pk')[:200])
+
+    def seed_projects(self):
+        self.create(Project, (Project(
+            title_fr=title, title_en=f"{title} (EN)", description_fr=description, description_en=description,
+            status=self.rng.choice(['planning', 'ongoing', 'completed', 'suspended']),
+            budget_required=Decimal(self.rng.randint(1, 50) * 100000),
+            budget_collected=Decimal(self.rng.randint(0, 20) * 50000),
+            start_date=(self.now - timedelta(days=30 * (i % 24))).date(), is_featured=i < 3,
+        ) for i, (title, description) in ((i, pick(PROJECTS, i)) for i in range(self.volume('projects')))))
+
+    def seed_events(self):
+        events = self.create(Event, (Event(
+            title_fr=title, title_en=f"{title} (EN)", description_fr=description, description_en=description,
+            date_event=self.now + timedelta(days=self.rng.randint(-365, 90)),
+            location=self.rng.choice(['Amphi 350', 'CUTI', 'Salle S008']),
+            max_participants=self.rng.choice([None, 50, 200, 1000]),
+            registration_deadline=self.now + timedelta(days=self.rng.randint(-30, 30)),
+            is_featured=i < 3,
+        ) for i, (title, description) in ((i, pick(EVENTS, i)) for i in range(self.volume('events')))), keep=True)
+
+        per_event = self.volume('registrations_per_event')
+
+        def registrations():
+            for event in events:
+                seats = event.max_participants if event.max_participants is not None else per_event
+                for i in range(per_event):
+                    confirmed = i < seats and i % 4 != 3
+                    event.confirmed_count += confirmed
+                    event.pending_count += not confirmed
+                    yield EventRegistration(
+                        event=event, nom_prenom=self.name(), email=f"participant{i}@seed.comsas.local",
+                        telephone=self.phone(), promotion=self.rng.choice(['L1', 'L3', 'M1']),
+                        is_confirmed=confirmed, uuid=self.uuid(),
+                    )
+        self.create(EventRegistration, registrations())
+        Event.objects.bulk_update(events, ['confirmed_count', 'pending_count'], batch_size=BATCH_SIZE)
+
+    def seed_news(self):
+        self.create(News, (News(
+            title_fr=title, title_en=f"{title} (EN)", content_fr=content, content_en=content,
+            author=self.rng.choice(self.authors[:len(BUREAU_ROLES)]),
+            is_published=i % 6 != 5, is_featured=i < 2, publication_date=self.now - timedelta(days=3 * i),
+        ) for i, (title, content) in ((i, pick(NEWS, i)) for i in range(self.volume('news')))))
+
+    def seed_gallery(self):
+        albums = self.create(GalleryAlbum, (GalleryAlbum(
+            title_fr=title, title_en=title, description_fr=description,
+            event_date=(self.now - timedelta(days=20 * i)).date(),
+        ) for i, (title, description) in ((i, pick(ALBUMS, i)) for i in range(self.volume('albums')))), keep=True)
+        self.create(Gallery, (Gallery(
+            title_fr=f"Photo {j + 1}", title_en=f"Photo {j + 1}", album=album, description_fr=album.title_fr,
+            image=self.files['image'], is_featured=j == 0,
+        ) for album in albums for j in range(self.volume('images_per_album'))))
+        self.create(Contact, (Contact(
+            nom_prenom=self.name(), email=f"contact{i}@seed.comsas.local",
+            sujet="Demande d'information", message="Bonjour, je souhaite adhérer au club.", is_read=i % 2 == 0,
+        ) for i in range(self.volume('contacts'))))
+
+    def seed_sponsorship(self):
+        session = self.create(SponsorshipSession, [SponsorshipSession(
+            name=f"Parrainage {self.now.year}-{self.now.year + 1}", start_date=(self.now - timedelta(days=30)).date(),
+            end_date=(self.now + timedelta(days=180)).date(), is_active=True,
+        )], keep=True)[0]
+        specialties = [code for code, _ in Mentor.SPECIALTY_CHOICES]
+        mentors = self.create(Mentor, (Mentor(
+            session=session, first_name=self.rng.choice(FIRST_NAMES), last_name=self.rng.choice(LAST_NAMES),
+            phone=self.phone(), email=f"parrain{i}@seed.comsas.local",
+            level=self.rng.choice(['L3', 'M1', 'M2', 'PHD']), specialty=self.rng.choice(specialties),
+            expertise_domains="web_dev,software_eng,cloud_devops",
+        ) for i in range(self.volume('mentors'))), keep=True)
+
+        # Chaque parrain reçoit au plus max_mentees (2) filleuls ; les autres restent en attente
+        capacity = len(mentors) * 2
+        mentees = (Mentee(
+            session=session, first_name=self.rng.choice(FIRST_NAMES), last_name=self.rng.choice(LAST_NAMES),
+            phone=self.phone(), email=f"filleul{i}@seed.comsas.local", level=self.rng.choice(['L1', 'L2']),
+            desired_specialty=self.rng.choice(specialties), competencies="c_cpp,html_css",
+            professional_domains="software_eng,web_dev",
+        ) for i in range(self.volume('mentees')))
+        offset = 0
+        for batch in batched(mentees):
+            created = Mentee.objects.bulk_create(batch)
+            self.count(Mentee, len(created))
+            self.create(Match, (Match(
+                session=session, mentor=mentors[(offset + i) % len(mentors)], mentee=mentee,
+            ) for i, mentee in enumerate(created[:max(capacity - offset, 0)])))
+            offset += len(created)
+
+    def seed_contests(self):
+        contests = self.create(Contest, (Contest(
+            title=f"Miss & Master COMSAS {self.now.year - i}",
+            description="L'élégance et l'intelligence à l'honneur.",
+            start_date=self.now - timedelta(days=5 + 365 * i), end_date=self.now + timedelta(days=5 - 365 * i),
+            is_active=i == 0, allow_public_candidates=i == 0,
+        ) for i in range(self.volume('contests'))), keep=True, slugs={})
+
+        per_contest = self.volume('candidates_per_contest')
+        candidates = self.create(Candidate, (Candidate(
+            contest=contest, name=self.name(), description="Passionné(e) par la tech et la mode.",
+            image=self.files['image'],
+        ) for contest in contests for _ in range(per_contest)), keep=True)
+
+        def votes():
+            for n, contest in enumerate(contests):
+                choices = candidates[n * per_contest:(n + 1) * per_contest]
+                for i in range(self.volume('votes_per_contest')):
+                    candidate = self.rng.choice(choices)
+                    candidate.votes_count += 1
+                    yield Vote(
+                        contest=contest, candidate=candidate, voter_email=f"votant{i}@seed.comsas.local",
+                        voter_matricule=f"V{i:07d}", ip_address=f"10.{i // 62500 % 250}.{i // 250 % 250}.{i % 250 + 1}",
+                    )
+        self.create(Vote, votes())
+        Candidate.objects.bulk_update(candidates, ['votes_count'], batch_size=BATCH_SIZE)
+
+    def seed_department(self):
+        self.create(Professor, (Professor(
+            name=pick(PROFESSORS, i), grade=self.rng.choice(['Pr', 'Mc', 'Dr']),
+            specialty=self.rng.choice(SPECIALTIES), office_description=f"Bâtiment Principal, Porte {100 + i}",
+            email=f"prof{i}@seed.comsas.local",
+        ) for i in range(self.volume('professors'))))
+        self.create(Classroom, (Classroom(
+            name=pick(CLASSROOMS, i), capacity=self.rng.randint(30, 1000),
+            location_description="Nouveau Bloc Pédagogique", is_lab='Labo' in CLASSROOMS[i % len(CLASSROOMS)],
+        ) for i in range(self.volume('classrooms'))))
+        levels = [code for code, _ in Delegate.LEVEL_CHOICES]
+        self.create(Delegate, (Delegate(
+            name=self.name(), level=levels[i % len(levels)], phone=self.phone(), motto="Servir et non se servir",
+        ) for i in range(self.volume('delegates'))))
+
+    def seed_resources(self):
+        self.create(RequestDocument, (RequestDocument(
+            title=title, doc_type=doc_type, file=self.files['pdf'],
+            description="Modèle officiel à télécharger et remplir.", downloads_count=self.rng.randint(10, 500),
+        ) for title, doc_type in (pick(DOCUMENTS, i) for i in range(self.volume('documents')))))
+
+        self.create(BlogArticle, (BlogArticle(
+            title=title, content=LOREM, category=category, author=self.rng.choice(self.authors),
+            image=self.files['image'], is_published=i % 4 != 3, published_at=self.now - timedelta(days=2 * i),
+            views_count=self.rng.randint(50, 5000), likes_count=self.rng.randint(10, 500),
+        ) for i, (title, category) in ((i, pick(ARTICLES, i)) for i in range(self.volume('articles')))), slugs={})
+
+        levels = [code for code, _ in Archive.LEVEL_CHOICES]
+        archives = (Archive(
+            title=f"{ARCHIVES[i % len(ARCHIVES)][0]} {levels[i % len(levels)]}",
+            category=ARCHIVES[i % len(ARCHIVES)][1], level=levels[i % len(levels)],
+            academic_year=self.rng.choice(ACADEMIC_YEARS), file=self.files['pdf'],
+            description="Document partagé par le bureau pour les étudiants.",
+            views_count=self.rng.randint(50, 500), downloads_count=self.rng.randint(10, 100),
+            likes_count=self.rng.randint(5, 50),
+        ) for i in range(self.volume('archives')))
+        slugs = {}
+        per_archive = self.volume('comments_per_archive')
+        for batch in batched(archives):
+            assign_slugs(batch, state=slugs)
+            created = Archive.objects.bulk_create(batch)
+            self.count(Archive, len(created))
+            self.create(ArchiveComment, (ArchiveComment(
+                archive=archive, author_name=self.name(), content=self.rng.choice(COMMENTS),
+            ) for archive in created for _ in range(per_archive)))
+
+
+def seed(scale=1, seed=42, volumes=None, with_files=False, log=None):
+    """Crée le jeu de données ; retourne le nombre d'objets créés par modèle"""
+    return Seeder(scale=scale, seed=seed, volumes=volumes, with_files=with_files, log=log).run()
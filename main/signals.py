@@ -0,0 +1,116 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from .db_tuning import tune_connection
+from .extraction import queue_extraction
+from .analytics import invalidate_event_attendance
+from .facets import invalidate_facets
+from .models import Archive, BlogArticle, EventRegistration
+from .search import SEARCH_INDEX, index_object, remove_object
+from .storage import file_fields
+
+# Synchronisation de l'index de recherche
+
+# Compteurs mis à jour à chaque consultation : inutile de réindexer
+COUNTER_FIELDS = {'views_count', 'likes_count', 'downloads_count'}
+
+
+def update_search_index(sender, instance, raw=False, update_fields=None, **kwargs):
+    # raw : chargement de fixtures, l'index est reconstruit ensuite
+    if raw or (update_fields and set(update_fields) <= COUNTER_FIELDS):
+        return
+    index_object(instance)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    remove_object(instance)
+
+
+for model in SEARCH_INDEX:
+    post_save.connect(update_search_index, sender=model, dispatch_uid=f'search_index_save_{model.__name__}')
+    post_delete.connect(remove_from_search_index, sender=model, dispatch_uid=f'search_index_delete_{model.__name__}')
+
+
+# Invalidation des compteurs de filtres (facettes)
+
+FACETED_MODELS = {Archive: 'archive', BlogArticle: 'blog'}
+
+
+def invalidate_model_facets(sender, instance, raw=False, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= COUNTER_FIELDS:
+        return
+    invalidate_facets(FACETED_MODELS[sender])
+
+
+for model, name in FACETED_MODELS.items():
+    post_save.connect(invalidate_model_facets, sender=model, dispatch_uid=f'facets_save_{name}')
+    post_delete.connect(invalidate_model_facets, sender=model, dispatch_uid=f'facets_delete_{name}')
+
+
+# Invalidation des statistiques de présence (inscriptions enregistrées ou supprimées une à une ;
+# les mises à jour groupées passent par Event.adjust_counters)
+
+def invalidate_registration_attendance(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_event_attendance(instance.event_id)
+
+
+post_save.connect(invalidate_registration_attendance, sender=EventRegistration, dispatch_uid='attendance_save')
+post_delete.connect(invalidate_registration_attendance, sender=EventRegistration, dispatch_uid='attendance_delete')
+
+
+# Stockage dédoublonné : libération des fichiers remplacés ou supprimés
+
+STORED_FILE_FIELDS = {}
+for model, field in file_fields():
+    STORED_FILE_FIELDS.setdefault(model, []).append(field)
+
+
+def remember_stored_files(sender, instance, raw=False, update_fields=None, **kwargs):
+    fields = STORED_FILE_FIELDS[sender]
+    if update_fields is not None:
+        fields = [field for field in fields if field.name in update_fields]
+    instance._previous_files = {}
+    if raw or instance._state.adding or not fields:
+        return
+    previous = sender._default_manager.filter(pk=instance.pk).values(*[field.attname for field in fields]).first()
+    instance._previous_files = previous or {}
+
+
+def release_replaced_files(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_files', None) or {}
+    for field in STORED_FILE_FIELDS[sender]:
+        name = previous.get(field.attname)
+        if name and name != getattr(instance, field.attname).name:
+            field.storage.release(name)
+    instance._previous_files = {}
+
+
+def release_deleted_files(sender, instance, **kwargs):
+    for field in STORED_FILE_FIELDS[sender]:
+        name = getattr(instance, field.attname).name
+        if name:
+            field.storage.release(name)
+
+
+for model in STORED_FILE_FIELDS:
+    pre_save.connect(remember_stored_files, sender=model, dispatch_uid=f'stored_files_pre_save_{model.__name__}')
+    post_save.connect(release_replaced_files, sender=model, dispatch_uid=f'stored_files_save_{model.__name__}')
+    post_delete.connect(release_deleted_files, sender=model, dispatch_uid=f'stored_files_delete_{model.__name__}')
+
+
+# Extraction du texte et de l'aperçu des archives, en tâche de fond
+
+def schedule_text_extraction(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields and 'file' not in update_fields):
+        return
+    if instance.file and instance.file.name != instance.extracted_file:
+        queue_extraction([instance.pk])
+
+
+post_save.connect(schedule_text_extraction, sender=Archive, dispatch_uid='archive_text_extraction')
+
+
+# Réglages de chaque nouvelle connexion SQLite (WAL, attente du verrou, mmap)
+
+connection_created.connect(tune_connection, dispatch_uid='sqlite_tuning')
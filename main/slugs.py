@@ -0,0 +1,86 @@
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import BigIntegerField, Case, Count, Max, Q, When
+from django.db.models.functions import Cast, Substr
+from django.utils.text import slugify
+
+# Place réservée au suffixe numérique ("-12345") dans la longueur du slug
+SUFFIX_LENGTH = 6
+
+# Tentatives en cas de collision avec une insertion concurrente
+MAX_ATTEMPTS = 5
+
+
+def base_slug(model, text, field='slug'):
+    max_length = model._meta.get_field(field).max_length
+    base = slugify(text)[:max_length - SUFFIX_LENGTH].strip('-')
+    return base or model._meta.model_name
+
+
+def _suffix_state(model, base, field, exclude_pk=None):
+    """(base déjà prise, plus grand suffixe numérique existant) en une requête"""
+    pattern = rf'^{re.escape(base)}-[0-9]+$'
+    queryset = model._default_manager.filter(Q(**{field: base}) | Q(**{f'{field}__startswith': f'{base}-'}))
+    if exclude_pk is not None:
+        # L'objet renommé ne doit pas entrer en collision avec son propre slug
+        queryset = queryset.exclude(pk=exclude_pk)
+    return queryset.aggregate(
+        taken=Count('pk', filter=Q(**{field: base})),
+        # CASE : seuls les suffixes numériques sont convertis en entier
+        suffix=Max(Case(When(Q(**{f'{field}__regex': pattern}),
+                             then=Cast(Substr(field, len(base) + 2), BigIntegerField())))),
+    )
+
+
+def allocate_slug(model, text, field='slug', exclude_pk=None):
+    """
+    Premier slug libre pour `text` : la base, sinon base-N avec N = plus grand suffixe + 1.
+    Une seule requête quel que soit le nombre de doublons.
+    """
+    base = base_slug(model, text, field)
+    state = _suffix_state(model, base, field, exclude_pk)
+    if not state['taken']:
+        return base
+    return f"{base}-{(state['suffix'] or 0) + 1}"
+
+
+def assign_slugs(objects, source='title', field='slug', state=None):
+    """
+    Attribue des slugs uniques à des objets avant un bulk_create : une requête par base distincte.
+    `state` (dict) conserve les suffixes entre plusieurs lots d'un même modèle.
+    """
+    if not objects:
+        return
+    model = type(objects[0])
+    next_suffix = {} if state is None else state
+    for obj in objects:
+        if getattr(obj, field):
+            continue
+        base = base_slug(model, getattr(obj, source), field)
+        if base not in next_suffix:
+            state = _suffix_state(model, base, field)
+            next_suffix[base] = (state['suffix'] or 0) + 1 if state['taken'] else 0
+        suffix = next_suffix[base]
+        setattr(obj, field, f'{base}-{suffix}' if suffix else base)
+        next_suffix[base] = suffix + 1
+
+
+def save_with_slug(instance, save, source_text, field='slug'):
+    """
+    Enregistre `instance` avec un slug alloué depuis `source_text`.
+    Si une insertion concurrente prend le même slug (IntegrityError), un nouveau est alloué.
+    """
+    model = type(instance)
+    original = getattr(instance, field)
+    for attempt in range(MAX_ATTEMPTS):
+        slug = allocate_slug(model, source_text, field, exclude_pk=instance.pk)
+        setattr(instance, field, slug)
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            conflict = model._default_manager.filter(**{field: slug}).exclude(pk=instance.pk).exists()
+            if not conflict or attempt == MAX_ATTEMPTS - 1:
+                setattr(instance, field, original)
+                raise
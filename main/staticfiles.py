@@ -0,0 +1,46 @@
+import re
+
+from django.contrib.staticfiles.storage import StaticFilesStorage
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_SPACE = re.compile(r'\s+')
+_AROUND = re.compile(r'\s*([{};,>])\s*')
+
+
+def minify_css(css):
+    """Commentaires et espaces superflus retirés (feuilles du projet : pas de chaînes contenant « ; , { } »)"""
+    css = _COMMENT.sub('', css)
+    css = _SPACE.sub(' ', css)
+    css = _AROUND.sub(r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+class MinifiedStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    collectstatic : CSS du projet minifiés, puis noms hachés (manifeste) et variantes
+    .gz / .br pré-compressées servies par WhiteNoise avec un cache d'un an.
+    """
+
+    # Fichiers réécrits avant le hachage (ceux des dépendances sont déjà minifiés)
+    minify_patterns = ('css/',)
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for name in list(paths):
+                if name.endswith('.css') and not name.endswith('.min.css') and name.startswith(self.minify_patterns):
+                    with self.open(name) as f:
+                        css = f.read().decode('utf-8')
+                    self.delete(name)
+                    self._save(name, ContentFile(minify_css(css).encode('utf-8')))
+                    # Le hachage relit la copie minifiée plutôt que la source
+                    paths[name] = (self, name)
+        yield from super().post_process(paths, dry_run, **options)
+
+    def url(self, name, force=False):
+        # Sans manifeste (collectstatic pas encore exécuté : tests, développement) : noms d'origine
+        if not self.hashed_files and not force:
+            return StaticFilesStorage.url(self, name)
+        return super().url(name, force)
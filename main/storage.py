@@ -0,0 +1,133 @@
+import hashlib
+import os
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F, FileField
+
+# Répertoire des fichiers adressés par leur contenu, sous MEDIA_ROOT
+BLOB_DIR = 'blobs'
+
+# Applications dont les fichiers sont comptés par référence
+TRACKED_APPS = ('main', 'admin_dashboard')
+
+
+def content_hash(content):
+    """Empreinte SHA-256 calculée bloc par bloc, sans charger le fichier en mémoire"""
+    hasher = hashlib.sha256()
+    size = 0
+    for chunk in content.chunks():
+        hasher.update(chunk)
+        size += len(chunk)
+    content.seek(0)
+    return hasher.hexdigest(), size
+
+
+def blob_name(digest, original_name):
+    """'archives/2024/05/PV.PDF' -> 'blobs/ab/cd/abcd....pdf'"""
+    extension = os.path.splitext(original_name)[1].lower()[:10]
+    return f'{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+
+class DedupStorage(FileSystemStorage):
+    """
+    Stockage adressé par le contenu : un fichier envoyé plusieurs fois n'est écrit
+    qu'une fois. Chaque enregistrement ajoute une référence (StoredFile), chaque
+    libération en retire une ; le fichier est supprimé quand il n'est plus référencé.
+    À activer champ par champ (storage=dedup_storage), pas comme stockage par défaut.
+    Les opérations sur un même fichier sont sérialisées par un verrou sur sa ligne StoredFile.
+    """
+
+    def _save(self, name, content):
+        StoredFile = apps.get_model('main', 'StoredFile')
+        digest, size = content_hash(content)
+        name = blob_name(digest, name)
+        with transaction.atomic():
+            stored, _ = StoredFile.objects.select_for_update().get_or_create(name=name, defaults={'size': size})
+            if self.exists(name):
+                # Contenu déjà présent : marqué récent pour le délai de grâce de gc_media
+                os.utime(self.path(name))
+            else:
+                try:
+                    super()._save(name, content)
+                except FileExistsError:
+                    # Écrit entre-temps hors du verrou : le contenu est identique
+                    pass
+            StoredFile.objects.filter(pk=stored.pk).update(refs=F('refs') + 1)
+        return name
+
+    def get_available_name(self, name, max_length=None):
+        # Le nom définitif est calculé dans _save à partir du contenu ; un blob déjà présent
+        # interrompt la boucle de FileSystemStorage._save au lieu de la relancer indéfiniment
+        if name.startswith(f'{BLOB_DIR}/') and self.exists(name):
+            raise FileExistsError(name)
+        return name
+
+    def release(self, name):
+        """
+        Retire une référence ; le fichier est supprimé après validation de la
+        transaction s'il n'est plus utilisé. Sans effet sur les fichiers non suivis.
+        Retourne False si le fichier n'est pas suivi.
+        """
+        StoredFile = apps.get_model('main', 'StoredFile')
+        with transaction.atomic():
+            stored = StoredFile.objects.select_for_update().filter(name=name).first()
+            if stored is None:
+                return False
+            if stored.refs > 0:
+                StoredFile.objects.filter(pk=stored.pk).update(refs=F('refs') - 1)
+            if stored.refs <= 1:
+                transaction.on_commit(lambda: self._delete_orphan(name))
+        return True
+
+    def _delete_orphan(self, name):
+        StoredFile = apps.get_model('main', 'StoredFile')
+        with transaction.atomic():
+            # Le même contenu a pu être renvoyé entre-temps
+            stored = StoredFile.objects.select_for_update().filter(name=name, refs=0).first()
+            if stored is not None:
+                super().delete(name)
+                stored.delete()
+
+    def collect(self, name, cutoff):
+        """
+        gc_media : supprime un fichier sans référence réelle, sauf s'il a été écrit
+        ou réutilisé après `cutoff` (envoi en cours). Retourne True si supprimé.
+        """
+        StoredFile = apps.get_model('main', 'StoredFile')
+        with transaction.atomic():
+            stored, _ = StoredFile.objects.select_for_update().get_or_create(name=name)
+            if self.modified_after(name, cutoff):
+                return False
+            super().delete(name)
+            stored.delete()
+        return True
+
+    def modified_after(self, name, cutoff):
+        try:
+            return os.path.getmtime(self.path(name)) > cutoff.timestamp()
+        except FileNotFoundError:
+            return False
+
+    def delete(self, name):
+        # FieldFile.delete() : libère la référence, ou supprime un fichier antérieur au stockage
+        if name and not self.release(name):
+            super().delete(name)
+
+
+dedup_storage = DedupStorage()
+
+
+def file_fields(dedup_only=True):
+    """
+    (modèle, champ) de tous les fichiers gérés par un stockage dédoublonné,
+    ou de tous les champs fichier avec dedup_only=False
+    """
+    fields = []
+    for app_label in TRACKED_APPS:
+        for model in apps.get_app_config(app_label).get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(field, FileField) and (not dedup_only or isinstance(field.storage, DedupStorage)):
+                    fields.append((model, field))
+    return fields
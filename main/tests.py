@@ -1,3 +1,1293 @@
-from django.test import TestCase
+import json
+import os
+import runpy
+import shutil
+import tempfile
+import threading
+import zipfile
+from unittest import mock
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core import mail, signing
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed, ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import OperationalError, connection, connections
+from django.db.models import F
+from django.http import HttpResponse
+from django.templatetags.static import static
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (
+    Event, EventRegistration, Member, News, BlogArticle, SearchEntry, Archive, RequestDocument, StoredFile, Contest,
+    Project, GalleryAlbum, Gallery, Contact, Candidate, CacheVersion,
+)
+from .utils import generate_ticket
+from .certificate_utils import generate_certificate
+from .ticket_utils import make_ticket_token, read_ticket_token
+from .analytics import event_attendance
+from .importers import RegistrationImporter, MemberImporter, XlsxNumber, parse_date
+from .search import search, rebuild_index
+from .pagination import encode_cursor
+from .facets import archive_facets, blog_facets
+from .slugs import allocate_slug, assign_slugs
+from . import extraction, slugs
+from .metrics import registry, percentile
+from .middleware import QueryRepeatDetector, ReplicaRoutingMiddleware, query_shape
+from .routers import ReplicaRouter
+from .seeding import seed
+from .storage import blob_name, content_hash, dedup_storage
+from .benchmark import run_benchmarks, compare
+from .db_tuning import current_pragmas
+from .flags import MAX_BYTES, ItemFlags
+from .staticfiles import MinifiedStaticFilesStorage, minify_css
+from .registrations import (
+    register_participant, confirm_participant, cancel_registration, send_tickets,
+    CONFIRMED, WAITLISTED, DUPLICATE,
+)
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def create_event(**kwargs):
+    """Crée un événement ouvert aux inscriptions pour les tests"""
+    defaults = {
+        'title_fr': "Séminaire de test",
+        'title_en': "Test seminar",
+        'description_fr': "Description",
+        'description_en': "Description",
+        'date_event': timezone.now() + timezone.timedelta(days=10),
+        'location': "CUTI",
+        'registration_deadline': timezone.now() + timezone.timedelta(days=5),
+    }
+    defaults.update(kwargs)
+    return Event.objects.create(**defaults)
+
+
+def create_registration(event, email="participant@example.com", **kwargs):
+    defaults = {
+        'nom_prenom': "Participant Test",
+        'telephone': "612345678",
+        'promotion': "L3",
+        'is_confirmed': True,
+    }
+    defaults.update(kwargs)
+    return EventRegistration.objects.create(event=event, email=email, **defaults)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class PdfGenerationTests(TestCase):
+    """Génération des tickets et attestations avec QR vectoriel"""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.registration = create_registration(create_event())
+
+    def test_generate_ticket(self):
+        generate_ticket(self.registration)
+        self.registration.refresh_from_db()
+        with self.registration.ticket_pdf.open('rb') as f:
+            self.assertTrue(f.read(5).startswith(b'%PDF'))
+
+    def test_generate_certificate(self):
+        generate_certificate(self.registration)
+        self.registration.refresh_from_db()
+        self.assertTrue(self.registration.certificate_pdf.name.endswith('.pdf'))
+
+
+class CheckinTests(TestCase):
+    """API de contrôle des tickets à l'entrée"""
+
+    def setUp(self):
+        self.staff = User.objects.create_user('staff', password='pass', is_staff=True)
+        self.client.force_login(self.staff)
+        self.event = create_event()
+        self.registration = create_registration(self.event)
+
+    def checkin_url(self, registration):
+        return reverse('admin_checkin_ticket', kwargs={'pk': registration.event_id, 'uuid': registration.uuid})
+
+    def test_checkin_rejects_double_entry(self):
+        response = self.client.post(self.checkin_url(self.registration))
+        self.assertEqual(response.json()['status'], 'checked_in')
+        self.registration.refresh_from_db()
+        self.assertIsNotNone(self.registration.checked_in_at)
+
+        response = self.client.post(self.checkin_url(self.registration))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['status'], 'already_checked_in')
+
+    def test_checkin_rejects_other_event(self):
+        other = create_registration(create_event(), email="other@example.com")
+        url = reverse('admin_checkin_ticket', kwargs={'pk': self.event.pk, 'uuid': other.uuid})
+        response = self.client.post(url)
+        self.assertEqual(response.json()['status'], 'wrong_event')
+
+    def test_offline_sync(self):
+        second = create_registration(self.event, email="second@example.com")
+        manifest = self.client.get(reverse('admin_checkin_manifest', kwargs={'pk': self.event.pk})).json()
+        self.assertEqual(len(manifest['tickets']), 2)
+
+        self.client.post(self.checkin_url(second))
+        stranger = create_registration(create_event(), email="x@example.com")
+        payload = {
+            'signature': manifest['signature'],
+            'checkins': [
+                {'uuid': str(self.registration.uuid), 'at': timezone.now().isoformat()},
+                {'uuid': str(second.uuid)},
+                {'uuid': str(stranger.uuid)},
+                {'uuid': 'pas-un-uuid'},
+                {'uuid': str(second.uuid), 'at': '2024-02-30T10:00:00'},
+                {'uuid': str(second.uuid), 'at': 12},
+            ],
+        }
+        url = reverse('admin_checkin_sync', kwargs={'pk': self.event.pk})
+        response = self.client.post(url, data=json.dumps(payload), content_type='application/json').json()
+        self.assertEqual(response['accepted'], [str(self.registration.uuid)])
+        self.assertEqual(response['duplicates'], [str(second.uuid)])
+        self.assertEqual(response['unknown'], [])
+        self.assertEqual(response['rejected'], [
+            {'index': 2, 'uuid': str(stranger.uuid), 'reason': 'not_in_manifest'},
+            {'index': 3, 'uuid': 'pas-un-uuid', 'reason': 'invalid_uuid'},
+        ])
+
+        # Sans manifeste signé, le lot est refusé
+        del payload['signature']
+        response = self.client.post(url, data=json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class TicketTokenTests(TestCase):
+    """Jetons signés encodés dans les QR codes des tickets"""
+
+    def setUp(self):
+        self.event = create_event()
+        self.registration = create_registration(self.event)
+
+    def test_token_round_trip(self):
+        token = make_ticket_token(self.registration)
+        with self.assertNumQueries(0):
+            ticket = read_ticket_token(token)
+        self.assertEqual(ticket['registration_id'], self.registration.pk)
+        self.assertEqual(ticket['event_id'], self.event.pk)
+
+    def test_tampered_token_is_rejected(self):
+        token = make_ticket_token(self.registration)
+        with self.assertRaises(signing.BadSignature):
+            read_ticket_token(token[:-2] + ('AA' if not token.endswith('AA') else 'BB'))
+
+    def test_expired_token_is_rejected(self):
+        self.event.date_event = timezone.now() - timezone.timedelta(days=3)
+        token = make_ticket_token(self.registration)
+        with self.assertRaises(signing.SignatureExpired):
+            read_ticket_token(token)
+
+    def test_verify_view_does_not_query(self):
+        url = reverse('ticket_verify_token', kwargs={'token': make_ticket_token(self.registration)})
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertContains(response, 'Ticket Valide')
+
+    def test_staff_checkin_with_token(self):
+        staff = User.objects.create_user('staff', password='pass', is_staff=True)
+        self.client.force_login(staff)
+        url = reverse('admin_checkin_token', kwargs={
+            'pk': self.event.pk, 'token': make_ticket_token(self.registration),
+        })
+        self.assertEqual(self.client.post(url).json()['status'], 'checked_in')
+        self.assertEqual(self.client.post(url).json()['status'], 'already_checked_in')
+
+
+class AttendanceAnalyticsTests(TestCase):
+    """Statistiques de présence par événement"""
+
+    def test_event_attendance(self):
+        from django.core.cache import cache
+        cache.clear()
+        event = create_event()
+        start = timezone.now().replace(second=0, microsecond=0)
+        create_registration(event, email="a@example.com", promotion="L1", checked_in_at=start)
+        create_registration(event, email="b@example.com", promotion="L1", checked_in_at=start + timezone.timedelta(seconds=20))
+        create_registration(event, email="c@example.com", promotion="L2", checked_in_at=start + timezone.timedelta(minutes=5))
+        create_registration(event, email="d@example.com", promotion="L2")
+
+        with self.assertNumQueries(3):
+            data = event_attendance(event)
+        self.assertEqual(data['present'], 3)
+        self.assertEqual(data['registered'], 4)
+        self.assertEqual(data['peak_count'], 2)
+        self.assertEqual([p['cumulative'] for p in data['arrival_curve']], [2, 3])
+        self.assertEqual({r['promotion']: r['no_show_rate'] for r in data['by_promotion']}, {'L1': 0, 'L2': 50.0})
+
+        with self.assertNumQueries(0):
+            event_attendance(event)
+
+    def test_attendance_invalidated_on_changes(self):
+        cache.clear()
+        staff = User.objects.create_user('staff', password='pass', is_staff=True)
+        self.client.force_login(staff)
+        event = create_event()
+        registration = create_registration(event)
+        pending = create_registration(event, email="b@example.com", is_confirmed=False)
+        self.assertEqual(event_attendance(event)['present'], 0)
+
+        # Scan unitaire
+        self.client.post(reverse('admin_checkin_ticket', kwargs={'pk': event.pk, 'uuid': registration.uuid}))
+        self.assertEqual(event_attendance(event)['present'], 1)
+
+        # Confirmation, puis suppression
+        confirm_participant(pending)
+        self.assertEqual(event_attendance(event)['registered'], 2)
+        cancel_registration(pending)
+        self.assertEqual(event_attendance(event)['registered'], 1)
+        registration.delete()
+        self.assertEqual(event_attendance(event)['registered'], 0)
+
+    def test_registrations_page_renders_attendance(self):
+        staff = User.objects.create_user('staff', password='pass', is_staff=True)
+        self.client.force_login(staff)
+        event = create_event()
+        create_registration(event, checked_in_at=timezone.now())
+        response = self.client.get(reverse('admin_event_registrations', kwargs={'pk': event.pk}))
+        self.assertContains(response, "Courbe d'arrivée")
+
+
+def new_registration(event, email):
+    return EventRegistration(
+        event=event, email=email, nom_prenom="Participant Test", telephone="612345678", promotion="L3",
+    )
+
+
+class CapacityTests(TestCase):
+    """Réservation des places et liste d'attente"""
+
+    def test_waitlist_when_full(self):
+        event = create_event(max_participants=1)
+        self.assertEqual(register_participant(new_registration(event, "a@example.com")), CONFIRMED)
+        self.assertEqual(register_participant(new_registration(event, "b@example.com")), WAITLISTED)
+        self.assertEqual(register_participant(new_registration(event, "b@example.com")), DUPLICATE)
+        event.refresh_from_db()
+        self.assertEqual(event.confirmed_count, 1)
+        self.assertTrue(event.is_full)
+
+    def test_cancel_promotes_waitlist(self):
+        event = create_event(max_participants=1)
+        first = new_registration(event, "a@example.com")
+        register_participant(first)
+        register_participant(new_registration(event, "b@example.com"))
+
+        promoted = cancel_registration(first)
+        self.assertEqual(promoted.email, "b@example.com")
+        promoted.refresh_from_db()
+        self.assertTrue(promoted.is_confirmed)
+        self.assertFalse(promoted.is_waitlisted)
+        event.refresh_from_db()
+        self.assertEqual(event.confirmed_count, 1)
+
+    def test_counters_follow_registrations(self):
+        event = create_event(max_participants=2)
+        first = new_registration(event, "a@example.com")
+        register_participant(first)
+        register_participant(new_registration(event, "b@example.com"))
+        register_participant(new_registration(event, "c@example.com"))
+        event.refresh_from_db()
+        self.assertEqual((event.confirmed_count, event.pending_count), (2, 1))
+
+        cancel_registration(first)
+        event.refresh_from_db()
+        self.assertEqual((event.confirmed_count, event.pending_count), (2, 0))
+
+        event.max_participants = None
+        event.save()
+        pending = create_registration(event, email="d@example.com", is_confirmed=False)
+        event.refresh_counters()
+        self.assertTrue(confirm_participant(pending))
+        event.refresh_from_db()
+        self.assertEqual((event.confirmed_count, event.pending_count), (3, 0))
+
+    def test_recount_command_fixes_drift(self):
+        event = create_event()
+        create_registration(event, email="a@example.com")
+        create_registration(event, email="b@example.com", is_confirmed=False)
+        call_command('recount_registrations', stdout=open('/dev/null', 'w'))
+        event.refresh_from_db()
+        self.assertEqual((event.confirmed_count, event.pending_count), (1, 1))
+
+    def test_events_list_reads_counters(self):
+        staff = User.objects.create_user('staff', password='pass', is_staff=True)
+        self.client.force_login(staff)
+        for i in range(3):
+            create_registration(create_event(), email=f"p{i}@example.com")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin_events_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries if 'main_eventregistration' in q['sql']])
+
+    def test_event_detail_post_waitlists(self):
+        event = create_event(max_participants=0)
+        data = {
+            'nom_prenom': "Participant Test", 'email': "a@example.com",
+            'telephone': "612345678", 'promotion': "L3",
+        }
+        response = self.client.post(reverse('event_detail', kwargs={'pk': event.pk}), data)
+        self.assertRedirects(response, reverse('event_detail', kwargs={'pk': event.pk}))
+        self.assertTrue(EventRegistration.objects.get(event=event).is_waitlisted)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class BulkRegistrationTests(TestCase):
+    """Actions groupées sur les inscriptions"""
+
+    def setUp(self):
+        staff = User.objects.create_user('staff', password='pass', is_staff=True)
+        self.client.force_login(staff)
+        self.event = create_event(max_participants=2)
+        self.pending = [
+            create_registration(self.event, email=f"p{i}@example.com", is_confirmed=False) for i in range(3)
+        ]
+        self.event.refresh_counters()
+        self.url = reverse('admin_bulk_registrations', kwargs={'pk': self.event.pk})
+
+    def test_bulk_confirm_respects_capacity(self):
+        ids = [r.pk for r in self.pending]
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(self.url, {'action': 'confirm', 'registration_ids': ids})
+        self.assertEqual(len(callbacks), 1)
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.confirmed_count, self.event.pending_count), (2, 1))
+        self.assertEqual(EventRegistration.objects.filter(event=self.event, is_confirmed=True).count(), 2)
+
+    def test_bulk_delete_by_filter_promotes_waitlist(self):
+        EventRegistration.objects.filter(pk=self.pending[0].pk).update(is_confirmed=True)
+        EventRegistration.objects.filter(pk=self.pending[1].pk).update(is_waitlisted=True)
+        self.event.refresh_counters()
+
+        self.client.post(self.url, {'action': 'delete', 'scope': 'filter', 'status': 'confirmed'})
+        self.event.refresh_from_db()
+        self.assertFalse(EventRegistration.objects.filter(pk=self.pending[0].pk).exists())
+        self.assertTrue(EventRegistration.objects.get(pk=self.pending[1].pk).is_confirmed)
+        self.assertEqual((self.event.confirmed_count, self.event.pending_count), (1, 1))
+
+    def test_send_tickets_in_batches(self):
+        for registration in self.pending:
+            registration.is_confirmed = True
+            registration.save()
+        send_tickets([r.pk for r in self.pending])
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertTrue(all(message.attachments for message in mail.outbox))
+        self.assertFalse(EventRegistration.objects.filter(event=self.event, ticket_sent_at__isnull=True).exists())
+
+    def test_bulk_reject_is_persistent(self):
+        EventRegistration.objects.filter(pk=self.pending[0].pk).update(is_confirmed=True)
+        EventRegistration.objects.filter(pk=self.pending[1].pk).update(is_waitlisted=True)
+        self.event.refresh_counters()
+
+        ids = [self.pending[0].pk, self.pending[2].pk]
+        self.client.post(self.url, {'action': 'reject', 'registration_ids': ids})
+        self.event.refresh_from_db()
+        # La place libérée revient à la liste d'attente ; les refusées ne sont plus en attente
+        self.assertTrue(EventRegistration.objects.get(pk=self.pending[1].pk).is_confirmed)
+        self.assertEqual((self.event.confirmed_count, self.event.pending_count), (1, 0))
+        self.assertEqual(EventRegistration.objects.filter(event=self.event, is_rejected=True).count(), 2)
+
+        # Ni la confirmation groupée ni la confirmation unitaire ne les réactivent
+        self.client.post(self.url, {'action': 'confirm', 'registration_ids': ids})
+        self.client.get(reverse('admin_confirm_registration', kwargs={'pk': self.pending[2].pk}))
+        self.assertFalse(EventRegistration.objects.filter(pk__in=ids, is_confirmed=True).exists())
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.confirmed_count, self.event.pending_count), (1, 0))
+
+    def test_send_pending_tickets(self):
+        sent, lost = self.pending[:2]
+        EventRegistration.objects.filter(pk__in=[sent.pk, lost.pk]).update(
+            is_confirmed=True, registration_date=timezone.now() - timezone.timedelta(hours=1)
+        )
+        EventRegistration.objects.filter(pk=sent.pk).update(ticket_sent_at=timezone.now())
+
+        call_command('send_pending_tickets', stdout=StringIO())
+        self.assertEqual([message.to for message in mail.outbox], [[lost.email]])
+        call_command('send_pending_tickets', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+
+
+def make_xlsx(rows):
+    """Classeur XLSX minimal (chaînes en ligne, nombres en cellules numériques) pour les tests d'import"""
+    ns = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+    cells = ''.join(
+        '<row>' + ''.join(
+            f'<c r="{chr(65 + col)}{line}"><v>{value}</v></c>' if isinstance(value, (int, float)) else
+            f'<c r="{chr(65 + col)}{line}" t="inlineStr"><is><t>{value}</t></is></c>'
+            for col, value in enumerate(row)
+        ) + '</row>'
+        for line, row in enumerate(rows, start=1)
+    )
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('xl/worksheets/sheet1.xml', f'<worksheet xmlns="{ns}"><sheetData>{cells}</sheetData></worksheet>')
+    return SimpleUploadedFile('import.xlsx', buffer.getvalue())
+
+
+class ImportTests(TestCase):
+    """Import CSV / XLSX des inscriptions et des membres"""
+
+    def test_import_registrations_csv(self):
+        event = create_event(max_participants=2)
+        create_registration(event, email="deja@example.com")
+        event.refresh_counters()
+        content = (
+            "Nom Prénom;Email;Téléphone;Promotion\n"
+            "Alice;alice@example.com;600000001;L1\n"
+            "Bob;BOB@example.com;600000002;L2\n"
+            "Bob bis;bob@example.com;600000003;L2\n"
+            "Déjà;deja@example.com;600000004;L3\n"
+            "Sans email;pas-un-email;600000005;L3\n"
+        ).encode('utf-8')
+        importer = RegistrationImporter(event)
+        report = importer.run(SimpleUploadedFile('inscriptions.csv', content))
+
+        self.assertEqual((report.created, report.duplicates, report.error_count), (2, 2, 1))
+        self.assertEqual(report.errors[0]['line'], 6)
+        event.refresh_from_db()
+        self.assertEqual((event.confirmed_count, event.pending_count), (2, 1))
+        self.assertEqual(len(importer.confirmed_ids), 1)
+
+    def test_import_members_xlsx(self):
+        Member.objects.create(
+            nom_prenom="Existant", date_naissance="2000-01-01", lieu_naissance="Yaoundé",
+            telephone="600000000", email="existant@example.com", matricule="19M001",
+        )
+        upload = make_xlsx([
+            ["Nom", "Date de naissance", "Lieu de naissance", "Téléphone", "Email", "Matricule"],
+            ["Alice", "12/05/2001", "Douala", "600000001", "alice@example.com", "21M001"],
+            ["Existant", "01/01/2000", "Yaoundé", "600000000", "existant@example.com", "19M001"],
+            ["Date fausse", "32/13/2001", "Douala", "600000002", "x@example.com", "21M002"],
+        ])
+        # dédoublonnage + bulk_create dans un savepoint, puis indexation groupée dans un savepoint
+        with self.assertNumQueries(9):
+            report = MemberImporter().run(upload)
+        self.assertEqual((report.created, report.duplicates, report.error_count), (1, 1, 1))
+        self.assertEqual(str(Member.objects.get(matricule="21M001").date_naissance), "2001-05-12")
+
+    def test_import_dedupes_case_insensitively_and_reports_conflicts(self):
+        event = create_event()
+        create_registration(event, email="Deja@Example.com")
+        event.refresh_counters()
+        content = b"nom_prenom,email\nDeja,deja@example.com\nAlice,alice@example.com\nBob,bob@example.com\n"
+        importer = RegistrationImporter(event)
+        # Inscription concurrente de Bob entre le dédoublonnage et l'écriture
+        existing_keys = importer.existing_keys
+
+        def racing_existing_keys(keys):
+            found = existing_keys(keys)
+            create_registration(event, email="bob@example.com")
+            return found
+
+        importer.existing_keys = racing_existing_keys
+        report = importer.run(SimpleUploadedFile('inscriptions.csv', content))
+        self.assertEqual((report.created, report.duplicates, report.error_count), (1, 2, 0))
+        self.assertEqual(len(importer.confirmed_ids), 1)
+
+    def test_parse_date_rejects_huge_serial(self):
+        with self.assertRaises(ValidationError):
+            parse_date(XlsxNumber('1e300'))
+
+    def test_excel_serial_only_for_numeric_xlsx_cells(self):
+        header = ["Nom", "Date de naissance", "Lieu de naissance", "Téléphone", "Email", "Matricule"]
+        report = MemberImporter().run(make_xlsx([
+            header,
+            ["Alice", 37023, "Douala", "600000001", "alice@example.com", "21M001"],
+            ["Zéro", 0, "Douala", "600000002", "zero@example.com", "21M002"],
+        ]))
+        self.assertEqual((report.created, report.error_count), (1, 1))
+        self.assertEqual(str(Member.objects.get(matricule="21M001").date_naissance), "2001-05-12")
+
+        # Une année seule dans un CSV n'est pas un numéro de série
+        content = "nom,date_de_naissance,lieu_de_naissance,telephone,email\nBob,1998,Douala,600000003,bob@example.com\n"
+        report = MemberImporter().run(SimpleUploadedFile('membres.csv', content.encode()))
+        self.assertEqual((report.created, report.error_count), (0, 1))
+        self.assertIn("Date invalide : 1998", report.errors[0]['message'])
+
+
+    def test_import_view_renders_report(self):
+        staff = User.objects.create_user('staff', password='pass', is_staff=True)
+        self.client.force_login(staff)
+        event = create_event()
+        upload = SimpleUploadedFile('inscriptions.csv', b"nom_prenom,email\nAlice,alice@example.com\nBob,\n")
+        response = self.client.post(
+            reverse('admin_import_registrations', kwargs={'pk': event.pk}), {'file': upload, 'confirm': 'on'}
+        )
+        self.assertContains(response, "Rapport d'import")
+        self.assertContains(response, "Colonnes obligatoires manquantes")
+
+class SearchTests(TestCase):
+    """Recherche plein texte sur le site"""
+
+    def setUp(self):
+        self.event = create_event(title_fr="Journée de l'étudiant", description_fr="<p>Conférences et ateliers</p>")
+        self.news = News.objects.create(
+            title_fr="Résultats des élections", title_en="Election results",
+            content_fr="<p>Le nouveau bureau de l'étudiant est élu.</p>", content_en="",
+            is_published=True, publication_date=timezone.now(),
+        )
+        BlogArticle.objects.create(title="Brouillon étudiant", slug="brouillon", content="Non publié")
+
+    def test_accent_insensitive_and_ranked(self):
+        results = search("etudiant")
+        self.assertEqual(results.count(), 2)
+        # Le titre pèse plus que le contenu
+        self.assertEqual(results[0].kind, 'event')
+        self.assertEqual(search("ÉLECTION")[0].url, reverse('news_detail', kwargs={'pk': self.news.pk}))
+
+    def test_index_follows_changes(self):
+        self.news.is_published = False
+        self.news.save()
+        self.assertEqual(search("elections").count(), 0)
+        self.event.delete()
+        self.assertEqual(search("ateliers").count(), 0)
+        self.assertEqual(SearchEntry.objects.filter(kind='event').count(), 0)
+
+    def test_rebuild_and_search_view(self):
+        SearchEntry.objects.all().delete()
+        self.assertEqual(rebuild_index(), 3)
+        response = self.client.get(reverse('search'), {'q': 'etud'})
+        self.assertContains(response, "Journée de l&#x27;étudiant")
+        self.assertNotContains(response, "Brouillon")
+
+    def test_admin_member_search(self):
+        Member.objects.create(
+            nom_prenom="Hélène Ngono", date_naissance="2000-01-01", lieu_naissance="Yaoundé",
+            telephone="600000000", email="helene@example.com", matricule="20M123",
+        )
+        self.assertEqual(search("helene").count(), 0)
+        staff = User.objects.create_user('staff', password='pass', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(reverse('admin_members_list'), {'search': 'Helene'})
+        self.assertContains(response, "Hélène Ngono")
+        # Sous-chaîne au milieu d'une adresse : hors de portée d'une recherche par préfixe
+        response = self.client.get(reverse('admin_members_list'), {'search': 'lene@example'})
+        self.assertContains(response, "Hélène Ngono")
+        # Index filtré par les autres critères de la page
+        Member.objects.create(
+            nom_prenom="Hélène Mballa", date_naissance="2000-01-01", lieu_naissance="Douala",
+            telephone="600000001", email="mballa@example.com", matricule="20M124", member_type='bureau',
+        )
+        response = self.client.get(reverse('admin_members_list'), {'search': 'helene', 'type': 'bureau'})
+        self.assertContains(response, "Hélène Mballa")
+        self.assertNotContains(response, "Hélène Ngono")
+
+
+class ArchivesListTests(TestCase):
+    """Pagination par clé et filtres de la page des archives"""
+
+    def setUp(self):
+        cache.clear()
+        for i in range(30):
+            Archive.objects.create(
+                title=f"PV {i}", file='archives/pv.pdf', level='L3' if i % 3 else 'M1',
+                academic_year='2023-2024' if i < 20 else '2022-2023',
+            )
+
+    def test_keyset_pages_cover_everything_once(self):
+        expected = list(Archive.objects.order_by('-academic_year', '-created_at', '-pk').values_list('pk', flat=True))
+        seen, params = [], {}
+        while True:
+            response = self.client.get(reverse('archives'), params)
+            page = response.context['page']
+            seen.extend(archive.pk for archive in page)
+            if not page.has_next:
+                break
+            params = {'after': page.next_cursor}
+        self.assertEqual(seen, expected)
+
+        # Retour à la page précédente depuis la seconde page
+        response = self.client.get(reverse('archives'), {'before': page.previous_cursor})
+        self.assertEqual([archive.pk for archive in response.context['page']], expected[:24])
+        self.assertFalse(response.context['page'].has_previous)
+
+    def test_filters_kept_in_pagination_links(self):
+        response = self.client.get(reverse('archives'), {'level': 'L3'})
+        self.assertTrue(all(archive.level == 'L3' for archive in response.context['archives']))
+        self.assertEqual(response.context['filter_query'], 'level=L3')
+        self.assertFalse(response.context['page'].has_next)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        response = self.client.get(reverse('archives'), {'after': 'not-a-cursor'})
+        self.assertEqual(len(response.context['archives']), 24)
+        # Curseurs bien formés mais aux valeurs du mauvais type
+        for values in (['x', 'y', 'z'], ['2023-2024', {'a': 1}, [2]], ['2023-2024', '2024-01-01', 'abc'], [None, None, 1]):
+            cursor = encode_cursor(values)
+            for param in ('after', 'before'):
+                response = self.client.get(reverse('archives'), {param: cursor})
+                self.assertEqual(response.status_code, 200)
+
+    def test_facet_counts_cached_and_invalidated(self):
+        facets = archive_facets({'level': 'M1'})
+        # Chaque dimension est comptée sous les filtres des autres dimensions
+        self.assertEqual(facets['level'], {'L3': 20, 'M1': 10})
+        self.assertEqual(facets['year'], {'2023-2024': 7, '2022-2023': 3})
+        # En cache : seule la version partagée est lue
+        with self.assertNumQueries(1):
+            archive_facets({'level': 'M1', 'year': ''})
+        # Les compteurs de vues ne modifient pas les facettes
+        archive = Archive.objects.filter(level='M1').first()
+        archive.views_count += 1
+        archive.save(update_fields=['views_count'])
+        with self.assertNumQueries(1):
+            archive_facets({'level': 'M1'})
+        archive.delete()
+        self.assertEqual(archive_facets({'level': 'M1'})['level']['M1'], 9)
+        # Modification traitée par un autre worker : le cache local reste, seule la version en base change
+        Archive.objects.filter(pk=Archive.objects.filter(level='M1').first().pk).update(level='L3')
+        self.assertEqual(archive_facets({'level': 'M1'})['level']['M1'], 9)
+        CacheVersion.objects.filter(name='facets:archive').update(version=F('version') + 1)
+        self.assertEqual(archive_facets({'level': 'M1'})['level']['M1'], 8)
+
+        response = self.client.get(reverse('archives'), {'year': '2022-2023'})
+        self.assertContains(response, "Licence 3 (7)")
+        self.assertContains(response, "2023-2024 (19)")
+
+    def test_blog_category_counts(self):
+        BlogArticle.objects.create(title="Stage", slug="stage", content="x", category='stage', is_published=True)
+        BlogArticle.objects.create(title="Brouillon", slug="brouillon", content="x", category='stage')
+        self.assertEqual(blog_facets({})['category'], {'stage': 1})
+        BlogArticle.objects.create(title="Tuto", slug="tuto", content="x", category='tuto', is_published=True)
+        response = self.client.get(reverse('blog_list'))
+        self.assertEqual(response.context['total_count'], 2)
+        self.assertIn(('tuto', 'Tutoriel', 1), response.context['categories'])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class MediaDeliveryTests(TestCase):
+    """Téléchargement des archives : Range, ETag et envoi par le serveur web"""
+
+    def setUp(self):
+        self.archive = Archive.objects.create(
+            title="PV L3", level='L3',
+            file=SimpleUploadedFile("pv.pdf", b"0123456789" * 100, content_type='application/pdf'),
+        )
+        self.url = reverse('archive_download', kwargs={'slug': self.archive.slug})
+
+    def test_full_download_then_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b"0123456789" * 100)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.archive.refresh_from_db()
+        self.assertEqual(self.archive.downloads_count, 1)
+
+    def test_missing_file_returns_404(self):
+        os.remove(self.archive.file.path)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_range_requests(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b"0123456789")
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1000')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(response.streaming_content), b"56789")
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=5000-').status_code, 416)
+        # Intervalle inversé : en-tête ignoré, envoi complet
+        response = self.client.get(self.url, HTTP_RANGE='bytes=5-2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], '1000')
+        # Fichier modifié depuis : If-Range périmé, envoi complet
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"perime"')
+        self.assertEqual(response.status_code, 200)
+
+        self.archive.refresh_from_db()
+        self.assertEqual(self.archive.downloads_count, 2)
+
+    async def test_asgi_streams_asynchronously(self):
+        response = await self.async_client.get(self.url)
+        self.assertTrue(response.is_async)
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), b"0123456789" * 100)
+        response = await self.async_client.get(self.url, headers={'Range': 'bytes=10-19'})
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), b"0123456789")
+
+    @override_settings(MEDIA_SENDFILE_BACKEND='x-accel-redirect', MEDIA_ACCEL_PREFIX='/protected-media/')
+    def test_x_accel_redirect(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + self.archive.file.name)
+        self.assertEqual(response.content, b'')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class DedupStorageTests(TestCase):
+    """Stockage adressé par le contenu et suppression des fichiers orphelins"""
+
+    def upload(self, content=b"%PDF-1.4 pv"):
+        return SimpleUploadedFile("PV.pdf", content, content_type='application/pdf')
+
+    def test_same_content_stored_once(self):
+        first = Archive.objects.create(title="PV 2023", level='L3', file=self.upload())
+        second = Archive.objects.create(title="PV 2024", level='L3', file=self.upload())
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertTrue(first.file.name.startswith('blobs/'))
+        self.assertEqual(StoredFile.objects.get(name=first.file.name).refs, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(os.path.exists(second.file.path))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(os.path.exists(second.file.path))
+        self.assertFalse(StoredFile.objects.exists())
+
+    def test_replaced_file_released(self):
+        document = RequestDocument.objects.create(title="Relevé", file=self.upload(b"v1"))
+        old_path = document.file.path
+        document.file = self.upload(b"v2")
+        with self.captureOnCommitCallbacks(execute=True):
+            document.save()
+        self.assertFalse(os.path.exists(old_path))
+        self.assertEqual(list(StoredFile.objects.values_list('name', 'refs')), [(document.file.name, 1)])
+
+        # Téléchargement sous un nom lisible
+        response = self.client.get(reverse('download_document', kwargs={'pk': document.pk}))
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="releve.pdf"')
+
+    def test_gc_media_recounts_and_removes_orphans(self):
+        archive = Archive.objects.create(title="PV", level='L3', file=self.upload())
+        StoredFile.objects.filter(name=archive.file.name).update(refs=5)
+        Archive.objects.filter(pk=archive.pk).update(file='')
+        # Fichier récent : peut-être un envoi en cours, conservé pendant le délai de grâce
+        call_command('gc_media', stdout=StringIO())
+        self.assertTrue(os.path.exists(archive.file.path))
+        call_command('gc_media', grace=0, stdout=StringIO())
+        self.assertFalse(StoredFile.objects.exists())
+        self.assertFalse(os.path.exists(archive.file.path))
+
+    def test_gallery_image_and_preview_released(self):
+        photo = Gallery.objects.create(title_fr="Photo", title_en="Photo", image=self.upload(b"photo"))
+        path = photo.image.path
+        with self.captureOnCommitCallbacks(execute=True):
+            photo.delete()
+        self.assertFalse(os.path.exists(path))
+
+        archive = Archive.objects.create(title="PV", level='L3', file=self.upload())
+        archive.preview.save('pv.jpg', ContentFile(b"preview 1"), save=False)
+        archive.save(update_fields=['preview'])
+        old_preview = archive.preview.path
+        # Nouvel aperçu (réextraction) : l'ancien est libéré
+        archive.preview.save('pv.jpg', ContentFile(b"preview 2"), save=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            archive.save(update_fields=['preview'])
+        self.assertFalse(os.path.exists(old_preview))
+        paths = [archive.file.path, archive.preview.path]
+        with self.captureOnCommitCallbacks(execute=True):
+            archive.delete()
+        self.assertFalse(any(os.path.exists(path) for path in paths))
+
+    def test_default_storage_untouched(self):
+        # Envois CKEditor et images : stockage par défaut, hors du ramasse-miettes
+        name = default_storage.save('uploads/photo.png', ContentFile(b"png"))
+        self.assertTrue(name.startswith('uploads/'))
+        call_command('gc_media', grace=0, stdout=StringIO())
+        self.assertTrue(default_storage.exists(name))
+        self.assertFalse(StoredFile.objects.exists())
+
+    def test_concurrent_write_of_same_blob(self):
+        name = blob_name(content_hash(self.upload())[0], 'PV.pdf')
+        dedup_storage.save(name, ContentFile(b"%PDF-1.4 pv"))
+        # Écrit par un autre processus entre exists() et l'écriture : pas de boucle sans fin
+        with mock.patch.object(dedup_storage, 'exists', side_effect=[False, True]):
+            self.assertEqual(dedup_storage.save('PV.pdf', self.upload()), name)
+        self.assertEqual(StoredFile.objects.get(name=name).refs, 2)
+
+
+def make_pdf(pages):
+    """PDF de test : une page par texte, avec une image sur la première (PV scanné)"""
+    from PIL import Image
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for index, text in enumerate(pages):
+        if index == 0:
+            pdf.drawImage(ImageReader(Image.new('RGB', (40, 60), 'red')), 100, 500, width=200, height=300)
+        pdf.drawString(100, 400, text)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ArchiveExtractionTests(TestCase):
+    """Extraction du texte et de l'aperçu des archives PDF"""
+
+    def test_extraction_feeds_search_and_preview(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            archive = Archive.objects.create(title="PV Session normale", level='L3', file=SimpleUploadedFile(
+                "pv.pdf", make_pdf(["Proces verbal de deliberation", "Moyenne generale 14,5"]),
+            ))
+        # Extraction programmée en tâche de fond après validation
+        self.assertEqual(len(callbacks), 1)
+
+        call_command('extract_archives', stdout=StringIO())
+        archive.refresh_from_db()
+        self.assertIn("Moyenne generale", archive.text_content)
+        self.assertEqual(archive.extracted_file, archive.file.name)
+        self.assertTrue(archive.preview.name.endswith('.jpg'))
+        self.assertEqual(search("deliberation")[0].object_id, archive.pk)
+
+        response = self.client.get(reverse('archive_detail', kwargs={'slug': archive.slug}))
+        self.assertContains(response, archive.preview.url)
+
+    def test_invalid_pdf_marked_as_processed(self):
+        archive = Archive.objects.create(title="Corrompu", level='L3', file=SimpleUploadedFile("x.pdf", b"not a pdf"))
+        call_command('extract_archives', stdout=StringIO())
+        archive.refresh_from_db()
+        self.assertEqual(archive.text_content, '')
+        self.assertEqual(archive.extracted_file, archive.file.name)
+        self.assertTrue(archive.extraction_failed)
+
+    def test_unexpected_error_does_not_stop_the_batch(self):
+        broken = Archive.objects.create(title="Piégé", level='L3', file=SimpleUploadedFile("a.pdf", make_pdf(["A"])))
+        fine = Archive.objects.create(title="Normal", level='L3', file=SimpleUploadedFile("b.pdf", make_pdf(["Texte B"])))
+        real_extract = extraction.extract_text
+
+        def extract_text(path, **kwargs):
+            if path == broken.file.path:
+                raise RecursionError("PDF piégé")
+            return real_extract(path, **kwargs)
+
+        with mock.patch.object(extraction, 'extract_text', extract_text):
+            call_command('extract_archives', stdout=StringIO())
+        broken.refresh_from_db()
+        fine.refresh_from_db()
+        self.assertTrue(broken.extraction_failed)
+        self.assertEqual(broken.extracted_file, broken.file.name)
+        self.assertIn("Texte B", fine.text_content)
+        self.assertFalse(fine.extraction_failed)
+
+
+class SlugAllocationTests(TestCase):
+    """Slugs uniques alloués en une requête"""
+
+    def test_next_suffix_in_one_query(self):
+        slugs_created = [Archive.objects.create(title="PV de délibération", level='L3', file='a.pdf').slug for _ in range(3)]
+        self.assertEqual(slugs_created, ['pv-de-deliberation', 'pv-de-deliberation-1', 'pv-de-deliberation-2'])
+        # Un slug qui commence pareil sans suffixe numérique n'est pas compté
+        Archive.objects.create(title="PV", slug='pv-de-deliberation-l3', level='L3', file='a.pdf')
+        with self.assertNumQueries(1):
+            self.assertEqual(allocate_slug(Archive, "PV de délibération"), 'pv-de-deliberation-3')
+
+    def test_reslug_ignores_own_slug(self):
+        article = BlogArticle.objects.create(title="Stage", content="x")
+        BlogArticle.objects.create(title="Stage", content="x")
+        other = BlogArticle.objects.get(slug='stage-1')
+        # Le slug de l'objet lui-même n'est pas une collision : il le conserve
+        self.assertEqual(allocate_slug(BlogArticle, "Stage", exclude_pk=article.pk), 'stage')
+        self.assertEqual(allocate_slug(BlogArticle, "Stage", exclude_pk=other.pk), 'stage-1')
+        self.assertEqual(allocate_slug(BlogArticle, "Stage"), 'stage-2')
+
+    def test_bulk_assignment(self):
+        BlogArticle.objects.create(title="Stage", content="x")
+        articles = [BlogArticle(title="Stage", content="x") for _ in range(3)] + [BlogArticle(title="Master", content="x")]
+        with self.assertNumQueries(2):
+            assign_slugs(articles)
+        self.assertEqual([a.slug for a in articles], ['stage-1', 'stage-2', 'stage-3', 'master'])
+
+    def test_retry_after_concurrent_insert(self):
+        now = timezone.now()
+        Contest.objects.create(title="Miss Master", start_date=now, end_date=now)
+        real_allocate = slugs.allocate_slug
+        # La première allocation renvoie un slug pris entre-temps par une autre requête
+        with mock.patch.object(slugs, 'allocate_slug', side_effect=['miss-master', real_allocate(Contest, "Miss Master")]):
+            contest = Contest.objects.create(title="Miss Master", start_date=now, end_date=now)
+        self.assertEqual(contest.slug, 'miss-master-1')
+
+
+class StaticPipelineTests(SimpleTestCase):
+    """collectstatic : CSS minifiés, noms hachés, variantes compressées et cache d'un an"""
+
+    def test_post_process_and_serving(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        storage = MinifiedStaticFilesStorage(location=root, base_url='/static/')
+        names = ['css/main.css']
+        for name in names:
+            with open(os.path.join(settings.BASE_DIR, 'static', name), 'rb') as f:
+                storage.save(name, f)
+        list(storage.post_process({name: (storage, name) for name in names}, dry_run=False))
+
+        with override_settings(STATIC_ROOT=root, DEBUG=False):
+            url = static('css/main.css')
+            self.assertRegex(url, r'^/static/css/main\.[0-9a-f]{12}\.css$')
+            response = Client().get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('immutable', response['Cache-Control'])
+        css = storage.open(url[len('/static/'):]).read().decode()
+        self.assertNotIn('/*', css)
+        self.assertEqual(minify_css('a , b {\n  color:  red ;\n}\n/* x */'), 'a,b{color:red}')
+
+
+class ServerConfigTests(SimpleTestCase):
+    """Configuration de Gunicorn dérivée du nombre de processeurs"""
+
+    def test_gunicorn_config(self):
+        path = os.path.join(settings.BASE_DIR, 'gunicorn.conf.py')
+        with mock.patch('os.sched_getaffinity', return_value={0, 1}), mock.patch.dict(os.environ, {}, clear=True):
+            config = runpy.run_path(path)
+        self.assertEqual((config['workers'], config['worker_class'], config['threads']), (5, 'gthread', 4))
+        self.assertTrue(config['preload_app'])
+        self.assertGreater(config['max_requests_jitter'], 0)
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '2'}):
+            self.assertEqual(runpy.run_path(path)['workers'], 2)
+
+
+class ReplicaRoutingTests(SimpleTestCase):
+    """Lectures publiques sur la réplique, base principale après un POST ou une écriture"""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.seen = []
+
+    def view(self, request):
+        self.seen.append(self.router.db_for_read(Event))
+        if request.GET.get('write'):
+            self.router.db_for_write(Event)
+            self.seen.append(self.router.db_for_read(Event))
+        return HttpResponse()
+
+    def test_routing(self):
+        factory = RequestFactory()
+        with self.assertRaises(MiddlewareNotUsed):
+            ReplicaRoutingMiddleware(self.view)
+
+        with mock.patch.dict(settings.DATABASES, replica=settings.DATABASES['default']):
+            middleware = ReplicaRoutingMiddleware(self.view)
+        middleware(factory.get('/evenements/'))
+        middleware(factory.get('/dashboard/'))
+        middleware(factory.get('/evenements/', {'write': 1}))
+        response = middleware(factory.post('/concours/vote/'))
+        request = factory.get('/evenements/')
+        request.COOKIES[ReplicaRoutingMiddleware.COOKIE_NAME] = response.cookies[ReplicaRoutingMiddleware.COOKIE_NAME].value
+        middleware(request)
+
+        self.assertEqual(self.seen, ['replica', None, 'replica', None, None, None])
+        self.assertIsNone(self.router.db_for_read(Event))
+
+
+@override_settings(METRICS_TOKEN='secret')
+class ProfilingTests(TestCase):
+    """Mesures par route du middleware de profilage"""
+
+    def setUp(self):
+        registry.reset()
+
+    def test_request_measured_per_route(self):
+        response = self.client.get(reverse('archives'))
+        self.assertIn('db;dur=', response['Server-Timing'])
+        stats = registry.snapshot()['archives']
+        self.assertEqual(stats['count'], 1)
+        self.assertGreater(stats['db_queries'][0.5], 0)
+        self.assertGreater(stats['template_time'][0.95], 0)
+        self.assertEqual(stats['response_size'][0.5], len(response.content))
+        self.assertEqual(percentile(list(range(1, 101)), 0.95), 95)
+
+    def test_prometheus_export_and_dashboard(self):
+        self.client.get(reverse('archives'))
+        url = reverse('admin_metrics_export')
+        self.assertEqual(self.client.get(url).status_code, 401)
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer secret')
+        self.assertContains(response, 'comsas_request_duration_seconds{view="archives",quantile="0.95"}')
+        self.assertContains(response, 'comsas_request_db_queries_count{view="archives"} 1')
+
+        staff = User.objects.create_user('staff', password='pass', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(reverse('admin_performance'))
+        self.assertContains(response, '<code>archives</code>')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class HealthCheckTests(TestCase):
+    """Sondes /healthz et /readyz : sans session, sans mesure"""
+
+    def setUp(self):
+        registry.reset()
+
+    def test_liveness_without_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/healthz')
+        self.assertEqual(response.content, b'ok')
+        self.assertNotIn('sessionid', response.cookies)
+        self.assertEqual(registry.snapshot(), {})
+
+    def test_readiness(self):
+        response = self.client.get('/readyz')
+        self.assertEqual(response.status_code, 200)
+        checks = response.json()['checks']
+        self.assertEqual(set(checks), {'database', 'cache', 'media', 'backlog'})
+        self.assertEqual(checks['backlog']['pending_archives'], 0)
+
+        with override_settings(MEDIA_ROOT=os.path.join(MEDIA_ROOT, 'absent')):
+            response = self.client.get('/readyz')
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.json()['checks']['media']['ok'])
+        self.assertEqual(registry.snapshot(), {})
+
+
+class ItemFlagsTests(TestCase):
+    """Vues, j'aime et votes des visiteurs : drapeaux en cookie, aucune session en base"""
+
+    def test_bitset_encoding(self):
+        flags = ItemFlags()
+        for pk in (3, 700, 9):
+            flags.add('viewed_archive', pk)
+        flags.add('liked_article', 1)
+        decoded = ItemFlags(flags.encode())
+        self.assertTrue(all(decoded.has('viewed_archive', pk) for pk in (3, 9, 700)))
+        self.assertFalse(decoded.has('viewed_archive', 4) or decoded.has('liked_archive', 3))
+        self.assertLess(len(flags.encode()), 130)
+        self.assertFalse(ItemFlags('vr1.@@|zz').has('viewed_archive', 8))
+
+        # Au-delà de MAX_BYTES, les plus petits identifiants sont oubliés
+        flags.add('viewed_archive', 8 * MAX_BYTES + 100)
+        self.assertFalse(flags.has('viewed_archive', 3))
+        self.assertTrue(flags.has('viewed_archive', 700))
+
+    def test_anonymous_browsing_creates_no_session(self):
+        archive = Archive.objects.create(title="PV L3", level='L3')
+        now = timezone.now()
+        contest = Contest.objects.create(title="Miss", start_date=now - timezone.timedelta(days=1),
+                                         end_date=now + timezone.timedelta(days=1))
+        candidate = Candidate.objects.create(contest=contest, name="Candidate", description="-", status='approved')
+
+        self.client.get(reverse('archive_detail', args=[archive.slug]))
+        self.client.get(reverse('archive_detail', args=[archive.slug]))
+        self.client.post(reverse('archive_like', args=[archive.slug]))
+        response = self.client.post(reverse('archive_like', args=[archive.slug]))
+        self.assertFalse(response.json()['success'])
+        archive.refresh_from_db()
+        self.assertEqual((archive.views_count, archive.likes_count), (1, 1))
+
+        response = self.client.get(reverse('contest_detail', args=[contest.slug]))
+        self.assertFalse(response.context['has_voted'])
+        self.client.post(reverse('vote_candidate', args=[contest.slug, candidate.pk]),
+                         json.dumps({'email': 'v@example.com', 'matricule': '21T0001'}), content_type='application/json')
+        response = self.client.get(reverse('contest_detail', args=[contest.slug]))
+        self.assertTrue(response.context['has_voted'])
+
+        self.assertNotIn('sessionid', self.client.cookies)
+        self.assertFalse(Session.objects.exists())
+
+
+# Nombre maximal de requêtes SQL par page : (nom de route, objet passé en argument, plafond).
+# Les plafonds ne dépendent pas du volume de données ; une requête par ligne les dépasse.
+PUBLIC_QUERY_BUDGETS = [
+    ('home', None, 7), ('search', None, 4), ('about', None, 6), ('mandate', None, 4),
+    ('members', None, 9), ('member_profile', 'member', 3), ('member_registration', None, 2),
+    ('projects', None, 5), ('project_detail', 'project', 3), ('events', None, 4), ('event_detail', 'event', 3),
+    ('event_registration_success', 'registration', 4), ('news', None, 4), ('news_detail', 'news', 4),
+    ('gallery', None, 4), ('gallery_detail', 'album', 4), ('donations', None, 2), ('contact', None, 2),
+    ('sponsorship_home', None, 3), ('register_mentor', None, 3), ('register_mentee', None, 3),
+    ('list_mentors', None, 4), ('list_matches', None, 4), ('contest_list', None, 4), ('contest_detail', 'contest', 3),
+    ('request_documents', None, 3), ('archives', None, 6), ('archive_detail', 'archive', 11),
+    ('department_professors', None, 3), ('department_classrooms', None, 3), ('department_delegates', None, 3),
+    ('blog_list', None, 5), ('blog_detail', 'article', 10), ('ticket_verify', 'registration', 3),
+]
+
+DASHBOARD_QUERY_BUDGETS = [
+    ('admin_dashboard_home', None, 17), ('admin_members_list', None, 7), ('admin_member_create', None, 5),
+    ('admin_member_detail', 'member', 6), ('admin_member_edit', 'member', 6), ('admin_projects_list', None, 7),
+    ('admin_project_detail', 'project', 6), ('admin_project_edit', 'project', 6), ('admin_events_list', None, 7),
+    ('admin_event_create', None, 5), ('admin_event_edit', 'event', 6), ('admin_event_registrations', 'event', 11),
+    ('admin_event_certificates', 'event', 9), ('admin_event_badges', 'event', 10),
+    ('admin_checkin_manifest', 'event', 6), ('admin_news_list', None, 7), ('admin_news_edit', 'news', 8),
+    ('admin_gallery_list', None, 7), ('admin_messages_list', None, 7), ('admin_message_detail', 'contact', 7),
+    ('admin_sponsorship_home', None, 11), ('admin_sponsorship_mentors', None, 7),
+    ('admin_sponsorship_mentees', None, 7), ('admin_sponsorship_matches', None, 7), ('admin_site_settings', None, 6),
+    ('admin_performance', None, 5), ('admin_contests_home', None, 8), ('admin_contest_detail', 'contest', 8),
+    ('admin_contest_edit', 'contest', 7), ('admin_requests_list', None, 7), ('admin_professors_list', None, 7),
+    ('admin_classrooms_list', None, 7), ('admin_delegates_list', None, 7), ('admin_blog_list', None, 7),
+    ('admin_blog_edit', 'article', 7), ('admin_archive_list', None, 6), ('admin_archive_edit', 'archive', 6),
+]
+
+
+class QueryBudgetTests(TestCase):
+    """Plafond de requêtes SQL de chaque page publique et du tableau de bord, sur un jeu de données volumineux"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(scale=3)
+        cls.staff = User.objects.create_user('staff', password='pass', is_staff=True, is_superuser=True)
+        cls.objects = {
+            'member': Member.objects.filter(is_active=True).first(),
+            'project': Project.objects.first(),
+            'event': Event.objects.first(),
+            'news': News.objects.filter(is_published=True).first(),
+            'album': GalleryAlbum.objects.first(),
+            'contact': Contact.objects.first(),
+            'article': BlogArticle.objects.filter(is_published=True).first(),
+            'archive': Archive.objects.first(),
+            'contest': Contest.objects.first(),
+        }
+        cls.objects['registration'] = EventRegistration.objects.filter(event=cls.objects['event']).first()
+
+    def setUp(self):
+        cache.clear()
+
+    def url(self, name, key):
+        if key is None:
+            return reverse(name)
+        obj = self.objects[key]
+        if name in ('contest_detail', 'archive_detail', 'blog_detail'):
+            return reverse(name, args=[obj.slug])
+        if key == 'registration':
+            return reverse(name, args=[obj.uuid])
+        return reverse(name, args=[obj.pk])
+
+    def assert_budgets(self, budgets):
+        for name, key, budget in budgets:
+            url = self.url(name, key)
+            with self.subTest(url=url), CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(len(queries), budget, '\n'.join(q['sql'] for q in queries.captured_queries))
+
+    def test_public_pages(self):
+        self.assert_budgets(PUBLIC_QUERY_BUDGETS)
+
+    def test_dashboard_pages(self):
+        self.client.force_login(self.staff)
+        self.assert_budgets(DASHBOARD_QUERY_BUDGETS)
+
+    def test_repeated_queries_detected(self):
+        self.assertEqual(
+            query_shape("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21"),
+            "SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?",
+        )
+        detector = QueryRepeatDetector()
+        with connection.execute_wrapper(detector):
+            for archive in Archive.objects.all()[:6]:
+                archive.comments.count()
+        [(shape, count)] = detector.repeated(5)
+        self.assertIn('main_archivecomment', shape)
+        self.assertEqual(count, 6)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class BenchmarkTests(TestCase):
+    """Banc d'essai sur un petit volume : chaque scénario s'exécute sans erreur"""
+
+    def test_report(self):
+        seed(scale=0.2)
+        report = run_benchmarks(iterations=3, only=['home', 'event_detail_post', 'vote_candidate', 'pdf_ticket'])
+        self.assertEqual(set(report['scenarios']), {'home', 'event_detail_post', 'vote_candidate', 'pdf_ticket'})
+        for result in report['scenarios'].values():
+            self.assertEqual(result['errors'], 0)
+            self.assertEqual(result['iterations'], 3)
+            self.assertGreaterEqual(result['p95_ms'], result['p50_ms'])
+        [row] = compare({'scenarios': {'home': {'p95_ms': report['scenarios']['home']['p95_ms'] * 2}}},
+                        {'scenarios': {'home': report['scenarios']['home']}})
+        self.assertEqual(row[3], -50.0)
+
+
+class DatabaseTuningTests(TestCase):
+    """Réglages appliqués à chaque nouvelle connexion SQLite"""
+
+    def test_sqlite_pragmas(self):
+        path = os.path.join(tempfile.mkdtemp(), 'tuning.sqlite3')
+        wrapper = connections['default'].__class__(dict(connection.settings_dict, NAME=path), alias='tuning')
+        try:
+            self.assertEqual(current_pragmas(wrapper), {
+                'journal_mode': 'wal', 'busy_timeout': 5000, 'synchronous': 1, 'mmap_size': 256 * 1024 * 1024,
+            })
+            with override_settings(SQLITE_TUNING_ENABLED=False):
+                wrapper.close()
+                self.assertEqual(current_pragmas(wrapper)['synchronous'], 2)
+        finally:
+            wrapper.close()
+            shutil.rmtree(os.path.dirname(path))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class SeedCommandTests(TestCase):
+    """Jeu de données généré : compteurs dénormalisés cohérents, pas de double génération"""
+
+    def test_seed_consistent_data(self):
+        call_command('seed', scale=0.5, stdout=StringIO())
+        self.assertEqual(Member.objects.count(), 20)
+        for event in Event.objects.all():
+            self.assertEqual(event.confirmed_count, event.eventregistration_set.filter(is_confirmed=True).count())
+        for candidate in Candidate.objects.all():
+            self.assertEqual(candidate.votes_count, candidate.vote_set.count())
+        pdf = Archive.objects.first().file.name
+        self.assertEqual(StoredFile.objects.get(name=pdf).refs,
+                         Archive.objects.filter(file=pdf).count() + RequestDocument.objects.filter(file=pdf).count())
+        self.assertTrue(SearchEntry.objects.filter(kind='archive').exists())
+
+        with self.assertRaises(CommandError):
+            call_command('seed', stdout=StringIO())
+        call_command('seed', flush=True, no_files=True, stdout=StringIO())
+        self.assertEqual(Member.objects.count(), 40)
+
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    """Inscriptions simultanées sur un même événement"""
+
+    THREADS = 12
+
+    def hammer(self, event, emails):
+        barrier = threading.Barrier(len(emails))
+        results = []
+
+        def worker(email):
+            barrier.wait()
+            try:
+                for _ in range(50):
+                    try:
+                        results.append(register_participant(new_registration(event, email)))
+                        return
+                    except OperationalError:
+                        # SQLite verrouille toute la base en écriture : on réessaie
+                        continue
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(email,)) for email in emails]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_no_overbooking(self):
+        event = create_event(max_participants=5)
+        results = self.hammer(event, [f"p{i}@example.com" for i in range(self.THREADS)])
+
+        event.refresh_from_db()
+        self.assertEqual(results.count(CONFIRMED), 5)
+        self.assertEqual(results.count(WAITLISTED), self.THREADS - 5)
+        self.assertEqual(event.confirmed_count, 5)
+        self.assertEqual(EventRegistration.objects.filter(event=event, is_confirmed=True).count(), 5)
+
+    def test_no_duplicate_email(self):
+        event = create_event(max_participants=5)
+        results = self.hammer(event, ["same@example.com"] * self.THREADS)
+
+        event.refresh_from_db()
+        self.assertEqual(results.count(CONFIRMED), 1)
+        self.assertEqual(EventRegistration.objects.filter(event=event).count(), 1)
+        self.assertEqual(event.confirmed_count, 1)
@@ -0,0 +1,54 @@
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+
+TICKET_TOKEN_SALT = 'main.ticket'
+
+# Le jeton reste valable jusqu'au lendemain de l'événement
+TICKET_TOKEN_VALIDITY_AFTER_EVENT = timedelta(days=1)
+
+
+def make_ticket_token(registration):
+    """
+    Génère un jeton signé (HMAC) pour le QR code du ticket.
+    Il contient l'inscription, l'événement et la date d'expiration, de sorte que
+    l'authenticité du ticket se vérifie sans requête en base.
+    """
+    expires = registration.event.date_event + TICKET_TOKEN_VALIDITY_AFTER_EVENT
+    payload = {
+        'r': registration.pk,
+        'e': registration.event_id,
+        'x': int(expires.timestamp()),
+    }
+    return signing.dumps(payload, salt=TICKET_TOKEN_SALT)
+
+
+def read_ticket_token(token):
+    """
+    Vérifie un jeton de ticket et retourne son contenu.
+    Lève signing.BadSignature si le jeton est falsifié et
+    signing.SignatureExpired s'il a expiré.
+    """
+    payload = signing.loads(token, salt=TICKET_TOKEN_SALT)
+    try:
+        registration_id, event_id, expires = payload['r'], payload['e'], payload['x']
+    except (KeyError, TypeError):
+        raise signing.BadSignature("Jeton de ticket incomplet")
+
+    if expires < time.time():
+        raise signing.SignatureExpired("Jeton de ticket expiré")
+
+    return {
+        'registration_id': registration_id,
+        'event_id': event_id,
+        'expires': datetime.fromtimestamp(expires, tz=dt_timezone.utc),
+    }
+
+
+def ticket_verification_url(registration):
+    """URL absolue encodée dans le QR code du ticket et du badge"""
+    token = make_ticket_token(registration)
+    return settings.SITE_URL + reverse('ticket_verify_token', kwargs={'token': token})
@@ -7,6 +7,9 @@ urlpatterns = [
     # Page d'accueil
     path('', views.home, name='home'),
     
+    # Recherche
+    path('search/', views.search, name='search'),
+    
     # À propos
     path('about/', views.about, name='about'),
     path('mandate/', views.mandate, name='mandate'),
@@ -82,6 +85,7 @@ urlpatterns = [
     # Ticketing
     path('tickets/download/<uuid:uuid>/', views.download_ticket, name='download_ticket'),
     path('tickets/verify/<uuid:uuid>/', views.verify_ticket, name='ticket_verify'),
+    path('tickets/v/<str:token>/', views.verify_ticket_token, name='ticket_verify_token'),
 ]
 
 if settings.DEBUG:
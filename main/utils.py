@@ -11,6 +11,44 @@ import os
 from django.core.mail import EmailMessage
 from reportlab.lib import colors
 
+from .ticket_utils import ticket_verification_url
+
+
+def draw_qr_code(p, data, x, y, size, error_correction=qrcode.constants.ERROR_CORRECT_H, border=2):
+    """
+    Dessine un code QR vectoriel directement sur le canvas ReportLab.
+    La matrice de modules est tracée en rectangles (un par série de modules
+    noirs consécutifs sur une ligne), sans passer par une image PNG.
+    """
+    qr = qrcode.QRCode(error_correction=error_correction, border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()  # Inclut la marge (border)
+    
+    count = len(matrix)
+    module = size / count
+    
+    p.saveState()
+    p.setFillColor(colors.white)
+    p.rect(x, y, size, size, fill=1, stroke=0)
+    
+    p.setFillColor(colors.black)
+    path = p.beginPath()
+    for row_index, row in enumerate(matrix):
+        row_y = y + size - (row_index + 1) * module
+        col = 0
+        while col < count:
+            if not row[col]:
+                col += 1
+                continue
+            start = col
+            while col < count and row[col]:
+                col += 1
+            path.rect(x + start * module, row_y, (col - start) * module, module)
+    p.drawPath(path, fill=1, stroke=0)
+    p.restoreState()
+
+
 def generate_member_card(member):
     """Génère une carte de membre PDF (format carte de visite)"""
     buffer = BytesIO()
@@ -86,24 +124,8 @@ def generate_ticket(registration):
     """
     Generates a premium event ticket (admit one style) with pink/white COMS.A.S branding.
     """
-    # 1. Generate QR Code
-    verification_url = settings.SITE_URL + reverse('ticket_verify', kwargs={'uuid': registration.uuid})
-    
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_H,
-        box_size=8,
-        border=2,
-    )
-    qr.add_data(verification_url)
-    qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
-    blob = BytesIO()
-    img.save(blob, 'PNG')
-    
-    # Save QR code image
-    registration.qr_code.save(f'qr_{registration.uuid}.png', File(blob), save=False)
+    # 1. QR Code (URL de vérification avec jeton signé)
+    verification_url = ticket_verification_url(registration)
     
     # 2. Generate PDF Ticket (Landscape orientation for ticket style)
     buffer = BytesIO()
@@ -221,10 +243,8 @@ def generate_ticket(registration):
            qr_size + 0.2*inch, qr_size + 0.2*inch, 
            fill=1, stroke=1)
     
-    # QR Code
-    blob.seek(0)
-    qr_img = ImageReader(blob)
-    p.drawImage(qr_img, qr_x, qr_y, width=qr_size, height=qr_size)
+    # QR Code (vectoriel)
+    draw_qr_code(p, verification_url, qr_x, qr_y, qr_size)
     
     # Scan instruction
     p.setFont("Helvetica", 7)
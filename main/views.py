@@ -1,25 +1,36 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 import json
+import os
 from django.contrib import messages
 from django.core.paginator import Paginator
+from django.db.models import Count, F
 from django.http import JsonResponse, FileResponse, Http404
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 from django.utils.translation import gettext as _
 from django.core.mail import send_mail, EmailMessage
 from django.conf import settings
+from django.core import signing
+from django.utils.http import urlencode
+from django.utils.text import slugify
 from .models import (
     Member, Project, Event, EventRegistration, 
     News, Gallery, GalleryAlbum, Contact, SiteSettings,
     SponsorshipSession, Mentor, Mentee, Match,
-    Contest, Candidate, Vote, Archive, ArchiveComment,
+    Contest, Candidate, Vote, Archive, ArchiveComment, SearchEntry,
 )
 from .forms import (
     MemberRegistrationForm, EventRegistrationForm, 
     ContactForm
 )
 from .utils import generate_ticket
+from .ticket_utils import read_ticket_token
+from .registrations import register_participant, send_ticket, DUPLICATE, WAITLISTED
+from .search import search as site_search
+from .pagination import keyset_page
+from .media import serve_file
+from .facets import archive_facets, blog_facets, with_counts
 
 
 def home(request):
@@ -327,54 +338,17 @@ def event_detail(request, pk):
             registration = form.save(commit=False)
             registration.event = event
             
-            # Vérifier si pas déjà inscrit
-            existing = EventRegistration.objects.filter(
-                event=event,
-                email=registration.email
-            ).first()
+            # Réservation atomique d'une place (liste d'attente si complet)
+            status = register_participant(registration)
             
-            if existing:
+            if status == DUPLICATE:
                 messages.warning(request, _('Vous êtes déjà inscrit à cet événement.'))
+            elif status == WAITLISTED:
+                messages.info(request, _("L'événement est complet : vous êtes inscrit sur la liste d'attente. Vous recevrez votre ticket par e-mail si une place se libère."))
+                return redirect('event_detail', pk=event.pk)
             else:
-                registration.is_confirmed = True
-                registration.save()
                 messages.success(request, _('Votre inscription a été enregistrée avec succès!'))
-                
-                # Générer le ticket
-                try:
-                    generate_ticket(registration)
-                except Exception as e:
-                    print(f"Erreur génération ticket: {e}")
-
-                # Envoyer notification HTML avec pièces jointes
-                try:
-                    from django.template.loader import render_to_string
-                    from django.core.mail import EmailMultiAlternatives
-                    
-                    html_content = render_to_string('emails/event_registration_confirmation.html', {
-                        'participant_name': registration.nom_prenom,
-                        'event_title': event.title_fr,
-                        'event_date': event.date_event,
-                        'event_location': event.location,
-                    })
-                    
-                    subject = f'Confirmation inscription - {event.title_fr}'
-                    text_content = f'Bonjour {registration.nom_prenom},\n\nVotre inscription à l\'événement "{event.title_fr}" a bien été enregistrée.\n\nVous trouverez votre ticket en pièce jointe.\n\nCordialement,\nL\'équipe COMS.A.S'
-                    
-                    email = EmailMultiAlternatives(
-                        subject,
-                        text_content,
-                        settings.EMAIL_HOST_USER,
-                        [registration.email],
-                    )
-                    email.attach_alternative(html_content, "text/html")
-                    
-                    if registration.ticket_pdf:
-                        email.attach_file(registration.ticket_pdf.path)
-                    email.send(fail_silently=True)
-                except Exception as e:
-                    print(f"Erreur envoi email: {e}")
-                
+                send_ticket(registration)
                 return redirect('event_registration_success', uuid=registration.uuid)
     else:
         form = EventRegistrationForm()
@@ -398,7 +372,7 @@ def event_registration_success(request, uuid):
 
 def gallery(request):
     """Page galerie / multimédia (Albums)"""
-    albums = GalleryAlbum.objects.all().order_by('-event_date')
+    albums = GalleryAlbum.objects.annotate(photos_count=Count('images')).order_by('-event_date')
     
     paginator = Paginator(albums, 9)
     page_number = request.GET.get('page')
@@ -638,7 +612,7 @@ def list_matches(request):
     matches = Match.objects.filter(
         session=active_session, 
         is_active=True
-    ).select_related('mentor', 'mentee').order_by('mentor__first_name')
+    ).select_related('mentor', 'mentee', 'session').order_by('mentor__first_name')
     
     context = {
         'matches': matches,
@@ -681,23 +655,9 @@ def contest_detail(request, slug):
         chart_labels.append(candidate.name)
         chart_data.append(candidate.votes_count)
     
-    # Vérifier si l'utilisateur a déjà voté (ou si le vote est checké via IP/Matricule dans la vue AJAX, ici c'est pour l'affichage)
-    # On garde la logique simple : si session_key a voté
-    has_voted = False
-    if contest.is_open():
-        ip = get_client_ip(request)
-        session_key = request.session.session_key
-        if not session_key:
-            request.session.create()
-            session_key = request.session.session_key
-            
-        # Check basic uniqueness via Session/IP purely for UI state (button disabled)
-        # Note: True security is in the POST view with Matricule
-        has_voted = Vote.objects.filter(
-            contest=contest,
-            ip_address=ip,
-            session_key=session_key
-        ).exists()
+    # Affichage seulement (bouton désactivé) : drapeau posé par vote_candidate dans le cookie du navigateur.
+    # La vraie vérification (email, matricule) est faite dans la vue du vote.
+    has_voted = contest.is_open() and request.item_flags.has('voted_contest', contest.pk)
     
     context = {
         'contest': contest,
@@ -751,16 +711,13 @@ def vote_candidate(request, contest_slug, candidate_id):
 
     # 4. Enregistrer le vote
     ip = get_client_ip(request)
-    session_key = request.session.session_key
-    if not session_key:
-        request.session.create()
-        session_key = request.session.session_key
 
     Vote.objects.create(
         contest=contest,
         candidate=candidate,
         ip_address=ip,
-        session_key=session_key,
+        # Pas de session créée pour un votant anonyme
+        session_key=request.session.session_key,
         voter_email=email,
         voter_matricule=matricule,
         user_agent=request.META.get('HTTP_USER_AGENT', '')
@@ -769,6 +726,7 @@ def vote_candidate(request, contest_slug, candidate_id):
     # 5. Mettre à jour le compteur (denormalized)
     candidate.votes_count += 1
     candidate.save()
+    request.item_flags.add('voted_contest', contest.pk)
     
     return JsonResponse({'success': True, 'new_count': candidate.votes_count})
 
@@ -805,12 +763,15 @@ def request_documents(request):
 def download_document(request, pk):
     """Télécharger un document et incrémenter le compteur"""
     document = get_object_or_404(RequestDocument, pk=pk)
-    document.downloads_count += 1
-    document.save()
+    if not document.file:
+        return redirect('request_documents')
     
-    if document.file:
-        return redirect(document.file.url)
-    return redirect('request_documents')
+    extension = os.path.splitext(document.file.name)[1]
+    response = serve_file(request, document.file, filename=f'{slugify(document.title)}{extension}', as_attachment=True)
+    # Ni les 304 ni les reprises (206) ne comptent comme un nouveau téléchargement
+    if response.status_code == 200:
+        RequestDocument.objects.filter(pk=document.pk).update(downloads_count=F('downloads_count') + 1)
+    return response
 
 def department_professors(request):
     """Liste des enseignants"""
@@ -836,7 +797,7 @@ def department_delegates(request):
 
 def blog_list(request):
     """Liste des articles de blog"""
-    articles_list = BlogArticle.objects.filter(is_published=True).order_by('-published_at')
+    articles_list = BlogArticle.objects.filter(is_published=True).select_related('author').order_by('-published_at')
     
     # Filtrer par catégorie
     category = request.GET.get('category')
@@ -848,10 +809,13 @@ def blog_list(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
+    category_counts = blog_facets({'category': category})['category']
+    
     context = {
         'page_obj': page_obj,
         'current_category': category,
-        'categories': BlogArticle.CATEGORIES,
+        'categories': with_counts(BlogArticle.CATEGORIES, category_counts),
+        'total_count': sum(category_counts.values()),
     }
     return render(request, 'main/blog/list.html', context)
 
@@ -859,13 +823,11 @@ def blog_detail(request, slug):
     """Détail d'un article de blog"""
     article = get_object_or_404(BlogArticle, slug=slug, is_published=True)
     
-    # Incrémenter les vues (simple)
-    # Idéalement utiliser session pour éviter doublons
-    session_key = f'viewed_article_{article.pk}'
-    if not request.session.get(session_key, False):
+    # Incrémenter les vues (une fois par navigateur, drapeau en cookie)
+    if not request.item_flags.has('viewed_article', article.pk):
         article.views_count += 1
-        article.save()
-        request.session[session_key] = True
+        article.save(update_fields=['views_count'])
+        request.item_flags.add('viewed_article', article.pk)
     
     # Articles similaires
     related_articles = BlogArticle.objects.filter(
@@ -887,12 +849,11 @@ def like_article(request, slug):
     
     article = get_object_or_404(BlogArticle, slug=slug)
     
-    # Simple suppression de doublon par session
-    session_key = f'liked_article_{article.pk}'
-    if not request.session.get(session_key, False):
+    # Simple suppression de doublon par navigateur
+    if not request.item_flags.has('liked_article', article.pk):
         article.likes_count += 1
-        article.save()
-        request.session[session_key] = True
+        article.save(update_fields=['likes_count'])
+        request.item_flags.add('liked_article', article.pk)
         return JsonResponse({'success': True, 'likes_count': article.likes_count})
     
     return JsonResponse({'success': False, 'error': 'Vous avez déjà aimé cet article.'})
@@ -915,13 +876,29 @@ def download_ticket(request, uuid):
 def verify_ticket(request, uuid):
     """Vérifier la validité d'un ticket via QR Code"""
     try:
-        registration = EventRegistration.objects.get(uuid=uuid)
+        registration = EventRegistration.objects.select_related('event').get(uuid=uuid)
         context = {'registration': registration, 'valid': True}
     except EventRegistration.DoesNotExist:
         context = {'valid': False}
     
     return render(request, 'main/ticket_verify.html', context)
 
+def verify_ticket_token(request, token):
+    """Vérifier un ticket signé (QR Code) sans requête en base"""
+    try:
+        ticket = read_ticket_token(token)
+        context = {'valid': True, 'ticket': ticket}
+    except signing.SignatureExpired:
+        context = {'valid': False, 'expired': True}
+    except signing.BadSignature:
+        context = {'valid': False}
+    
+    return render(request, 'main/ticket_verify.html', context)
+
+# Tri des archives : année académique puis date d'ajout, l'id départage les égalités
+ARCHIVE_KEYSET = ('academic_year', 'created_at', 'pk')
+ARCHIVES_PER_PAGE = 24
+
 def archives_list(request):
     """Page des archives (PV, documents)"""
     # Filtres
@@ -929,7 +906,8 @@ def archives_list(request):
     selected_year = request.GET.get('year')
     category_filter = request.GET.get('category')
     
-    archives = Archive.objects.all().order_by('-academic_year', '-created_at')
+    # Le texte extrait des PDF ne sert qu'à la recherche
+    archives = Archive.objects.defer('text_content')
     
     if selected_level:
         archives = archives.filter(level=selected_level)
@@ -939,15 +917,27 @@ def archives_list(request):
         
     if category_filter:
         archives = archives.filter(category=category_filter)
-        
-    # Listes pour les filtres
-    years = Archive.objects.values_list('academic_year', flat=True).distinct().order_by('-academic_year')
+    
+    # Pagination par clé : pas d'OFFSET ni de COUNT, quelle que soit la page
+    page = keyset_page(
+        archives, ARCHIVE_KEYSET, ARCHIVES_PER_PAGE,
+        after=request.GET.get('after'), before=request.GET.get('before'),
+    )
+    
+    # Filtres conservés dans les liens de pagination
+    filters = {'level': selected_level, 'year': selected_year, 'category': category_filter}
+    filter_query = urlencode({key: value for key, value in filters.items() if value})
+    
+    # Nombre de documents par valeur de filtre
+    facets = archive_facets(filters)
     
     context = {
-        'archives': archives,
-        'level_choices': Archive.LEVEL_CHOICES,
-        'category_choices': Archive.CATEGORY_CHOICES,
-        'available_years': years,
+        'archives': page.object_list,
+        'page': page,
+        'filter_query': filter_query,
+        'level_choices': with_counts(Archive.LEVEL_CHOICES, facets['level']),
+        'category_choices': with_counts(Archive.CATEGORY_CHOICES, facets['category']),
+        'available_years': sorted(facets['year'].items(), reverse=True),
         'selected_level': selected_level,
         'selected_year': selected_year,
         'selected_category': category_filter,
@@ -956,14 +946,13 @@ def archives_list(request):
 
 def archive_detail(request, slug):
     """Détail d'une archive"""
-    archive = get_object_or_404(Archive, slug=slug)
+    archive = get_object_or_404(Archive.objects.defer('text_content'), slug=slug)
     
-    # Incrémenter les vues (si pas déjà vu dans cette session)
-    session_key = f'viewed_archive_{archive.pk}'
-    if not request.session.get(session_key, False):
+    # Incrémenter les vues (si pas déjà vu par ce navigateur)
+    if not request.item_flags.has('viewed_archive', archive.pk):
         archive.views_count += 1
-        archive.save()
-        request.session[session_key] = True
+        archive.save(update_fields=['views_count'])
+        request.item_flags.add('viewed_archive', archive.pk)
     
     # Gestion des commentaires (POST)
     if request.method == 'POST':
@@ -982,7 +971,7 @@ def archive_detail(request, slug):
     comments = archive.comments.all().order_by('-created_at')
     
     # Archives similaires (même niveau)
-    related_archives = Archive.objects.filter(
+    related_archives = Archive.objects.defer('text_content').filter(
         level=archive.level
     ).exclude(pk=archive.pk)[:3]
     
@@ -990,7 +979,7 @@ def archive_detail(request, slug):
         'archive': archive,
         'comments': comments,
         'related_archives': related_archives,
-        'is_liked': request.session.get(f'liked_archive_{archive.pk}', False)
+        'is_liked': request.item_flags.has('liked_archive', archive.pk),
     }
     return render(request, 'main/archive_detail.html', context)
 
@@ -1003,11 +992,10 @@ def archive_like(request, slug):
     try:
         archive = get_object_or_404(Archive, slug=slug)
         
-        session_key = f'liked_archive_{archive.pk}'
-        if not request.session.get(session_key, False):
+        if not request.item_flags.has('liked_archive', archive.pk):
             archive.likes_count += 1
-            archive.save()
-            request.session[session_key] = True
+            archive.save(update_fields=['likes_count'])
+            request.item_flags.add('liked_archive', archive.pk)
             return JsonResponse({'success': True, 'likes_count': archive.likes_count, 'liked': True})
         
         return JsonResponse({'success': False, 'error': 'Vous avez déjà aimé ce document.', 'liked': True})
@@ -1017,9 +1005,32 @@ def archive_like(request, slug):
 def archive_download(request, slug):
     """Télécharger et compter"""
     archive = get_object_or_404(Archive, slug=slug)
-    # Compter le téléchargement seulement si pas admin
-    if not request.user.is_staff:
+    extension = os.path.splitext(archive.file.name)[1]
+    response = serve_file(request, archive.file, filename=f'{archive.slug}{extension}', as_attachment=not archive.is_pdf)
+    # Compter le téléchargement seulement si pas admin (ni 304, ni reprise partielle)
+    if response.status_code == 200 and not request.user.is_staff:
         archive.downloads_count += 1
-        archive.save()
+        archive.save(update_fields=['downloads_count'])
+    
+    return response
+
+# ============= RECHERCHE =============
+
+def search(request):
+    """Recherche sur tout le site (archives, blog, actualités, événements, projets)"""
+    query = request.GET.get('q', '').strip()
+    kind = request.GET.get('type', '')
+    kinds = [kind] if kind in dict(SearchEntry.KINDS) and kind != 'member' else None
+    
+    paginator = Paginator(site_search(query, kinds=kinds), 10)
+    page_number = request.GET.get('page')
+    results_page = paginator.get_page(page_number)
+    
+    context = {
+        'query': query,
+        'current_type': kind,
+        'results_page': results_page,
+        'kinds': [choice for choice in SearchEntry.KINDS if choice[0] != 'member'],
+    }
     
-    return redirect(archive.file.url)
+    return render(request, 'main/search.html', context)